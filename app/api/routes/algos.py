@@ -13,17 +13,29 @@ def list_algos():
 
 @router.post("")
 def upsert_algo(config: AlgoConfig):
-    state.algo_manager.add(config)
+    if state.cluster:
+        state.cluster.upsert_algo(config)
+    else:
+        state.algo_manager.add(config)
+    state.snapshots.request()
     return {"status": "saved", "algo": config.name}
 
 
 @router.post("/{name}/pause")
 def pause_algo(name: str):
-    state.algo_manager.toggle(name, True)
+    if state.cluster:
+        state.cluster.toggle(name, True)
+    else:
+        state.algo_manager.toggle(name, True)
+    state.snapshots.request()
     return {"status": "paused", "algo": name}
 
 
 @router.post("/{name}/resume")
 def resume_algo(name: str):
-    state.algo_manager.toggle(name, False)
+    if state.cluster:
+        state.cluster.toggle(name, False)
+    else:
+        state.algo_manager.toggle(name, False)
+    state.snapshots.request()
     return {"status": "running", "algo": name}
@@ -1,19 +1,55 @@
-from fastapi import APIRouter, Depends
+import asyncio
+
+from fastapi import APIRouter, HTTPException
 from sqlalchemy.orm import Session
 
-from app.db.database import get_db
+from app.core.config import settings
+from app.core.profiler import SamplingProfiler
 from app.db.models import TradeLog
 from app.main import state
 
 router = APIRouter(prefix="/control", tags=["control"])
+_profiling = asyncio.Lock()
+
+
+def _get_trade(db: Session, trade_id: int) -> TradeLog | None:
+    return db.query(TradeLog).filter(TradeLog.id == trade_id).first()
+
+
+def _mark_manual_exit(db: Session, trade_id: int):
+    trade = _get_trade(db, trade_id)
+    trade.status = "MANUAL_EXIT"
+    db.commit()
 
 
 @router.post("/manual-exit/{trade_id}")
-async def manual_exit(trade_id: int, db: Session = Depends(get_db)):
-    trade = db.query(TradeLog).filter(TradeLog.id == trade_id).first()
+async def manual_exit(trade_id: int):
+    if trade_id in state.positions.by_id:
+        pnl = await state.positions.close(trade_id, status="MANUAL_EXIT")
+        if pnl is None:
+            return {"status": "exit_failed", "trade_id": trade_id}
+        return {"status": "exited", "trade_id": trade_id, "pnl": pnl}
+    trade = await state.db_writer.run(_get_trade, trade_id)
     if not trade:
         return {"status": "not_found"}
+    if trade.sl_order_id:
+        response = await state.broker.cancel_order(trade.sl_order_id)
+        if response.get("status") != "success":
+            return {"status": "exit_failed", "trade_id": trade_id}
     await state.broker.exit_position({"symbol": trade.symbol, "qty": trade.quantity})
-    trade.status = "MANUAL_EXIT"
-    db.commit()
+    await state.db_writer.run(_mark_manual_exit, trade_id)
+    state.events.publish("position", {"trade_id": trade_id, "status": "MANUAL_EXIT"})
     return {"status": "exited", "trade_id": trade_id}
+
+
+@router.post("/profile")
+async def profile(seconds: float = 10.0):
+    if not settings.profiler_enabled:
+        raise HTTPException(status_code=403, detail="Profiler disabled (settings.profiler_enabled)")
+    if _profiling.locked():
+        raise HTTPException(status_code=409, detail="A profile is already running")
+    async with _profiling:
+        profiler = SamplingProfiler(settings.profiler_interval)
+        await asyncio.to_thread(profiler.run, min(max(seconds, 0.1), settings.profiler_max_seconds))
+        path = await asyncio.to_thread(profiler.dump, settings.profile_dir)
+    return {"path": path, "samples": profiler.samples, "stacks": len(profiler.stacks)}
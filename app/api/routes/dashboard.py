@@ -1,26 +1,135 @@
-from fastapi import APIRouter, Depends
+import base64
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.core.metrics import counters_snapshot, histograms_snapshot
 from app.db.database import get_db
 from app.db.models import TradeLog
 from app.main import state
-from app.services.ledger import snapshot
+from app.services.alerts import alert_service
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
 
 @router.get("/capital")
-async def capital(db: Session = Depends(get_db)):
-    balance = await state.broker.fetch_balance()
-    return snapshot(db, balance)
+async def capital():
+    return await state.capital.snapshot()
+
+
+def _encode_cursor(row: TradeLog) -> str:
+    return base64.urlsafe_b64encode(f"{row.created_at.isoformat()}|{row.id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        created_at, trade_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(trade_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
 
 @router.get("/positions")
-def positions(db: Session = Depends(get_db)):
-    rows = db.query(TradeLog).order_by(TradeLog.created_at.desc()).limit(100).all()
-    return rows
+def positions(
+    status: str | None = None,
+    algo: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    cursor: str | None = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+):
+    """Newest first, ``limit`` rows per page. Pass ``next_cursor`` back as ``cursor`` for
+    the next page; the cursor is the last row's (created_at, id), so pages stay stable
+    while new trades are inserted."""
+    query = db.query(TradeLog)
+    if status:
+        query = query.filter(TradeLog.status == status)
+    if algo:
+        query = query.filter(TradeLog.algo_name == algo)
+    if since:
+        query = query.filter(TradeLog.created_at >= since)
+    if until:
+        query = query.filter(TradeLog.created_at < until)
+    if cursor:
+        created_at, trade_id = _decode_cursor(cursor)
+        query = query.filter(
+            or_(TradeLog.created_at < created_at, and_(TradeLog.created_at == created_at, TradeLog.id < trade_id))
+        )
+    rows = query.order_by(TradeLog.created_at.desc(), TradeLog.id.desc()).limit(limit + 1).all()
+    more = len(rows) > limit
+    rows = rows[:limit]
+    return {"items": rows, "next_cursor": _encode_cursor(rows[-1]) if more else None}
 
 
 @router.get("/ticks")
 def ticks():
-    return state.market_data.latest_ticks
+    return dict(state.market_data.latest_ticks)
+
+
+@router.get("/latency")
+def latency():
+    return histograms_snapshot()
+
+
+@router.get("/counters")
+def counters():
+    return counters_snapshot()
+
+
+@router.get("/alerts")
+def alerts():
+    return alert_service.stats()
+
+
+@router.get("/feeds")
+def feeds():
+    return state.market_data.feed.stats() if state.market_data.feed else {}
+
+
+@router.get("/backpressure")
+def backpressure():
+    return {
+        **state.dispatcher.stats(),
+        "db_writer_queue": state.db_writer.pending(),
+        "db_writer_failures": state.db_writer.failures,
+    }
+
+
+@router.get("/cluster")
+def cluster():
+    return state.cluster.stats() if state.cluster else {"workers": 0}
+
+
+@router.get("/orders")
+def orders():
+    return state.execution_engine.orders.stats()
+
+
+@router.get("/retention")
+def retention():
+    return state.retention.stats()
+
+
+@router.get("/snapshot")
+def state_snapshot():
+    return state.snapshots.stats()
+
+
+@router.get("/risk")
+def risk():
+    return state.risk.stats()
+
+
+@router.get("/stream")
+async def stream(interval: float | None = None):
+    client = await state.dashboard.connect(interval)
+    return StreamingResponse(
+        state.dashboard.stream(client, settings.dashboard_keepalive_seconds),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, HTTPException
 
+from app.core.config import settings
 from app.main import state
 from app.models import StockSubscription
 
@@ -13,16 +14,27 @@ def list_stocks():
 
 @router.post("")
 async def add_stock(payload: StockSubscription):
-    if len(state.market_data.subscriptions) >= 20:
-        raise HTTPException(status_code=400, detail="Max 20 stocks supported")
+    if len(state.market_data.subscriptions) >= settings.max_subscriptions:
+        raise HTTPException(status_code=400, detail=f"Max {settings.max_subscriptions} stocks supported")
     valid = await state.broker.validate_token(payload.symbol, payload.token)
     if not valid:
         raise HTTPException(status_code=400, detail="Invalid token")
-    state.market_data.add_stock(payload.symbol, payload.token)
+    if state.cluster:
+        try:
+            state.cluster.add_stock(payload.symbol, payload.token)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+    else:
+        state.market_data.add_stock(payload.symbol, payload.token)
+    state.snapshots.request()
     return {"status": "subscribed", "symbol": payload.symbol}
 
 
 @router.delete("/{symbol}")
-def remove_stock(symbol: str):
-    state.market_data.remove_stock(symbol)
+async def remove_stock(symbol: str):
+    if state.cluster:
+        state.cluster.remove_stock(symbol)
+    else:
+        state.market_data.remove_stock(symbol)
+    state.snapshots.request()
     return {"status": "removed", "symbol": symbol}
@@ -0,0 +1,45 @@
+import argparse
+import csv
+import json
+
+from app.backtest.data import load_archive, load_ohlcv, load_ticks
+from app.backtest.runner import Backtester
+from app.models import AlgoConfig
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(prog="python -m app.backtest", description="Replay historical data through the live engine")
+    parser.add_argument(
+        "data",
+        help="CSV with symbol,timestamp,ltp[,volume] (ticks), symbol,timestamp,open,high,low,close[,volume] (ohlcv), "
+        "or a tick archive root (archive)",
+    )
+    parser.add_argument("--algos", required=True, help="JSON file with a list of AlgoConfig objects")
+    parser.add_argument("--format", choices=("ticks", "ohlcv", "archive"), default="ticks")
+    parser.add_argument("--days", nargs="*", help="Archive days (YYYY-MM-DD) to replay; default all")
+    parser.add_argument("--balance", type=float, default=100000.0)
+    parser.add_argument("--max-open-positions", type=int, default=2)
+    parser.add_argument("--max-daily-loss", type=float, default=3000.0)
+    parser.add_argument("--trades-out", help="Write the trade list to this CSV")
+    args = parser.parse_args(argv)
+
+    with open(args.algos) as handle:
+        algos = [AlgoConfig(**item) for item in json.load(handle)]
+    if args.format == "archive":
+        ticks = load_archive(args.data, args.days).iter_ticks()
+    elif args.format == "ohlcv":
+        ticks = load_ohlcv(args.data)
+    else:
+        ticks = load_ticks(args.data)
+    result = Backtester(algos, args.balance, args.max_open_positions, args.max_daily_loss).run(ticks)
+
+    if args.trades_out and result.trades:
+        with open(args.trades_out, "w", newline="") as handle:
+            writer = csv.DictWriter(handle, fieldnames=list(result.trades[0]))
+            writer.writeheader()
+            writer.writerows(result.trades)
+    print(json.dumps(result.summary(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+from typing import Callable
+
+from app.brokers.base import BrokerBase
+
+
+class BacktestBroker(BrokerBase):
+    name = "backtest"
+
+    def __init__(self, starting_balance: float = 100000.0):
+        self.connected = False
+        self.balance = starting_balance
+        self.used_margin = 0.0
+        self.positions: dict[str, list[float]] = {}
+        self._order_seq = 0
+
+    def _order_id(self, kind: str) -> str:
+        self._order_seq += 1
+        return f"BT-{kind}-{self._order_seq}"
+
+    async def connect(self) -> None:
+        self.connected = True
+
+    async def fetch_balance(self) -> dict:
+        return {
+            "available_balance": self.balance,
+            "used_margin": self.used_margin,
+            "free_margin": self.balance - self.used_margin,
+        }
+
+    async def validate_token(self, symbol: str, token: str) -> bool:
+        return bool(symbol)
+
+    async def place_limit_order(self, payload: dict) -> dict:
+        qty, price = payload["qty"], payload["price"]
+        position = self.positions.setdefault(payload["symbol"], [0, 0.0])
+        position[1] = (position[0] * position[1] + qty * price) / (position[0] + qty)
+        position[0] += qty
+        self.used_margin += qty * price
+        return {"status": "success", "order_id": self._order_id("LMT")}
+
+    async def place_stoploss_order(self, payload: dict) -> dict:
+        return {"status": "success", "order_id": self._order_id("SL")}
+
+    async def exit_position(self, payload: dict) -> dict:
+        position = self.positions.get(payload["symbol"])
+        if not position:
+            return {"status": "rejected", "reason": "No open position"}
+        qty = min(payload["qty"], position[0])
+        self.balance += (payload["price"] - position[1]) * qty
+        self.used_margin = max(self.used_margin - qty * position[1], 0.0)
+        position[0] -= qty
+        if not position[0]:
+            del self.positions[payload["symbol"]]
+        return {"status": "success", "order_id": self._order_id("EXIT")}
+
+    async def cancel_order(self, order_id: str) -> dict:
+        return {"status": "success", "order_id": order_id}
+
+    async def subscribe_ticks(self, subscriptions: list[dict], on_tick: Callable[[dict], None]) -> None:
+        raise NotImplementedError("Backtests push ticks through Backtester.run")
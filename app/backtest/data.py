@@ -0,0 +1,136 @@
+import csv
+import json
+import os
+from array import array
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from app.data.archive import ArchiveReader
+
+Tick = tuple[str, datetime, float, float]
+
+
+def parse_timestamp(value: str) -> datetime:
+    try:
+        return datetime.fromtimestamp(float(value))
+    except ValueError:
+        return datetime.fromisoformat(value)
+
+
+def load_ticks(path: str) -> Iterator[Tick]:
+    with open(path, newline="") as handle:
+        for row in csv.DictReader(handle):
+            yield row["symbol"], parse_timestamp(row["timestamp"]), float(row["ltp"]), float(row.get("volume") or 1)
+
+
+def load_ohlcv(path: str) -> Iterator[Tick]:
+    """Expands each 1-minute bar into open, high/low, low/high, close ticks."""
+    with open(path, newline="") as handle:
+        for row in csv.DictReader(handle):
+            symbol, ts = row["symbol"], parse_timestamp(row["timestamp"])
+            o, h, l, c = float(row["open"]), float(row["high"]), float(row["low"]), float(row["close"])
+            volume = float(row.get("volume") or 4) / 4
+            path_prices = (o, l, h, c) if c >= o else (o, h, l, c)
+            for offset, price in enumerate(path_prices):
+                yield symbol, ts.replace(second=offset * 15), price, volume
+
+
+@dataclass
+class TickArrays:
+    symbols: list[str]
+    symbol_ids: np.ndarray
+    ts: np.ndarray
+    ltp: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def day_bounds(self) -> list[tuple[date, int, int]]:
+        if not len(self.ts):
+            return []
+        first = float(self.ts[0])
+        offset = (datetime.fromtimestamp(first) - datetime.utcfromtimestamp(first)).total_seconds()
+        days = ((self.ts + offset) // 86400).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+        stops = np.r_[starts[1:], len(days)]
+        return [
+            (datetime.fromtimestamp(float(self.ts[start])).date(), int(start), int(stop))
+            for start, stop in zip(starts, stops)
+        ]
+
+    def iter_ticks(self, start: int = 0, stop: int | None = None) -> Iterator[Tick]:
+        stop = len(self) if stop is None else stop
+        symbols = self.symbols
+        fromtimestamp = datetime.fromtimestamp
+        for symbol_id, ts, ltp, volume in zip(
+            self.symbol_ids[start:stop].tolist(),
+            self.ts[start:stop].tolist(),
+            self.ltp[start:stop].tolist(),
+            self.volume[start:stop].tolist(),
+        ):
+            yield symbols[symbol_id], fromtimestamp(ts), ltp, volume
+
+
+def to_arrays(ticks: Iterable[Tick]) -> TickArrays:
+    ids: dict[str, int] = {}
+    symbol_ids, stamps, prices, volumes = array("i"), array("d"), array("d"), array("d")
+    for symbol, ts, ltp, volume in ticks:
+        symbol_ids.append(ids.setdefault(symbol, len(ids)))
+        stamps.append(ts.timestamp())
+        prices.append(ltp)
+        volumes.append(volume)
+    return TickArrays(
+        list(ids),
+        np.frombuffer(symbol_ids, dtype=np.int32),
+        np.frombuffer(stamps, dtype=np.float64),
+        np.frombuffer(prices, dtype=np.float64),
+        np.frombuffer(volumes, dtype=np.float64),
+    )
+
+
+def save_arrays(arrays: TickArrays, directory: str):
+    os.makedirs(directory, exist_ok=True)
+    for name in ("symbol_ids", "ts", "ltp", "volume"):
+        np.save(os.path.join(directory, f"{name}.npy"), getattr(arrays, name))
+    with open(os.path.join(directory, "symbols.json"), "w") as handle:
+        json.dump(arrays.symbols, handle)
+
+
+def load_arrays(directory: str, mmap: bool = True) -> TickArrays:
+    mode = "r" if mmap else None
+    with open(os.path.join(directory, "symbols.json")) as handle:
+        symbols = json.load(handle)
+    columns = {
+        name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mode)
+        for name in ("symbol_ids", "ts", "ltp", "volume")
+    }
+    return TickArrays(symbols, **columns)
+
+
+def load_archive(root: str, days: list[str] | None = None) -> TickArrays:
+    reader = ArchiveReader(root)
+    symbols: list[str] = []
+    ids, stamps, prices, volumes = [], [], [], []
+    for day in days or reader.days():
+        for symbol in reader.symbols(day):
+            columns = reader.ticks(day, symbol)
+            if not len(columns["ts"]):
+                continue
+            if symbol not in symbols:
+                symbols.append(symbol)
+            ids.append(np.full(len(columns["ts"]), symbols.index(symbol), dtype=np.int32))
+            stamps.append(columns["ts"])
+            prices.append(columns["ltp"])
+            volumes.append(columns["volume"])
+    if not stamps:
+        empty = np.zeros(0, dtype=np.float64)
+        return TickArrays(symbols, np.zeros(0, dtype=np.int32), empty, empty, empty)
+    ts = np.concatenate(stamps)
+    order = np.argsort(ts, kind="stable")
+    return TickArrays(
+        symbols, np.concatenate(ids)[order], ts[order], np.concatenate(prices)[order], np.concatenate(volumes)[order]
+    )
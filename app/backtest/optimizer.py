@@ -0,0 +1,148 @@
+import argparse
+import itertools
+import json
+import os
+import random
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from app.backtest.data import TickArrays, load_archive, load_arrays, load_ohlcv, load_ticks, save_arrays, to_arrays
+from app.backtest.runner import Backtester
+from app.models import AlgoConfig
+
+_arrays_cache: dict[str, TickArrays] = {}
+
+
+def grid(space: dict[str, list]) -> list[dict]:
+    keys = list(space)
+    return [dict(zip(keys, values)) for values in itertools.product(*(space[k] for k in keys))]
+
+
+def random_search(space: dict[str, list | dict], samples: int, seed: int | None = None) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            key: rng.choice(values) if isinstance(values, list) else round(rng.uniform(values["low"], values["high"]), 4)
+            for key, values in space.items()
+        }
+        for _ in range(samples)
+    ]
+
+
+def walk_forward_splits(arrays: TickArrays, train_days: int, test_days: int) -> list[tuple[tuple[int, int], tuple[int, int]]]:
+    days = arrays.day_bounds()
+    splits = []
+    for start in range(0, len(days) - train_days - test_days + 1, test_days):
+        train = days[start:start + train_days]
+        test = days[start + train_days:start + train_days + test_days]
+        splits.append(((train[0][1], train[-1][2]), (test[0][1], test[-1][2])))
+    return splits
+
+
+def _run_candidate(data_dir: str, base: dict, params: dict, start: int, stop: int, risk: dict) -> dict:
+    arrays = _arrays_cache.get(data_dir)
+    if arrays is None:
+        arrays = _arrays_cache[data_dir] = load_arrays(data_dir, mmap=True)
+    algo = AlgoConfig(**(base | params))
+    result = Backtester([algo], **risk).run(arrays.iter_ticks(start, stop))
+    return {"params": params, "pnl": round(result.pnl_by_algo.get(algo.name, 0.0), 2), "trades": len(result.trades)}
+
+
+@dataclass
+class FoldResult:
+    train: tuple[int, int]
+    test: tuple[int, int]
+    ranked: list[dict] = field(default_factory=list)
+    test_result: dict | None = None
+
+
+class Optimizer:
+    """Fans backtests of candidate AlgoConfig overrides across a process pool.
+
+    Tick arrays are saved once as ``.npy`` files and memory-mapped by every
+    worker, so the OS page cache is shared instead of pickling data per task.
+    """
+
+    def __init__(self, data_dir: str, base: dict, workers: int | None = None, risk: dict | None = None):
+        self.data_dir = data_dir
+        self.base = base
+        self.workers = workers or os.cpu_count() or 1
+        self.risk = risk or {}
+        self.arrays = load_arrays(data_dir, mmap=True)
+
+    def evaluate(self, candidates: list[dict], start: int = 0, stop: int | None = None, pool=None) -> list[dict]:
+        if pool is None:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                return self.evaluate(candidates, start, stop, pool)
+        stop = len(self.arrays) if stop is None else stop
+        futures = [
+            pool.submit(_run_candidate, self.data_dir, self.base, params, start, stop, self.risk)
+            for params in candidates
+        ]
+        return sorted((future.result() for future in futures), key=lambda r: r["pnl"], reverse=True)
+
+    def walk_forward(self, candidates: list[dict], train_days: int, test_days: int) -> list[FoldResult]:
+        folds = []
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            for train, test in walk_forward_splits(self.arrays, train_days, test_days):
+                ranked = self.evaluate(candidates, *train, pool=pool)
+                fold = FoldResult(train, test, ranked)
+                if ranked:
+                    fold.test_result = pool.submit(
+                        _run_candidate, self.data_dir, self.base, ranked[0]["params"], *test, self.risk
+                    ).result()
+                folds.append(fold)
+        return folds
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(prog="python -m app.backtest.optimizer", description="Parameter sweep / walk-forward")
+    parser.add_argument("data", help="Tick/OHLCV CSV (see python -m app.backtest) or a directory of saved arrays")
+    parser.add_argument("--algo", required=True, help="JSON file with the base AlgoConfig")
+    parser.add_argument("--space", required=True, help='JSON object: field -> list of values, or {"low": x, "high": y} with --samples')
+    parser.add_argument("--format", choices=("ticks", "ohlcv", "archive"), default="ticks")
+    parser.add_argument("--samples", type=int, help="Random search with this many samples instead of a full grid")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--train-days", type=int, help="Walk-forward train window; omit for a single in-sample sweep")
+    parser.add_argument("--test-days", type=int, default=1)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    with open(args.algo) as handle:
+        base = json.load(handle)
+    with open(args.space) as handle:
+        space = json.load(handle)
+    if args.samples:
+        candidates = random_search(space, args.samples, args.seed)
+    else:
+        candidates = grid(space)
+
+    with tempfile.TemporaryDirectory() as scratch:
+        data_dir = args.data
+        if args.format == "archive":
+            data_dir = scratch
+            save_arrays(load_archive(args.data), data_dir)
+        elif not os.path.isdir(data_dir):
+            ticks = load_ohlcv(args.data) if args.format == "ohlcv" else load_ticks(args.data)
+            data_dir = scratch
+            save_arrays(to_arrays(ticks), data_dir)
+        optimizer = Optimizer(data_dir, base, args.workers)
+        if args.train_days:
+            report = [
+                {
+                    "train": fold.train,
+                    "test": fold.test,
+                    "top": fold.ranked[:args.top],
+                    "out_of_sample": fold.test_result,
+                }
+                for fold in optimizer.walk_forward(candidates, args.train_days, args.test_days)
+            ]
+        else:
+            report = optimizer.evaluate(candidates)[:args.top]
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+import asyncio
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Iterable
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.backtest.broker import BacktestBroker
+from app.backtest.data import Tick
+from app.core.clock import SimulatedClock
+from app.core.events import EventBus
+from app.data.market_data import MarketDataManager
+from app.db.database import Base
+from app.db.models import TradeLog
+from app.db.writer import InlineDBWriter
+from app.engine.algo_manager import AlgoManager
+from app.engine.execution import EntryLeftOpen, ExecutionEngine
+from app.engine.positions import exit_for
+from app.engine.risk import RiskState
+from app.engine.strategy import evaluate
+from app.models import AlgoConfig, CapitalSnapshot, TradeDecision
+from app.services.reset_service import should_square_off
+
+
+async def _no_alert(message: str):
+    return None
+
+
+@dataclass
+class BacktestResult:
+    ticks: int
+    elapsed: float
+    trades: list[dict] = field(default_factory=list)
+    pnl_by_algo: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def ticks_per_minute(self) -> float:
+        return self.ticks / self.elapsed * 60 if self.elapsed else 0.0
+
+    def summary(self) -> dict:
+        return {
+            "ticks": self.ticks,
+            "elapsed_s": round(self.elapsed, 3),
+            "ticks_per_minute": round(self.ticks_per_minute),
+            "trades": len(self.trades),
+            "pnl_by_algo": {k: round(v, 2) for k, v in self.pnl_by_algo.items()},
+            "total_pnl": round(sum(self.pnl_by_algo.values()), 2),
+        }
+
+
+class Backtester:
+    def __init__(
+        self,
+        algos: list[AlgoConfig],
+        starting_balance: float = 100000.0,
+        global_max_open_positions: int = 2,
+        global_max_daily_loss: float = 3000.0,
+    ):
+        self.clock = SimulatedClock()
+        self.broker = BacktestBroker(starting_balance)
+        self.market_data = MarketDataManager(self.broker, EventBus())
+        self.market_data.connected = True
+        self.algo_manager = AlgoManager()
+        for algo in algos:
+            self.algo_manager.add(algo)
+        self.risk = RiskState(global_max_open_positions, global_max_daily_loss)
+        engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        self.db_writer = InlineDBWriter(sessionmaker(bind=engine, autoflush=False, expire_on_commit=False))
+        self.db = self.db_writer.session
+        self.execution_engine = ExecutionEngine(self.broker, self.db_writer, self.clock, notify=_no_alert)
+        self.open_trades: dict[str, list[TradeLog]] = defaultdict(list)
+        self.pnl_by_algo: dict[str, float] = defaultdict(float)
+        self.today_pnl = 0.0
+        self.day: date | None = None
+        self.squared_off = False
+
+    def run(self, ticks: Iterable[Tick]) -> BacktestResult:
+        return asyncio.run(self.arun(ticks))
+
+    async def arun(self, ticks: Iterable[Tick]) -> BacktestResult:
+        began = time.perf_counter()
+        count = 0
+        handle_tick = self.market_data.handle_tick
+        for symbol, ts, ltp, volume in ticks:
+            count += 1
+            if ts.date() != self.day:
+                await self._square_off()
+                self._new_day(ts.date())
+            self.clock.set(ts)
+            handle_tick({"symbol": symbol, "ltp": ltp, "timestamp": ts, "volume": volume})
+            if self.open_trades.get(symbol):
+                await self._check_exits(symbol, ltp)
+            if self.squared_off:
+                continue
+            if should_square_off(ts):
+                await self._square_off()
+                continue
+            for algo in self.algo_manager.active_for(symbol):
+                decision = evaluate(algo, symbol, self.market_data.indicators, ltp)
+                if decision:
+                    await self._enter(algo, decision)
+        await self._square_off()
+
+        trades = [
+            {c.name: getattr(row, c.name) for c in TradeLog.__table__.columns}
+            for row in self.db.query(TradeLog).order_by(TradeLog.id).all()
+        ]
+        return BacktestResult(count, time.perf_counter() - began, trades, dict(self.pnl_by_algo))
+
+    def _new_day(self, day: date):
+        self.day = day
+        self.squared_off = False
+        self.today_pnl = 0.0
+        self.risk.reset_day()
+        self.execution_engine.orders.clear()
+
+    def _capital(self) -> CapitalSnapshot:
+        free_margin = self.broker.balance - self.broker.used_margin
+        return CapitalSnapshot(
+            available_balance=self.broker.balance,
+            used_margin=self.broker.used_margin,
+            free_margin=free_margin,
+            today_pnl=self.today_pnl,
+            trading_enabled=True,
+        )
+
+    async def _enter(self, algo: AlgoConfig, decision: TradeDecision):
+        if not self.risk.screen((decision,), {algo.name: algo}, self._capital()):
+            return
+        try:
+            trade = await self.execution_engine.execute_trade(decision)
+        except EntryLeftOpen:
+            return
+        except (ValueError, RuntimeError):
+            self.risk.release(algo.name)
+            return
+        self.open_trades[trade.symbol].append(trade)
+
+    async def _check_exits(self, symbol: str, ltp: float):
+        for trade in list(self.open_trades[symbol]):
+            exit = exit_for(trade, ltp)
+            if exit:
+                await self._exit(trade, *exit)
+
+    async def _square_off(self):
+        for symbol, trades in list(self.open_trades.items()):
+            ltp = self.market_data.latest_ticks[symbol]["ltp"]
+            for trade in list(trades):
+                await self._exit(trade, ltp, "SQUARED_OFF")
+        self.squared_off = True
+
+    async def _exit(self, trade: TradeLog, price: float, status: str):
+        await self.broker.exit_position({"symbol": trade.symbol, "qty": trade.quantity, "price": price})
+        pnl = (price - trade.entry_price) * trade.quantity
+        trade.exit_price = price
+        trade.pnl = pnl
+        trade.status = status
+        trade.updated_at = self.clock.utcnow()
+        self.db.commit()
+        self.open_trades[trade.symbol].remove(trade)
+        self.risk.on_exit(trade.algo_name, pnl)
+        self.pnl_by_algo[trade.algo_name] += pnl
+        self.today_pnl += pnl
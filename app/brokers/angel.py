@@ -2,11 +2,45 @@ import asyncio
 import random
 from datetime import datetime
 
-from app.brokers.base import BrokerBase
+from app.brokers.base import BrokerBase, FeedConnection
+
+
+class AngelFeedConnection(FeedConnection):
+    utc_timestamps = True
+
+    def __init__(self, on_tick):
+        self.on_tick = on_tick
+        self.tokens: dict[str, str] = {}
+        self._running = False
+
+    async def subscribe(self, items: list[dict]) -> None:
+        self.tokens.update({item["symbol"]: item["token"] for item in items})
+
+    async def unsubscribe(self, symbols: list[str]) -> None:
+        for symbol in symbols:
+            self.tokens.pop(symbol, None)
+
+    async def run(self) -> None:
+        self._running = True
+        while self._running:
+            await asyncio.sleep(1)
+            for symbol, token in list(self.tokens.items()):
+                self.on_tick(
+                    {
+                        "symbol": symbol,
+                        "token": token,
+                        "ltp": round(random.uniform(100, 1000), 2),
+                        "timestamp": datetime.utcnow().isoformat(),
+                    }
+                )
+
+    async def close(self) -> None:
+        self._running = False
 
 
 class AngelBroker(BrokerBase):
     name = "angel"
+    max_instruments_per_connection = 1000
 
     def __init__(self):
         self.connected = False
@@ -34,6 +68,12 @@ class AngelBroker(BrokerBase):
     async def exit_position(self, payload: dict) -> dict:
         return {"status": "success", "order_id": f"ANGEL-EXIT-{int(datetime.utcnow().timestamp())}"}
 
+    async def cancel_order(self, order_id: str) -> dict:
+        return {"status": "success", "order_id": order_id}
+
+    def open_feed(self, on_tick) -> AngelFeedConnection:
+        return AngelFeedConnection(on_tick)
+
     async def subscribe_ticks(self, subscriptions: list[dict], on_tick):
         self._running_feed = True
         while self._running_feed:
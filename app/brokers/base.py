@@ -1,9 +1,72 @@
+import time
 from abc import ABC, abstractmethod
+from functools import wraps
 from typing import Callable
 
+from app.core.metrics import histogram
+
+TIMED_METHODS = (
+    "connect",
+    "fetch_balance",
+    "validate_token",
+    "place_limit_order",
+    "place_stoploss_order",
+    "exit_position",
+    "cancel_order",
+    "fetch_historical_candles",
+)
+
+
+def _timed(method, broker: str, name: str):
+    seconds = histogram("broker_call_seconds", "Broker request round-trip per method", labels={"broker": broker, "method": name})
+
+    @wraps(method)
+    async def call(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            seconds.observe(time.perf_counter() - started)
+
+    return call
+
+
+class FeedConnection(ABC):
+    """One streaming market-data connection whose instrument set changes by deltas while it runs."""
+
+    # Whether naive tick timestamps are UTC (as ``subscribe_ticks`` sends them) rather than local time.
+    utc_timestamps: bool = False
+
+    @abstractmethod
+    async def subscribe(self, items: list[dict]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def unsubscribe(self, symbols: list[str]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def run(self) -> None:
+        """Streams ticks to the callback given to ``open_feed`` until closed; raises on disconnect."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def close(self) -> None:
+        raise NotImplementedError
+
 
 class BrokerBase(ABC):
     name: str
+    max_instruments_per_connection: int = 1000
+
+    def __init_subclass__(cls, **kwargs):
+        """Wraps each request method an adapter defines so its round-trip lands in
+        ``broker_call_seconds{broker, method}``."""
+        super().__init_subclass__(**kwargs)
+        for name in TIMED_METHODS:
+            method = cls.__dict__.get(name)
+            if method is not None:
+                setattr(cls, name, _timed(method, getattr(cls, "name", cls.__name__), name))
 
     @abstractmethod
     async def connect(self) -> None:
@@ -29,6 +92,20 @@ class BrokerBase(ABC):
     async def exit_position(self, payload: dict) -> dict:
         raise NotImplementedError
 
+    @abstractmethod
+    async def cancel_order(self, order_id: str) -> dict:
+        raise NotImplementedError
+
     @abstractmethod
     async def subscribe_ticks(self, subscriptions: list[dict], on_tick: Callable[[dict], None]) -> None:
         raise NotImplementedError
+
+    def open_feed(self, on_tick: Callable[[dict], None]) -> FeedConnection:
+        """Optional: a new incremental feed connection. Brokers without it fall back to
+        ``subscribe_ticks`` with the full subscription list."""
+        raise NotImplementedError
+
+    async def fetch_historical_candles(self, symbol: str, token: str, limit: int) -> list[dict]:
+        """Optional: most recent closed 1-minute candles, oldest first, as dicts with
+        ``ts`` (datetime), ``open``, ``high``, ``low``, ``close`` and ``volume``."""
+        raise NotImplementedError
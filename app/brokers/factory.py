@@ -1,8 +1,21 @@
 from app.brokers.angel import AngelBroker
 from app.brokers.base import BrokerBase
+from app.brokers.simulated import SimulatedBroker
+from app.core.config import settings
 
 
 def get_broker(name: str) -> BrokerBase:
     if name == "angel":
         return AngelBroker()
+    if name == "simulated":
+        return SimulatedBroker(
+            ticks_per_symbol=settings.sim_ticks_per_symbol,
+            burst_multiplier=settings.sim_burst_multiplier,
+            burst_seconds=settings.sim_burst_seconds,
+            burst_interval=settings.sim_burst_interval,
+            order_latency=settings.sim_order_latency,
+            failure_rate=settings.sim_failure_rate,
+            reject_rate=settings.sim_reject_rate,
+            seed=settings.sim_seed,
+        )
     raise ValueError(f"Unsupported broker: {name}")
@@ -0,0 +1,213 @@
+import asyncio
+import math
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Callable
+
+from app.brokers.base import BrokerBase, FeedConnection
+
+
+class SimulatedFeedConnection(FeedConnection):
+    """Emits ticks for its subscribed symbols at the broker's current rate, in slices of
+    ``broker.feed_slice`` seconds, or replays the broker's recorded ticks for them."""
+
+    def __init__(self, broker: "SimulatedBroker", on_tick: Callable[[dict], None]):
+        self.broker = broker
+        self.on_tick = on_tick
+        self.tokens: dict[str, str] = {}
+        self._running = False
+
+    async def subscribe(self, items: list[dict]) -> None:
+        self.tokens.update({item["symbol"]: item["token"] for item in items})
+
+    async def unsubscribe(self, symbols: list[str]) -> None:
+        for symbol in symbols:
+            self.tokens.pop(symbol, None)
+
+    async def run(self) -> None:
+        self._running = True
+        if self.broker.replay is not None:
+            await self._replay()
+            return
+        broker = self.broker
+        last = time.perf_counter()
+        owed = 0.0
+        while self._running:
+            await asyncio.sleep(broker.feed_slice)
+            now = time.perf_counter()
+            owed += broker.rate(now) * len(self.tokens) * (now - last)
+            last = now
+            count, owed = int(owed), owed - int(owed)
+            if not count or not self.tokens:
+                continue
+            symbols = broker.rng.choices(list(self.tokens), k=count)
+            stamp = datetime.now()
+            for symbol in symbols:
+                self.on_tick(broker.next_tick(symbol, self.tokens[symbol], stamp))
+
+    async def _replay(self):
+        """Replays ``(symbol, datetime, ltp, volume)`` ticks in order, at ``replay_speed``
+        times recorded pace (0 = as fast as the loop allows), stamped with the wall clock."""
+        broker = self.broker
+        started, first = time.perf_counter(), None
+        emitted = 0
+        ticks = broker.replay.iter_ticks() if hasattr(broker.replay, "iter_ticks") else broker.replay
+        for symbol, ts, ltp, volume in ticks:
+            if not self._running:
+                return
+            if symbol not in self.tokens:
+                continue
+            first = first or ts
+            if broker.replay_speed:
+                delay = (ts - first).total_seconds() / broker.replay_speed - (time.perf_counter() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            self.on_tick({"symbol": symbol, "token": self.tokens[symbol], "ltp": ltp, "timestamp": datetime.now(), "volume": volume})
+            emitted += 1
+            if not broker.replay_speed and emitted % 1000 == 0:
+                await asyncio.sleep(0)
+        while self._running:
+            await asyncio.sleep(1)
+
+    async def close(self) -> None:
+        self._running = False
+
+
+class SimulatedBroker(BrokerBase):
+    """Synthetic market for load tests: random-walk prices for any subscribed symbol at
+    ``ticks_per_symbol`` ticks/s each, multiplied by ``burst_multiplier`` for the first
+    ``burst_seconds`` of the feed (the opening bell) and again every ``burst_interval``
+    seconds if set. Orders are acknowledged after ``order_latency`` (± ``latency_jitter``)
+    seconds; ``failure_rate`` of calls raise and ``reject_rate`` come back rejected.
+    ``replay`` (``TickArrays`` or a list of backtest ``Tick`` tuples) replaces the generator."""
+
+    name = "simulated"
+    max_instruments_per_connection = 1000
+
+    def __init__(
+        self,
+        ticks_per_symbol: float = 1.0,
+        burst_multiplier: float = 1.0,
+        burst_seconds: float = 0.0,
+        burst_interval: float = 0.0,
+        volatility: float = 0.001,
+        order_latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        reject_rate: float = 0.0,
+        starting_balance: float = 10_000_000.0,
+        replay=None,
+        replay_speed: float = 1.0,
+        feed_slice: float = 0.01,
+        seed: int | None = None,
+    ):
+        self.ticks_per_symbol = ticks_per_symbol
+        self.burst_multiplier = burst_multiplier
+        self.burst_seconds = burst_seconds
+        self.burst_interval = burst_interval
+        self.volatility = volatility
+        self.order_latency = order_latency
+        self.latency_jitter = latency_jitter
+        self.failure_rate = failure_rate
+        self.reject_rate = reject_rate
+        self.balance = starting_balance
+        self.replay = replay
+        self.replay_speed = replay_speed
+        self.feed_slice = feed_slice
+        self.rng = random.Random(seed)
+        self.prices: dict[str, float] = {}
+        self.connected = False
+        self.orders = 0
+        self.failures = 0
+        self.rejections = 0
+        self._started: float | None = None
+        self._order_seq = 0
+
+    def open_session(self):
+        """Restarts the burst schedule: the next feed slice is the opening bell."""
+        self._started = None
+
+    def rate(self, now: float) -> float:
+        """Ticks per second per symbol at ``now`` (``perf_counter``)."""
+        if self._started is None:
+            self._started = now
+        elapsed = now - self._started
+        if self.burst_interval:
+            elapsed %= self.burst_interval
+        return self.ticks_per_symbol * (self.burst_multiplier if elapsed < self.burst_seconds else 1.0)
+
+    def price(self, symbol: str) -> float:
+        price = self.prices.get(symbol)
+        if price is None:
+            price = self.prices[symbol] = round(self.rng.uniform(100, 2000), 2)
+        return price
+
+    def next_tick(self, symbol: str, token: str, stamp: datetime) -> dict:
+        price = self.prices[symbol] = round(self.price(symbol) * math.exp(self.rng.gauss(0.0, self.volatility)), 2)
+        return {"symbol": symbol, "token": token, "ltp": price, "timestamp": stamp, "volume": float(self.rng.randint(1, 500))}
+
+    async def _order(self, kind: str) -> dict:
+        delay = self.order_latency + self.rng.uniform(-self.latency_jitter, self.latency_jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        self.orders += 1
+        if self.rng.random() < self.failure_rate:
+            self.failures += 1
+            raise ConnectionError("Simulated broker failure")
+        if self.rng.random() < self.reject_rate:
+            self.rejections += 1
+            return {"status": "rejected", "reason": "Simulated rejection"}
+        self._order_seq += 1
+        return {"status": "success", "order_id": f"SIM-{kind}-{self._order_seq}"}
+
+    async def connect(self) -> None:
+        self.connected = True
+
+    async def fetch_balance(self) -> dict:
+        return {"available_balance": self.balance, "used_margin": 0.0, "free_margin": self.balance}
+
+    async def validate_token(self, symbol: str, token: str) -> bool:
+        return bool(symbol and token)
+
+    async def place_limit_order(self, payload: dict) -> dict:
+        return await self._order("LMT")
+
+    async def place_stoploss_order(self, payload: dict) -> dict:
+        return await self._order("SL")
+
+    async def exit_position(self, payload: dict) -> dict:
+        return await self._order("EXIT")
+
+    async def cancel_order(self, order_id: str) -> dict:
+        return await self._order("CXL")
+
+    def open_feed(self, on_tick: Callable[[dict], None]) -> SimulatedFeedConnection:
+        return SimulatedFeedConnection(self, on_tick)
+
+    async def subscribe_ticks(self, subscriptions: list[dict], on_tick: Callable[[dict], None]) -> None:
+        connection = self.open_feed(on_tick)
+        await connection.subscribe(subscriptions)
+        await connection.run()
+
+    async def fetch_historical_candles(self, symbol: str, token: str, limit: int) -> list[dict]:
+        """Random-walk 1-minute bars ending at the previous minute, so warm-start gives
+        strategies enough history to trade from the first tick."""
+        end = datetime.now().replace(second=0, microsecond=0)
+        price = self.price(symbol)
+        closes = [price]
+        for _ in range(limit - 1):
+            closes.append(round(closes[-1] / math.exp(self.rng.gauss(0.0, self.volatility * 5)), 2))
+        candles = []
+        for index, close in enumerate(reversed(closes)):
+            spread = close * self.volatility * 2
+            open_ = round(close + self.rng.uniform(-spread, spread), 2)
+            candles.append({
+                "ts": end - timedelta(minutes=limit - index),
+                "open": open_,
+                "high": round(max(open_, close) + spread, 2),
+                "low": round(min(open_, close) - spread, 2),
+                "close": close,
+                "volume": float(self.rng.randint(1000, 50000)),
+            })
+        return candles
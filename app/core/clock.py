@@ -0,0 +1,26 @@
+from datetime import datetime
+
+
+class Clock:
+    def now(self) -> datetime:
+        return datetime.now()
+
+    def utcnow(self) -> datetime:
+        return datetime.utcnow()
+
+
+class SimulatedClock(Clock):
+    def __init__(self, start: datetime | None = None):
+        self.current = start or datetime(1970, 1, 1)
+
+    def set(self, ts: datetime):
+        self.current = ts
+
+    def now(self) -> datetime:
+        return self.current
+
+    def utcnow(self) -> datetime:
+        return self.current
+
+
+system_clock = Clock()
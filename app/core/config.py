@@ -4,14 +4,63 @@ from pydantic import BaseModel
 class Settings(BaseModel):
     app_name: str = "Intraday Equity Trader"
     database_url: str = "sqlite:///./trading_app.db"
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
     broker_name: str = "angel"
     broker_retry_attempts: int = 3
+    broker_retry_delay: float = 0.5
+    order_concurrency: int = 8
+    order_dedupe_window_seconds: float = 120.0
+    trade_retention_days: int = 90
+    event_retention_days: int = 30
+    retention_interval_seconds: float = 3600.0
+    snapshot_path: str | None = "./trading_state.json"
+    snapshot_interval_seconds: float = 5.0
     min_balance_threshold: float = 1000.0
+    balance_refresh_seconds: float = 5.0
     auto_square_off_time: str = "15:15"
     market_open_time: str = "09:15"
     market_close_time: str = "15:30"
+    candle_history_size: int = 500
+    candle_timeframes: list[int] = [3, 5, 15]
+    timeframe_history_size: int = 200
+    max_subscriptions: int = 500
+    batch_eval_min_symbols: int = 32
+    archive_dir: str | None = "./archive"
+    archive_flush_interval: float = 1.0
+    backfill_bars: int = 60
+    backfill_concurrency: int = 8
     telegram_token: str | None = None
     telegram_chat_id: str | None = None
+    telegram_api_url: str = "https://api.telegram.org"
+    alert_queue_size: int = 1000
+    alert_batch_window: float = 0.5
+    alert_rate_per_second: float = 1.0
+    dashboard_push_interval: float = 0.5
+    dashboard_keepalive_seconds: float = 15.0
+    position_flush_interval: float = 1.0
+    position_exit_retry_seconds: float = 1.0
+    position_exit_retry_max_seconds: float = 30.0
+    feed_instruments_per_connection: int | None = None
+    dispatch_capacity: int = 1000
+    dispatch_high_lag_seconds: float = 1.0
+    dispatch_low_lag_seconds: float = 0.25
+    strategy_workers: int = 0
+    shared_symbol_capacity: int = 2000
+    shared_bar_lookback: int = 64
+    cluster_poll_interval: float = 0.002
+    profiler_enabled: bool = False
+    profiler_interval: float = 0.005
+    profiler_max_seconds: float = 60.0
+    profile_dir: str = "./profiles"
+    sim_ticks_per_symbol: float = 1.0
+    sim_burst_multiplier: float = 1.0
+    sim_burst_seconds: float = 0.0
+    sim_burst_interval: float = 0.0
+    sim_order_latency: float = 0.0
+    sim_failure_rate: float = 0.0
+    sim_reject_rate: float = 0.0
+    sim_seed: int | None = None
 
 
 settings = Settings()
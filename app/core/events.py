@@ -0,0 +1,19 @@
+from collections import defaultdict
+from typing import Any, Callable
+
+
+class EventBus:
+    def __init__(self):
+        self._handlers: dict[str, list[Callable[[Any], None]]] = defaultdict(list)
+
+    def subscribe(self, topic: str, handler: Callable[[Any], None]):
+        self._handlers[topic].append(handler)
+
+    def unsubscribe(self, topic: str, handler: Callable[[Any], None]):
+        handlers = self._handlers.get(topic)
+        if handlers and handler in handlers:
+            handlers.remove(handler)
+
+    def publish(self, topic: str, payload: Any):
+        for handler in self._handlers.get(topic, ()):
+            handler(payload)
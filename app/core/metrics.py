@@ -0,0 +1,159 @@
+import asyncio
+from bisect import bisect_left
+
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help: str = "",
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+        labels: dict[str, str] | None = None,
+    ):
+        self.name = name
+        self.help = help
+        self.labels = labels or {}
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return self.buckets[index] if index < len(self.buckets) else float("inf")
+        return float("inf")
+
+    def reset(self):
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def snapshot(self) -> dict:
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        buckets["+Inf"] = self.count
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "avg": self.sum / self.count if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "buckets": buckets,
+        }
+
+
+class Counter:
+    """Monotonic count of events (failures, retries) rendered as a Prometheus counter."""
+
+    def __init__(self, name: str, help: str = "", labels: dict[str, str] | None = None):
+        self.name = name
+        self.help = help
+        self.labels = labels or {}
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def reset(self):
+        self.value = 0.0
+
+
+_histograms: dict[str, Histogram] = {}
+_counters: dict[str, Counter] = {}
+
+
+def _label_text(labels: dict[str, str]) -> str:
+    return ",".join(f'{key}="{value}"' for key, value in labels.items())
+
+
+def histogram(
+    name: str,
+    help: str = "",
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    labels: dict[str, str] | None = None,
+) -> Histogram:
+    key = f"{name}{{{_label_text(labels)}}}" if labels else name
+    if key not in _histograms:
+        _histograms[key] = Histogram(name, help, buckets, labels)
+    return _histograms[key]
+
+
+def counter(name: str, help: str = "", labels: dict[str, str] | None = None) -> Counter:
+    key = f"{name}{{{_label_text(labels)}}}" if labels else name
+    if key not in _counters:
+        _counters[key] = Counter(name, help, labels)
+    return _counters[key]
+
+
+def histograms_snapshot() -> dict[str, dict]:
+    return {name: h.snapshot() for name, h in _histograms.items()}
+
+
+def counters_snapshot() -> dict[str, float]:
+    return {name: c.value for name, c in _counters.items()}
+
+
+def reset_histograms():
+    for h in _histograms.values():
+        h.reset()
+
+
+def reset_counters():
+    for c in _counters.values():
+        c.reset()
+
+
+def render_prometheus() -> str:
+    """All histograms and counters in the Prometheus text exposition format (version 0.0.4)."""
+    lines = []
+    described = set()
+    for h in sorted(_histograms.values(), key=lambda h: h.name):
+        if h.name not in described:
+            described.add(h.name)
+            lines.append(f"# HELP {h.name} {h.help}")
+            lines.append(f"# TYPE {h.name} histogram")
+        labels = _label_text(h.labels)
+        prefix = f"{labels}," if labels else ""
+        cumulative = 0
+        for bound, count in zip(h.buckets, h.counts):
+            cumulative += count
+            lines.append(f'{h.name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+        lines.append(f'{h.name}_bucket{{{prefix}le="+Inf"}} {h.count}')
+        suffix = f"{{{labels}}}" if labels else ""
+        lines.append(f"{h.name}_sum{suffix} {h.sum}")
+        lines.append(f"{h.name}_count{suffix} {h.count}")
+    for c in sorted(_counters.values(), key=lambda c: c.name):
+        if c.name not in described:
+            described.add(c.name)
+            lines.append(f"# HELP {c.name} {c.help}")
+            lines.append(f"# TYPE {c.name} counter")
+        labels = _label_text(c.labels)
+        lines.append(f"{c.name}{{{labels}}} {c.value}" if labels else f"{c.name} {c.value}")
+    return "\n".join(lines) + "\n"
+
+
+async def monitor_event_loop_lag(interval: float = 0.1):
+    lag = histogram("event_loop_lag_seconds", "Delay between a scheduled wake-up and when the loop ran it")
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(interval)
+        lag.observe(max(loop.time() - started - interval, 0.0))
@@ -0,0 +1,47 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+
+class SamplingProfiler:
+    """Samples the Python stack of every other thread each ``interval`` seconds for a
+    fixed window and aggregates them as folded stacks (``thread;outer;...;inner count``),
+    the input format of flamegraph.pl, speedscope and inferno. Sampling from a side
+    thread costs the profiled code nothing but a GIL hand-off per sample."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+
+    @staticmethod
+    def _fold(frame) -> str:
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+    def run(self, duration: float) -> Counter[str]:
+        me = threading.get_ident()
+        ends = time.perf_counter() + duration
+        while time.perf_counter() < ends:
+            threads = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident != me:
+                    self.stacks[f"{threads.get(ident, ident)};{self._fold(frame)}"] += 1
+            self.samples += 1
+            time.sleep(self.interval)
+        return self.stacks
+
+    def dump(self, directory: str) -> str:
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"profile-{datetime.now():%Y%m%d-%H%M%S}.folded")
+        with open(path, "w") as handle:
+            for stack, count in self.stacks.most_common():
+                handle.write(f"{stack} {count}\n")
+        return path
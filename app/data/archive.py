@@ -0,0 +1,137 @@
+import asyncio
+import os
+import threading
+from array import array
+from datetime import date, datetime
+
+import numpy as np
+
+TICK_COLUMNS = ("ts", "ltp", "volume")
+CANDLE_COLUMNS = ("ts", "open", "high", "low", "close", "volume")
+
+
+def _column_path(root: str, day: str, symbol: str, kind: str, column: str) -> str:
+    return os.path.join(root, day, symbol, f"{kind}.{column}.f8")
+
+
+class ArchiveRecorder:
+    """Buffers ticks and closed candles in memory and appends them to per-day,
+    per-symbol raw float64 column files from a worker thread."""
+
+    def __init__(self, root: str, flush_interval: float = 1.0):
+        self.root = root
+        self.flush_interval = flush_interval
+        self.written = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: dict[tuple[str, str, date], tuple[array, ...]] = {}
+        self._task = None
+
+    def _buffers(self, kind: str, columns: tuple[str, ...], day: date, symbol: str) -> tuple[array, ...]:
+        key = (kind, symbol, day)
+        buffers = self._pending.get(key)
+        if buffers is None:
+            buffers = self._pending[key] = tuple(array("d") for _ in columns)
+        return buffers
+
+    def record_tick(self, tick: dict):
+        ts = tick["timestamp"]
+        if isinstance(ts, str):
+            ts = datetime.fromisoformat(ts)
+        with self._lock:
+            stamps, prices, volumes = self._buffers("ticks", TICK_COLUMNS, ts.date(), tick["symbol"])
+            stamps.append(ts.timestamp())
+            prices.append(tick["ltp"])
+            volumes.append(tick.get("volume", 1))
+
+    def record_batch(self, batch):
+        with self._lock:
+            for index, symbol in enumerate(batch.symbols()):
+                stamps, prices, volumes = batch.ticks_for(index)
+                first, last = date.fromtimestamp(stamps[0]), date.fromtimestamp(stamps[-1])
+                if first == last:
+                    buffers = self._buffers("ticks", TICK_COLUMNS, first, symbol)
+                    for buffer, values in zip(buffers, (stamps, prices, volumes)):
+                        buffer.frombytes(values.tobytes())
+                    continue
+                for ts, ltp, volume in zip(stamps.tolist(), prices.tolist(), volumes.tolist()):
+                    buffers = self._buffers("ticks", TICK_COLUMNS, date.fromtimestamp(ts), symbol)
+                    for buffer, value in zip(buffers, (ts, ltp, volume)):
+                        buffer.append(value)
+
+    def record_candle(self, event: dict):
+        candle = event["candle"]
+        ts = candle["ts"]
+        with self._lock:
+            buffers = self._buffers("candles", CANDLE_COLUMNS, ts.date(), event["symbol"])
+            buffers[0].append(ts.timestamp())
+            for buffer, column in zip(buffers[1:], CANDLE_COLUMNS[1:]):
+                buffer.append(candle[column])
+
+    def flush(self) -> int:
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            rows = 0
+            for (kind, symbol, day), buffers in pending.items():
+                columns = TICK_COLUMNS if kind == "ticks" else CANDLE_COLUMNS
+                os.makedirs(os.path.join(self.root, day.isoformat(), symbol), exist_ok=True)
+                for column, buffer in zip(columns, buffers):
+                    with open(_column_path(self.root, day.isoformat(), symbol, kind, column), "ab") as handle:
+                        buffer.tofile(handle)
+                rows += len(buffers[0])
+            self.written += rows
+            return rows
+
+    async def start(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await asyncio.to_thread(self.flush)
+
+    def run(self):
+        if not self._task:
+            self._task = asyncio.create_task(self.start())
+
+
+class ArchiveReader:
+    def __init__(self, root: str):
+        self.root = root
+
+    def days(self) -> list[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(d for d in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, d)))
+
+    def symbols(self, day: str) -> list[str]:
+        path = os.path.join(self.root, day)
+        return sorted(os.listdir(path)) if os.path.isdir(path) else []
+
+    def _read(self, day: str, symbol: str, kind: str, columns: tuple[str, ...]) -> dict[str, np.ndarray]:
+        data = {}
+        for column in columns:
+            path = _column_path(self.root, day, symbol, kind, column)
+            if not os.path.exists(path) or not os.path.getsize(path):
+                data[column] = np.zeros(0, dtype=np.float64)
+            else:
+                data[column] = np.memmap(path, dtype=np.float64, mode="r")
+        size = min(len(values) for values in data.values())
+        return {column: values[:size] for column, values in data.items()}
+
+    def ticks(self, day: str, symbol: str) -> dict[str, np.ndarray]:
+        return self._read(day, symbol, "ticks", TICK_COLUMNS)
+
+    def candles(self, day: str, symbol: str) -> dict[str, np.ndarray]:
+        return self._read(day, symbol, "candles", CANDLE_COLUMNS)
+
+    def recent_candles(self, symbol: str, limit: int) -> list[dict]:
+        candles: list[dict] = []
+        for day in reversed(self.days()):
+            columns = self.candles(day, symbol)
+            rows = [
+                {"ts": datetime.fromtimestamp(row[0]), **dict(zip(CANDLE_COLUMNS[1:], row[1:]))}
+                for row in zip(*(columns[c][-(limit - len(candles)):].tolist() for c in CANDLE_COLUMNS))
+            ]
+            candles[:0] = rows
+            if len(candles) >= limit:
+                break
+        return candles
@@ -1,18 +1,38 @@
-from collections import defaultdict
 from datetime import datetime
 
+import numpy as np
+
+from app.core.config import settings
+from app.data.candle_store import FIELDS, CandleSeries, CandleStore, CandleWindow
+from app.data.ticks import SymbolTable, TickBatch
+from app.data.timeframes import TimeframeStore
+
 
 class CandleBuilder:
-    def __init__(self):
+    def __init__(self, history_size: int | None = None):
         self.current = {}
-        self.history = defaultdict(list)
+        self.history = CandleStore(history_size or settings.candle_history_size)
+        self.timeframes = {
+            minutes: TimeframeStore(self.history, minutes, settings.timeframe_history_size)
+            for minutes in settings.candle_timeframes
+        }
+        self.symbols = SymbolTable()
+        self._open = np.zeros((len(FIELDS), 0))
+        self._live = np.zeros(0, dtype=bool)
+        self._batched: set[str] = set()
 
-    def process_tick(self, symbol: str, ltp: float, ts: datetime):
+    def process_tick(self, symbol: str, ltp: float, ts: datetime, volume: float = 1):
+        if symbol in self._batched:
+            self._release(symbol)
         key = (symbol, ts.replace(second=0, microsecond=0))
         if symbol not in self.current or self.current[symbol]["bucket"] != key[1]:
+            closed = None
             if symbol in self.current:
-                closed = self.current[symbol]
-                self.history[symbol].append({k: v for k, v in closed.items() if k != "bucket"})
+                closed = self.current.pop(symbol)
+                del closed["bucket"]
+                self.history.create(symbol).append(
+                    closed["ts"].timestamp(), closed["open"], closed["high"], closed["low"], closed["close"], closed["volume"]
+                )
             self.current[symbol] = {
                 "bucket": key[1],
                 "ts": key[1],
@@ -20,15 +40,141 @@ class CandleBuilder:
                 "high": ltp,
                 "low": ltp,
                 "close": ltp,
-                "volume": 1,
+                "volume": volume,
             }
-            return
+            return closed
 
         candle = self.current[symbol]
         candle["high"] = max(candle["high"], ltp)
         candle["low"] = min(candle["low"], ltp)
         candle["close"] = ltp
-        candle["volume"] += 1
+        candle["volume"] += volume
+        return None
+
+    def process_batch(self, batch: TickBatch) -> list[tuple[str, dict]]:
+        """Bulk equivalent of ``process_tick``. Open candles of batch-fed symbols live in
+        columnar arrays indexed by symbol id, so ticks are reduced to one OHLCV run per
+        (symbol, minute) and merged with NumPy; only closed candles touch Python objects."""
+        if batch.table is not self.symbols:
+            raise ValueError("TickBatch must be built on the candle builder's symbol table")
+        order, ids, starts = batch.groups()
+        if not len(order):
+            return []
+        self._reserve(len(self.symbols))
+        if self.current:
+            self._adopt(ids)
+
+        ltp = batch.ltp[order]
+        buckets = np.floor(batch.ts[order] / 60) * 60
+        group = np.repeat(np.arange(len(ids)), np.diff(np.r_[starts, len(order)]))
+        run_starts = np.flatnonzero(np.r_[True, (group[1:] != group[:-1]) | (buckets[1:] != buckets[:-1])])
+        run_ends = np.r_[run_starts[1:], len(order)] - 1
+        run_ids = ids[group[run_starts]]
+        runs = np.vstack((
+            buckets[run_starts],
+            ltp[run_starts],
+            np.maximum.reduceat(ltp, run_starts),
+            np.minimum.reduceat(ltp, run_starts),
+            ltp[run_ends],
+            np.add.reduceat(batch.volume[order], run_starts),
+        ))
+
+        first = np.r_[True, run_ids[1:] != run_ids[:-1]]
+        last = np.r_[run_ids[1:] != run_ids[:-1], True]
+        state = self._open[:, run_ids]
+        live = self._live[run_ids]
+        merged = np.flatnonzero(first & live & (state[0] == runs[0]))
+        runs[1, merged] = state[1, merged]
+        runs[2, merged] = np.maximum(state[2, merged], runs[2, merged])
+        runs[3, merged] = np.minimum(state[3, merged], runs[3, merged])
+        runs[5, merged] += state[5, merged]
+
+        superseded = np.flatnonzero(first & live)
+        superseded = superseded[state[0, superseded] != runs[0, superseded]]
+        finished = np.flatnonzero(~last)
+        rank = np.argsort(np.r_[2 * superseded, 2 * finished + 1])
+        closed_ids = np.r_[run_ids[superseded], run_ids[finished]][rank]
+        closed_rows = np.hstack((state[:, superseded], runs[:, finished]))[:, rank]
+
+        tails = np.flatnonzero(last)
+        tail_ids = run_ids[tails]
+        names = self.symbols.names
+        self._batched.update(names[i] for i in tail_ids[~self._live[tail_ids]].tolist())
+        self._open[:, tail_ids] = runs[:, tails]
+        self._live[tail_ids] = True
+
+        closed_candles = []
+        for symbol_id, row in zip(closed_ids.tolist(), closed_rows.T.tolist()):
+            symbol = names[symbol_id]
+            self.history.create(symbol).append(*row)
+            closed_candles.append((symbol, {"ts": datetime.fromtimestamp(row[0]), **dict(zip(FIELDS[1:], row[1:]))}))
+        return closed_candles
+
+    def _reserve(self, size: int):
+        if size <= len(self._live):
+            return
+        capacity = max(size, 2 * len(self._live), 64)
+        grown = np.zeros((len(FIELDS), capacity))
+        grown[:, : len(self._live)] = self._open
+        self._open = grown
+        self._live = np.r_[self._live, np.zeros(capacity - len(self._live), dtype=bool)]
+
+    def _adopt(self, ids: np.ndarray):
+        names = self.symbols.names
+        for symbol_id in ids.tolist():
+            candle = self.current.pop(names[symbol_id], None)
+            if candle is None:
+                continue
+            self._open[:, symbol_id] = (
+                candle["bucket"].timestamp(), candle["open"], candle["high"], candle["low"], candle["close"], candle["volume"]
+            )
+            self._live[symbol_id] = True
+            self._batched.add(names[symbol_id])
+
+    def _release(self, symbol: str):
+        self._batched.discard(symbol)
+        symbol_id = self.symbols.ids[symbol]
+        if not self._live[symbol_id]:
+            return
+        self._live[symbol_id] = False
+        bucket, open_, high, low, close, volume = self._open[:, symbol_id].tolist()
+        start = datetime.fromtimestamp(bucket)
+        self.current[symbol] = {
+            "bucket": start, "ts": start, "open": open_, "high": high, "low": low, "close": close, "volume": volume,
+        }
+
+    def timeframe(self, minutes: int) -> "CandleBuilder | TimeframeStore":
+        """The bar source for ``minutes`` (``self`` for 1-minute bars)."""
+        if minutes == 1:
+            return self
+        if minutes not in self.timeframes:
+            raise ValueError(f"Timeframe {minutes}m is not in settings.candle_timeframes")
+        return self.timeframes[minutes]
+
+    def get_recent(self, symbol: str, limit: int = 50) -> CandleWindow:
+        return self.history.window(symbol, limit)
+
+    def seed(self, symbol: str, candles: list[dict]) -> int:
+        existing = self.history.series.get(symbol)
+        if existing and len(existing) >= existing.capacity:
+            return 0
+        live = existing.window(existing.capacity) if existing else None
+        cutoff = float("inf")
+        if live is not None and len(live):
+            cutoff = float(live.ts[0])
+        elif symbol in self.current:
+            cutoff = self.current[symbol]["ts"].timestamp()
+        elif symbol in self._batched and self._live[self.symbols.ids[symbol]]:
+            cutoff = float(self._open[0, self.symbols.ids[symbol]])
 
-    def get_recent(self, symbol: str, limit: int = 50):
-        return self.history[symbol][-limit:]
+        older = [c for c in candles if c["ts"].timestamp() < cutoff]
+        if not older:
+            return 0
+        series = CandleSeries(self.history.capacity)
+        for candle in sorted(older, key=lambda c: c["ts"]):
+            series.append(candle["ts"].timestamp(), candle["open"], candle["high"], candle["low"], candle["close"], candle["volume"])
+        if live is not None:
+            for row in zip(*(getattr(live, field).tolist() for field in FIELDS)):
+                series.append(*row)
+        self.history.series[symbol] = series
+        return len(older)
@@ -0,0 +1,88 @@
+import numpy as np
+
+FIELDS = ("ts", "open", "high", "low", "close", "volume")
+
+
+class CandleWindow:
+    __slots__ = FIELDS
+
+    def __init__(self, block: np.ndarray):
+        self.ts, self.open, self.high, self.low, self.close, self.volume = block
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+
+# Returned for symbols without bars, so reads never allocate a ring buffer.
+EMPTY = CandleWindow(np.zeros((len(FIELDS), 0), dtype=np.float64))
+
+
+class CandleSeries:
+    """Fixed-capacity columnar ring buffer of closed candles.
+
+    Every bar is written twice (at ``i`` and ``i + capacity``) so the most recent
+    ``n`` bars are always one contiguous slice and can be returned as views.
+    Views are live: a view of ``n`` bars stays valid for the next ``capacity - n``
+    appends, so a full-capacity view is overwritten by the very next one. Copy a
+    view that must outlive new bars.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.count = 0
+        self._head = 0
+        self._data = np.zeros((len(FIELDS), 2 * capacity), dtype=np.float64)
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    def append(self, ts: float, open: float, high: float, low: float, close: float, volume: float):
+        bar = (ts, open, high, low, close, volume)
+        self._data[:, self._head] = bar
+        self._data[:, self._head + self.capacity] = bar
+        self._head = (self._head + 1) % self.capacity
+        self.count += 1
+
+    def block(self, limit: int) -> np.ndarray:
+        size = min(limit, len(self))
+        end = self._head + self.capacity
+        return self._data[:, end - size:end]
+
+    def window(self, limit: int) -> CandleWindow:
+        return CandleWindow(self.block(limit))
+
+    def last(self) -> dict | None:
+        if not self.count:
+            return None
+        index = (self._head - 1) % self.capacity
+        return dict(zip(FIELDS, self._data[:, index].tolist()))
+
+
+class CandleStore:
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.series: dict[str, CandleSeries] = {}
+
+    def get(self, symbol: str) -> CandleSeries | None:
+        return self.series.get(symbol)
+
+    def create(self, symbol: str) -> CandleSeries:
+        """The series to append ``symbol``'s bars to, allocated on first write."""
+        series = self.series.get(symbol)
+        if series is None:
+            series = self.series[symbol] = CandleSeries(self.capacity)
+        return series
+
+    def drop(self, symbol: str):
+        self.series.pop(symbol, None)
+
+    def count(self, symbol: str) -> int:
+        series = self.series.get(symbol)
+        return series.count if series else 0
+
+    def window(self, symbol: str, limit: int) -> CandleWindow:
+        series = self.series.get(symbol)
+        return series.window(limit) if series else EMPTY
+
+    def nbytes(self) -> int:
+        return sum(s._data.nbytes for s in self.series.values())
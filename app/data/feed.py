@@ -0,0 +1,183 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Callable
+
+from app.brokers.base import FeedConnection
+from app.core.metrics import histogram
+
+
+class FeedShard:
+    def __init__(self, index: int, connection: FeedConnection):
+        self.index = index
+        self.connection = connection
+        self.tokens: dict[str, str] = {}
+        self.connected = False
+        self.reconnects = 0
+        self.ticks = 0
+        self.ticks_per_second = 0.0
+        self.last_tick_at: float | None = None
+        self.lag = histogram(
+            "feed_tick_lag_seconds", "Tick timestamp to receipt delay per feed connection", labels={"connection": str(index)}
+        )
+        self.task: asyncio.Task | None = None
+        self._window_start = time.monotonic()
+        self._window_ticks = 0
+
+    def record(self, lag: float):
+        now = time.monotonic()
+        self.ticks += 1
+        self._window_ticks += 1
+        self.last_tick_at = now
+        if now - self._window_start >= 1.0:
+            self.ticks_per_second = self._window_ticks / (now - self._window_start)
+            self._window_start, self._window_ticks = now, 0
+        self.lag.observe(max(lag, 0.0))
+
+    def stats(self) -> dict:
+        idle = time.monotonic() - self.last_tick_at if self.last_tick_at is not None else None
+        return {
+            "connection": self.index,
+            "connected": self.connected,
+            "instruments": len(self.tokens),
+            "ticks": self.ticks,
+            "ticks_per_second": round(self.ticks_per_second, 1),
+            "seconds_since_last_tick": round(idle, 3) if idle is not None else None,
+            "reconnects": self.reconnects,
+            "lag_p50": self.lag.quantile(0.5),
+            "lag_p99": self.lag.quantile(0.99),
+        }
+
+
+class FeedManager:
+    """Keeps the broker feed in step with the subscription set by sending only
+    subscribe/unsubscribe deltas, sharding instruments across as many connections
+    as the broker's per-connection limit requires. A dropped connection reconnects
+    on its own and re-subscribes only its shard."""
+
+    def __init__(
+        self,
+        broker,
+        on_tick: Callable[[dict], None],
+        per_connection: int | None = None,
+        on_disconnect: Callable[[], None] | None = None,
+        on_reconnect: Callable[[], None] | None = None,
+        retry_delay: float = 2.0,
+    ):
+        self.broker = broker
+        self.on_tick = on_tick
+        self.per_connection = per_connection or broker.max_instruments_per_connection
+        self.on_disconnect = on_disconnect
+        self.on_reconnect = on_reconnect
+        self.retry_delay = retry_delay
+        self.shards: list[FeedShard] = []
+        self.assigned: dict[str, FeedShard] = {}
+        self._lock = asyncio.Lock()
+
+    @property
+    def connected(self) -> bool:
+        return all(shard.connected for shard in self.shards if shard.tokens)
+
+    async def sync(self, subscriptions: dict[str, str]):
+        async with self._lock:
+            removed = [symbol for symbol in self.assigned if symbol not in subscriptions]
+            await self._remove(removed)
+            await self._add({s: t for s, t in subscriptions.items() if s not in self.assigned})
+            await self._prune()
+
+    async def add(self, symbol: str, token: str):
+        async with self._lock:
+            await self._add({symbol: token})
+
+    async def remove(self, symbol: str):
+        async with self._lock:
+            await self._remove([symbol])
+            await self._prune()
+
+    async def _add(self, items: dict[str, str]):
+        """Assigns new symbols; one already assigned is skipped, or moved if its token changed."""
+        moved = [s for s, t in items.items() if s in self.assigned and self.assigned[s].tokens[s] != t]
+        await self._remove(moved)
+        pending = [(s, t) for s, t in items.items() if s not in self.assigned]
+        while pending:
+            shard = min((s for s in self.shards if len(s.tokens) < self.per_connection), key=lambda s: len(s.tokens), default=None)
+            if shard is None:
+                shard = self._open_shard()
+            room = self.per_connection - len(shard.tokens)
+            chunk, pending = dict(pending[:room]), pending[room:]
+            shard.tokens.update(chunk)
+            for symbol in chunk:
+                self.assigned[symbol] = shard
+            if shard.connected:
+                await shard.connection.subscribe([{"symbol": s, "token": t} for s, t in chunk.items()])
+
+    async def _remove(self, symbols: list[str]):
+        by_shard: dict[FeedShard, list[str]] = {}
+        for symbol in symbols:
+            shard = self.assigned.pop(symbol, None)
+            if shard:
+                shard.tokens.pop(symbol, None)
+                by_shard.setdefault(shard, []).append(symbol)
+        for shard, dropped in by_shard.items():
+            if shard.connected:
+                await shard.connection.unsubscribe(dropped)
+
+    async def _prune(self):
+        """Closes and drops connections left without instruments."""
+        for shard in [s for s in self.shards if not s.tokens]:
+            self.shards.remove(shard)
+            if shard.task:
+                shard.task.cancel()
+            await shard.connection.close()
+
+    def _open_shard(self) -> FeedShard:
+        # Reuse the lowest free index so connection labels stay bounded as shards come and go.
+        used = {shard.index for shard in self.shards}
+        index = next(i for i in range(len(self.shards) + 1) if i not in used)
+        shard = FeedShard(index, self.broker.open_feed(lambda tick: self._receive(shard, tick)))
+        self.shards.insert(index, shard)
+        shard.task = asyncio.create_task(self._run(shard))
+        return shard
+
+    def _receive(self, shard: FeedShard, tick: dict):
+        ts = tick["timestamp"]
+        if isinstance(ts, str):
+            ts = tick["timestamp"] = datetime.fromisoformat(ts)
+        if ts.tzinfo is None and shard.connection.utc_timestamps:
+            ts = ts.replace(tzinfo=timezone.utc)
+        shard.record(time.time() - ts.timestamp())
+        self.on_tick(tick)
+
+    async def _run(self, shard: FeedShard):
+        while True:
+            try:
+                shard.connected = True
+                if shard.tokens:
+                    await shard.connection.subscribe([{"symbol": s, "token": t} for s, t in shard.tokens.items()])
+                if shard.reconnects and self.on_reconnect and self.connected:
+                    self.on_reconnect()
+                await shard.connection.run()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                print("Feed connection dropped", shard.index, exc)
+            shard.connected = False
+            if self.on_disconnect:
+                self.on_disconnect()
+            await asyncio.sleep(self.retry_delay)
+            shard.reconnects += 1
+            shard.connection = self.broker.open_feed(lambda tick: self._receive(shard, tick))
+
+    async def close(self):
+        for shard in self.shards:
+            if shard.task:
+                shard.task.cancel()
+            await shard.connection.close()
+
+    def stats(self) -> dict:
+        return {
+            "per_connection": self.per_connection,
+            "instruments": len(self.assigned),
+            "connected": self.connected,
+            "connections": [shard.stats() for shard in self.shards],
+        }
@@ -1,39 +1,159 @@
 import asyncio
+import time
 from datetime import datetime
 
+import numpy as np
+
+from app.brokers.base import BrokerBase
+from app.core.config import settings
+from app.core.events import EventBus
+from app.core.metrics import histogram
+from app.data.archive import ArchiveReader
 from app.data.candle_builder import CandleBuilder
+from app.data.feed import FeedManager
+from app.data.ticks import LatestTicks, TickBatch
+from app.engine.indicators import IndicatorEngine
+
+tick_candle_seconds = histogram("tick_candle_seconds", "Tick receipt to candle update, per tick")
+batch_candle_seconds = histogram("tick_batch_candle_seconds", "Batch receipt to candle update, per batch")
 
 
 class MarketDataManager:
-    def __init__(self, broker):
+    def __init__(self, broker, events: EventBus | None = None):
         self.broker = broker
+        self.events = events or EventBus()
         self.candle_builder = CandleBuilder()
+        self.indicators = IndicatorEngine(self.candle_builder)
+        self.events.subscribe("candle_closed", self.indicators.on_candle_closed)
         self.subscriptions: dict[str, str] = {}
-        self.latest_ticks: dict[str, dict] = {}
+        self.symbols = self.candle_builder.symbols
+        self.latest_ticks = LatestTicks(self.symbols, self.subscriptions)
+        self.warming: set[str] = set()
+        self.archive = ArchiveReader(settings.archive_dir) if settings.archive_dir else None
         self.connected = False
         self._task = None
+        self._backfills: set[asyncio.Task] = set()
         self.disconnect_callback = None
+        self.feed = None
+        if getattr(type(broker), "open_feed", BrokerBase.open_feed) is not BrokerBase.open_feed:
+            self.feed = FeedManager(
+                broker,
+                self.handle_tick,
+                settings.feed_instruments_per_connection,
+                on_disconnect=self.on_disconnect,
+                on_reconnect=self.on_reconnect,
+            )
 
     def add_stock(self, symbol: str, token: str):
         self.subscriptions[symbol] = token
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self.warming.add(symbol)
+        self._spawn(self.backfill([symbol]))
+        if self.feed and self._task:
+            self._spawn(self.feed.add(symbol, token))
 
     def remove_stock(self, symbol: str):
         self.subscriptions.pop(symbol, None)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self.feed and self._task:
+            self._spawn(self.feed.remove(symbol))
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._backfills.add(task)
+        task.add_done_callback(self._backfills.discard)
+
+    def warm_up(self):
+        """Backfills every subscription in the background; the trading loop skips a
+        symbol until its history is in."""
+        symbols = list(self.subscriptions)
+        self.warming.update(symbols)
+        self._spawn(self.backfill(symbols))
+
+    async def backfill(self, symbols: list[str] | None = None, limit: int | None = None) -> dict[str, int]:
+        symbols = list(self.subscriptions) if symbols is None else symbols
+        limit = limit or settings.backfill_bars
+        semaphore = asyncio.Semaphore(settings.backfill_concurrency)
+        self.warming.update(symbols)
+
+        async def load(symbol: str) -> int:
+            async with semaphore:
+                candles = await self._historical_candles(symbol, limit)
+            seeded = self.candle_builder.seed(symbol, candles)
+            if seeded:
+                self.indicators.reset(symbol)
+                self.events.publish("history_seeded", {"symbol": symbol})
+            return seeded
+
+        try:
+            counts = await asyncio.gather(*(load(symbol) for symbol in symbols))
+        finally:
+            self.warming.difference_update(symbols)
+        return dict(zip(symbols, counts))
+
+    async def _historical_candles(self, symbol: str, limit: int) -> list[dict]:
+        try:
+            candles = await self.broker.fetch_historical_candles(symbol, self.subscriptions.get(symbol, ""), limit)
+            if candles:
+                return candles
+        except Exception:
+            pass
+        if self.archive:
+            return await asyncio.to_thread(self.archive.recent_candles, symbol, limit)
+        return []
 
     def on_disconnect(self):
         self.connected = False
         if self.disconnect_callback:
             self.disconnect_callback()
 
+    def on_reconnect(self):
+        self.connected = True
+
     def handle_tick(self, tick: dict):
+        started = time.perf_counter()
         symbol = tick["symbol"]
         ltp = tick["ltp"]
-        ts = datetime.fromisoformat(tick["timestamp"])
+        ts = tick["timestamp"]
+        if isinstance(ts, str):
+            ts = datetime.fromisoformat(ts)
         self.latest_ticks[symbol] = tick
-        self.candle_builder.process_tick(symbol, ltp, ts)
+        closed = self.candle_builder.process_tick(symbol, ltp, ts, tick.get("volume", 1))
+        tick_candle_seconds.observe(time.perf_counter() - started)
+        self.events.publish("tick", tick)
+        if closed:
+            self.events.publish("candle_closed", {"symbol": symbol, "candle": closed})
+
+    def handle_records(self, records) -> TickBatch:
+        """Compact ingestion: ``(symbol, epoch_seconds, ltp[, volume])`` tuples."""
+        batch = TickBatch.from_records(self.symbols, records)
+        self.handle_batch(batch)
+        return batch
+
+    def handle_batch(self, batch: TickBatch):
+        if not len(batch):
+            return
+        started = time.perf_counter()
+        order, ids, starts = batch.groups()
+        last = order[np.r_[starts[1:], len(order)] - 1]
+        self.latest_ticks.update_batch(ids, batch.ts[last], batch.ltp[last], batch.volume[last])
+        closed = self.candle_builder.process_batch(batch)
+        batch_candle_seconds.observe(time.perf_counter() - started)
+        self.events.publish("tick_batch", batch)
+        for symbol, candle in closed:
+            self.events.publish("candle_closed", {"symbol": symbol, "candle": candle})
 
     async def start(self):
         self.connected = True
+        if self.feed:
+            await self.feed.sync(self.subscriptions)
+            return
         while True:
             try:
                 payload = [{"symbol": s, "token": t} for s, t in self.subscriptions.items()]
@@ -0,0 +1,230 @@
+import time
+from datetime import datetime
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from app.core.config import settings
+from app.data.candle_store import FIELDS
+from app.data.timeframes import TimeframeStore
+
+WORKER_STATS = ("cycles", "symbols", "decisions", "busy_seconds")
+
+
+class SharedMarket:
+    """Latest prices and recent closed bars for every subscribed symbol, laid out as
+    NumPy arrays over one shared-memory block so other processes read them without
+    copying or messaging. A symbol's slot is its id in the owning process's
+    ``SymbolTable``.
+
+    ``tick_seq[slot]`` is bumped after each price write, so readers find changed
+    symbols by comparing it with the last value they saw. Bar rows are guarded by
+    ``bar_seq`` (odd while being written) and ``read_bars`` retries torn reads."""
+
+    def __init__(self, shm: SharedMemory, capacity: int, lookback: int, workers: int, owner: bool = False):
+        self.shm = shm
+        self.capacity = capacity
+        self.lookback = lookback
+        self.workers = workers
+        self.owner = owner
+        layout = self._layout(capacity, lookback, workers)
+        views = {}
+        offset = 0
+        for name, shape, dtype in layout:
+            views[name] = np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)
+            offset += int(np.prod(shape)) * np.dtype(dtype).itemsize
+        self._views = list(views)
+        self.status = views["status"]
+        self.tick_seq = views["tick_seq"]
+        self.ts = views["ts"]
+        self.ltp = views["ltp"]
+        self.volume = views["volume"]
+        self.received = views["received"]
+        self.warming = views["warming"]
+        self.bar_seq = views["bar_seq"]
+        self.bar_counts = views["bar_counts"]
+        self.bars = views["bars"]
+        self.worker_stats = views["worker_stats"]
+
+    @staticmethod
+    def _layout(capacity: int, lookback: int, workers: int) -> list[tuple[str, tuple, type]]:
+        return [
+            ("status", (2,), np.int64),
+            ("tick_seq", (capacity,), np.int64),
+            ("ts", (capacity,), np.float64),
+            ("ltp", (capacity,), np.float64),
+            ("volume", (capacity,), np.float64),
+            ("received", (capacity,), np.float64),
+            ("warming", (capacity,), np.int64),
+            ("bar_seq", (capacity,), np.int64),
+            ("bar_counts", (capacity,), np.int64),
+            ("bars", (len(FIELDS), capacity, lookback), np.float64),
+            ("worker_stats", (max(workers, 1), len(WORKER_STATS)), np.float64),
+        ]
+
+    @classmethod
+    def nbytes(cls, capacity: int, lookback: int, workers: int) -> int:
+        return sum(int(np.prod(shape)) * np.dtype(dtype).itemsize for _, shape, dtype in cls._layout(capacity, lookback, workers))
+
+    @classmethod
+    def create(cls, capacity: int, lookback: int, workers: int) -> "SharedMarket":
+        shm = SharedMemory(create=True, size=cls.nbytes(capacity, lookback, workers))
+        market = cls(shm, capacity, lookback, workers, owner=True)
+        shm.buf[:] = bytes(shm.size)
+        return market
+
+    @classmethod
+    def attach(cls, spec: tuple[str, int, int, int]) -> "SharedMarket":
+        name, capacity, lookback, workers = spec
+        return cls(SharedMemory(name=name), capacity, lookback, workers)
+
+    @property
+    def spec(self) -> tuple[str, int, int, int]:
+        return self.shm.name, self.capacity, self.lookback, self.workers
+
+    @property
+    def connected(self) -> bool:
+        return bool(self.status[0])
+
+    def write_ticks(self, slots: np.ndarray, ts: np.ndarray, ltp: np.ndarray, volume: np.ndarray):
+        self.ts[slots] = ts
+        self.ltp[slots] = ltp
+        self.volume[slots] = volume
+        self.received[slots] = time.perf_counter()
+        self.tick_seq[slots] += 1
+
+    def write_bars(self, slot: int, block: np.ndarray, count: int):
+        """``block`` is ``CandleSeries.block`` output (fields x bars, oldest first)."""
+        block = block[:, -self.lookback:]
+        self.bar_seq[slot] += 1
+        self.bars[:, slot, : self.lookback - block.shape[1]] = 0
+        self.bars[:, slot, self.lookback - block.shape[1]:] = block
+        self.bar_counts[slot] = count
+        self.bar_seq[slot] += 1
+
+    def read_bars(self, slot: int, limit: int) -> tuple[np.ndarray, int]:
+        while True:
+            seq = self.bar_seq[slot]
+            if seq % 2 == 0:
+                count = int(self.bar_counts[slot])
+                size = min(limit, count, self.lookback)
+                block = self.bars[:, slot, self.lookback - size:].copy()
+                if self.bar_seq[slot] == seq:
+                    return block, count
+            time.sleep(0)
+
+    def changed(self, slots: np.ndarray, seen: np.ndarray) -> np.ndarray:
+        """Slots among ``slots`` ticked since ``seen`` (indexed by slot, updated in place)."""
+        current = self.tick_seq[slots]
+        moved = slots[current != seen[slots]]
+        seen[slots] = current
+        return moved
+
+    def close(self):
+        for name in self._views:
+            setattr(self, name, None)
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class SharedSeries:
+    __slots__ = ("market", "slot", "count")
+
+    def __init__(self, market: SharedMarket, slot: int):
+        self.market = market
+        self.slot = slot
+        self.count = int(market.bar_counts[slot])
+
+    def block(self, limit: int) -> np.ndarray:
+        return self.market.read_bars(self.slot, limit)[0]
+
+
+class SharedCandles:
+    """The slice of ``CandleBuilder`` that ``BatchEvaluator`` reads (``history.series``),
+    served from the shared bar matrix instead of in-process ring buffers."""
+
+    def __init__(self, market: SharedMarket, slots: dict[str, int]):
+        self.market = market
+        self.slots = slots
+        self.history = self
+        self.series = self
+        self.timeframes: dict[int, TimeframeStore] = {}
+
+    def get(self, symbol: str) -> SharedSeries | None:
+        slot = self.slots.get(symbol)
+        return None if slot is None else SharedSeries(self.market, slot)
+
+    def timeframe(self, minutes: int) -> "SharedCandles | TimeframeStore":
+        """Higher timeframes are rolled up in the reading process, starting from the
+        ``lookback`` bars in shared memory."""
+        if minutes == 1:
+            return self
+        store = self.timeframes.get(minutes)
+        if store is None:
+            store = self.timeframes[minutes] = TimeframeStore(self, minutes, settings.timeframe_history_size)
+        return store
+
+
+class SharedMarketPublisher:
+    """Mirrors a ``MarketDataManager``'s ticks, closed bars, warm-up and connection
+    state into a ``SharedMarket``. Runs in the process that owns the feed."""
+
+    def __init__(self, market: SharedMarket, market_data):
+        self.market = market
+        self.market_data = market_data
+        self.slots: dict[str, int] = {}
+        self.slot_of = np.full(0, -1, dtype=np.int64)
+        events = market_data.events
+        events.subscribe("tick", self.on_tick)
+        events.subscribe("tick_batch", self.on_tick_batch)
+        events.subscribe("candle_closed", self.on_candle_closed)
+        events.subscribe("history_seeded", self.on_candle_closed)
+
+    def add(self, symbol: str, slot: int):
+        local = self.market_data.symbols.intern(symbol)
+        if local >= len(self.slot_of):
+            self.slot_of = np.r_[self.slot_of, np.full(max(local + 1, 2 * len(self.slot_of), 64) - len(self.slot_of), -1)]
+        self.slot_of[local] = slot
+        self.slots[symbol] = slot
+        self.market.warming[slot] = 1
+
+    def remove(self, symbol: str):
+        self.slots.pop(symbol, None)
+        local = self.market_data.symbols.ids.get(symbol)
+        if local is not None and local < len(self.slot_of):
+            self.slot_of[local] = -1
+
+    def on_tick(self, tick: dict):
+        slot = self.slots.get(tick["symbol"])
+        if slot is None:
+            return
+        ts = tick["timestamp"]
+        if isinstance(ts, str):
+            ts = datetime.fromisoformat(ts)
+        self.market.write_ticks(slot, ts.timestamp(), tick["ltp"], tick.get("volume", 1))
+
+    def on_tick_batch(self, batch):
+        order, ids, starts = batch.groups()
+        if not len(order):
+            return
+        last = order[np.r_[starts[1:], len(order)] - 1]
+        slots = np.full(len(ids), -1, dtype=np.int64)
+        inside = ids < len(self.slot_of)
+        slots[inside] = self.slot_of[ids[inside]]
+        known = slots >= 0
+        self.market.write_ticks(slots[known], batch.ts[last][known], batch.ltp[last][known], batch.volume[last][known])
+
+    def on_candle_closed(self, event: dict):
+        symbol = event["symbol"]
+        slot = self.slots.get(symbol)
+        series = self.market_data.candle_builder.history.series.get(symbol)
+        if slot is not None and series is not None:
+            self.market.write_bars(slot, series.block(self.market.lookback), series.count)
+
+    def sync_status(self):
+        market = self.market
+        market.status[0] = int(self.market_data.connected)
+        warming = self.market_data.warming
+        for symbol, slot in self.slots.items():
+            market.warming[slot] = int(symbol in warming)
@@ -0,0 +1,143 @@
+from collections.abc import MutableMapping
+from datetime import datetime
+from typing import Iterable
+
+import numpy as np
+
+
+class SymbolTable:
+    """Interns symbols to dense integer ids so ticks can travel as numeric arrays."""
+
+    def __init__(self):
+        self.ids: dict[str, int] = {}
+        self.names: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def intern(self, symbol: str) -> int:
+        index = self.ids.get(symbol)
+        if index is None:
+            index = self.ids[symbol] = len(self.names)
+            self.names.append(symbol)
+        return index
+
+
+class TickBatch:
+    """A batch of ticks as parallel arrays (symbol id, epoch seconds, price, volume),
+    in arrival order. ``groups`` sorts once by symbol id (stable, so each symbol's
+    ticks keep their order) and caches the result for every consumer."""
+
+    __slots__ = ("table", "ids", "ts", "ltp", "volume", "_groups")
+
+    def __init__(self, table: SymbolTable, ids: np.ndarray, ts: np.ndarray, ltp: np.ndarray, volume: np.ndarray | None = None):
+        self.table = table
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.ts = np.asarray(ts, dtype=np.float64)
+        self.ltp = np.asarray(ltp, dtype=np.float64)
+        self.volume = np.ones(len(self.ids)) if volume is None else np.asarray(volume, dtype=np.float64)
+        self._groups = None
+
+    @classmethod
+    def from_records(cls, table: SymbolTable, records: Iterable[tuple]) -> "TickBatch":
+        """``records`` are ``(symbol, epoch_seconds, ltp[, volume])`` tuples."""
+        intern = table.intern
+        ids, stamps, prices, volumes = [], [], [], []
+        for record in records:
+            ids.append(intern(record[0]))
+            stamps.append(record[1])
+            prices.append(record[2])
+            volumes.append(record[3] if len(record) > 3 else 1.0)
+        return cls(table, ids, stamps, prices, volumes)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def groups(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Returns ``(order, symbol_ids, starts)``: ``order`` sorts the batch by symbol
+        and ``order[starts[i]:starts[i + 1]]`` are the ticks of ``symbol_ids[i]``."""
+        if self._groups is None:
+            order = np.argsort(self.ids, kind="stable")
+            sorted_ids = self.ids[order]
+            starts = np.flatnonzero(np.r_[True, sorted_ids[1:] != sorted_ids[:-1]]) if len(order) else np.zeros(0, dtype=np.int64)
+            self._groups = (order, sorted_ids[starts], starts)
+        return self._groups
+
+    def symbols(self) -> list[str]:
+        names = self.table.names
+        return [names[i] for i in self.groups()[1].tolist()]
+
+    def ticks_for(self, index: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        order, _, starts = self.groups()
+        end = starts[index + 1] if index + 1 < len(starts) else len(order)
+        rows = order[starts[index]:end]
+        return self.ts[rows], self.ltp[rows], self.volume[rows]
+
+
+class LatestTicks(MutableMapping):
+    """Latest tick per symbol. Single ticks are kept as the dicts they arrived as;
+    batches write price/time/volume columns by symbol id, and a dict is only built
+    when such a symbol is read."""
+
+    def __init__(self, table: SymbolTable, tokens: dict[str, str] | None = None):
+        self.table = table
+        self.tokens = tokens if tokens is not None else {}
+        self._ticks: dict[str, dict] = {}
+        self._columnar: set[str] = set()
+        self._ts = np.zeros(0)
+        self._ltp = np.zeros(0)
+        self._volume = np.zeros(0)
+        self._set = np.zeros(0, dtype=bool)
+
+    def __setitem__(self, symbol: str, tick: dict):
+        if symbol in self._columnar:
+            self._columnar.discard(symbol)
+            self._set[self.table.ids[symbol]] = False
+        self._ticks[symbol] = tick
+
+    def __getitem__(self, symbol: str) -> dict:
+        tick = self._ticks.get(symbol)
+        if tick is not None:
+            return tick
+        if symbol not in self._columnar:
+            raise KeyError(symbol)
+        index = self.table.ids[symbol]
+        return {
+            "symbol": symbol,
+            "token": self.tokens.get(symbol),
+            "ltp": float(self._ltp[index]),
+            "timestamp": datetime.fromtimestamp(self._ts[index]),
+            "volume": float(self._volume[index]),
+        }
+
+    def __delitem__(self, symbol: str):
+        if symbol in self._columnar:
+            self._columnar.discard(symbol)
+            self._set[self.table.ids[symbol]] = False
+        else:
+            del self._ticks[symbol]
+
+    def __contains__(self, symbol) -> bool:
+        return symbol in self._ticks or symbol in self._columnar
+
+    def __iter__(self):
+        yield from self._ticks
+        yield from self._columnar
+
+    def __len__(self) -> int:
+        return len(self._ticks) + len(self._columnar)
+
+    def update_batch(self, ids: np.ndarray, ts: np.ndarray, ltp: np.ndarray, volume: np.ndarray):
+        if len(self._set) < len(self.table):
+            size = max(len(self.table), 2 * len(self._set), 64)
+            self._ts, self._ltp, self._volume = (np.r_[column, np.zeros(size - len(column))] for column in (self._ts, self._ltp, self._volume))
+            self._set = np.r_[self._set, np.zeros(size - len(self._set), dtype=bool)]
+        names = self.table.names
+        self._columnar.update(names[i] for i in ids[~self._set[ids]].tolist())
+        if self._ticks:
+            for i in ids.tolist():
+                self._ticks.pop(names[i], None)
+        self._ts[ids] = ts
+        self._ltp[ids] = ltp
+        self._volume[ids] = volume
+        self._set[ids] = True
@@ -0,0 +1,86 @@
+from app.data.candle_store import EMPTY, CandleSeries, CandleWindow
+
+
+class TimeframeStore:
+    """``minutes``-long bars rolled up from the closed 1-minute bars of ``source`` (a
+    ``CandleStore``, or anything with ``series.get(symbol)``), one ring buffer of
+    ``capacity`` bars per symbol.
+
+    A symbol is brought up to date when it is read, from only the 1-minute bars closed
+    since the last read, so each symbol/timeframe is rolled up once however many algos
+    read it. A bar closes with its last minute, or when a later bucket starts (gaps).
+    If the 1-minute history no longer continues from the last bar seen (it was
+    re-seeded), the symbol is rebuilt from the source window. ``history`` and
+    ``series`` alias the store so it can stand in for a ``CandleBuilder``."""
+
+    def __init__(self, source, minutes: int, capacity: int):
+        self.source = source
+        self.minutes = minutes
+        self.period = minutes * 60
+        self.capacity = capacity
+        self.history = self
+        self.series = self
+        self.bars: dict[str, CandleSeries] = {}
+        self._open: dict[str, list[float]] = {}
+        self._seen: dict[str, tuple[int, float]] = {}
+
+    def get(self, symbol: str) -> CandleSeries | None:
+        source = self.source.series.get(symbol)
+        if source is None or not source.count:
+            return self.bars.get(symbol)
+        count, last_ts = self._seen.get(symbol, (0, None))
+        if source.count == count:
+            return self.bars[symbol]
+        fresh = source.count - count
+        block = source.block(fresh + 1) if count else None
+        if block is None or block.shape[1] != fresh + 1 or block[0, 0] != last_ts:
+            block = source.block(source.count)
+            self.bars[symbol] = CandleSeries(self.capacity)
+            self._open.pop(symbol, None)
+        else:
+            block = block[:, 1:]
+        self._roll(symbol, block)
+        self._seen[symbol] = (source.count, block[0, -1])
+        return self.bars[symbol]
+
+    def _roll(self, symbol: str, block):
+        series, period = self.bars[symbol], self.period
+        current = self._open.get(symbol)
+        for ts, open_, high, low, close, volume in zip(*block.tolist()):
+            bucket = ts - ts % period
+            if current is not None and current[0] != bucket:
+                series.append(*current)
+                current = None
+            if current is None:
+                current = [bucket, open_, high, low, close, volume]
+            else:
+                current[2] = max(current[2], high)
+                current[3] = min(current[3], low)
+                current[4] = close
+                current[5] += volume
+            if ts + 60 >= bucket + period:
+                series.append(*current)
+                current = None
+        if current is None:
+            self._open.pop(symbol, None)
+        else:
+            self._open[symbol] = current
+
+    def count(self, symbol: str) -> int:
+        series = self.get(symbol)
+        return series.count if series else 0
+
+    def window(self, symbol: str, limit: int) -> CandleWindow:
+        series = self.get(symbol)
+        return series.window(limit) if series else EMPTY
+
+    def get_recent(self, symbol: str, limit: int = 50) -> CandleWindow:
+        return self.window(symbol, limit)
+
+    def drop(self, symbol: str):
+        self.bars.pop(symbol, None)
+        self._open.pop(symbol, None)
+        self._seen.pop(symbol, None)
+
+    def nbytes(self) -> int:
+        return sum(s._data.nbytes for s in self.bars.values())
@@ -1,13 +1,59 @@
-from sqlalchemy import create_engine
+import re
+
+from sqlalchemy import Column, create_engine, event, inspect, text
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from app.core.config import settings
 
-engine = create_engine(settings.database_url, connect_args={"check_same_thread": False})
+_is_sqlite = settings.database_url.startswith("sqlite")
+_engine_options = {"connect_args": {"check_same_thread": False}} if _is_sqlite else {}
+if ":memory:" not in settings.database_url and settings.database_url not in ("sqlite://", "sqlite:///"):
+    _engine_options |= {"pool_size": settings.db_pool_size, "max_overflow": settings.db_max_overflow, "pool_pre_ping": True}
+
+engine = create_engine(settings.database_url, **_engine_options)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+WriterSession = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 Base = declarative_base()
 
 
+if _is_sqlite:
+    @event.listens_for(engine, "connect")
+    def _sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.close()
+
+
+def _add_column(table_name: str, column: Column):
+    kind = column.type.compile(dialect=engine.dialect)
+    with engine.begin() as connection:
+        connection.execute(text(f'ALTER TABLE "{table_name}" ADD COLUMN "{column.name}" {kind}'))
+
+
+def ensure_columns():
+    """Adds nullable columns introduced after a database was created, to each model's
+    table and its monthly archive tables (``<table>_<YYYYMM>``)."""
+    inspector = inspect(engine)
+    existing = inspector.get_table_names()
+    for table in Base.metadata.sorted_tables:
+        pattern = re.compile(rf"{re.escape(table.name)}(_\d{{6}})?")
+        for name in filter(pattern.fullmatch, existing):
+            present = {column["name"] for column in inspector.get_columns(name)}
+            for column in table.columns:
+                if column.name not in present and column.nullable:
+                    _add_column(name, column)
+
+
+def ensure_indexes():
+    """``create_all`` skips existing tables, so indexes added to a model later are
+    created here for databases made by an earlier version."""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
 def get_db():
     db = SessionLocal()
     try:
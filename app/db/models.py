@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, Date, DateTime, Float, Integer, String, Text
+from sqlalchemy import Boolean, Date, DateTime, Float, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.database import Base
@@ -8,6 +8,10 @@ from app.db.database import Base
 
 class TradeLog(Base):
     __tablename__ = "trade_logs"
+    __table_args__ = (
+        Index("ix_trade_logs_status_created_at", "status", "created_at"),
+        Index("ix_trade_logs_algo_name_created_at", "algo_name", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     algo_name: Mapped[str] = mapped_column(String(80), index=True)
@@ -20,8 +24,9 @@ class TradeLog(Base):
     target_price: Mapped[float] = mapped_column(Float)
     status: Mapped[str] = mapped_column(String(20), default="OPEN")
     broker_order_id: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    sl_order_id: Mapped[str | None] = mapped_column(String(64), nullable=True)
     pnl: Mapped[float] = mapped_column(Float, default=0)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
@@ -44,4 +49,4 @@ class SystemEvent(Base):
     level: Mapped[str] = mapped_column(String(16), index=True)
     event_type: Mapped[str] = mapped_column(String(64), index=True)
     message: Mapped[str] = mapped_column(Text)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
@@ -0,0 +1,171 @@
+import asyncio
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.metrics import counter, histogram
+
+db_commit_seconds = histogram("db_commit_seconds", "Time spent committing a writer batch or call")
+db_batch_rows = histogram("db_batch_rows", "Rows inserted per writer batch", buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500))
+db_write_failures = {
+    kind: counter("db_write_failures_total", "Writer inserts and calls rolled back", {"kind": kind}) for kind in ("row", "call")
+}
+
+logger = logging.getLogger(__name__)
+
+
+def _resolve(future: asyncio.Future, result: Any, error: BaseException | None):
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+class DBWriter:
+    """Owns one SQLAlchemy session on a dedicated thread.
+
+    ``add`` queues fire-and-forget inserts that are committed together;
+    ``run`` executes ``fn(session, *args)`` on the writer thread and awaits the result.
+    A batch that fails to commit is retried row by row, so one bad row only loses
+    itself. Failed rows and calls are logged and counted in ``db_write_failures_total``;
+    ``run`` also raises the error to its caller.
+    """
+
+    def __init__(self, session_factory: sessionmaker, batch_size: int = 500):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self.failures = {"row": 0, "call": 0}
+
+    def start(self):
+        if not self._thread:
+            self._thread = threading.Thread(target=self._worker, name="db-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self._thread:
+            self._queue.put(("stop", None, None))
+            self._thread.join()
+            self._thread = None
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def add(self, row):
+        self._queue.put(("add", row, None))
+
+    def submit(self, fn: Callable[..., Any], *args):
+        self._queue.put(("call", (fn, args), None))
+
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.put(("call", (fn, args), (loop, future)))
+        return await future
+
+    def _worker(self):
+        session = self.session_factory()
+        try:
+            while True:
+                items = [self._queue.get()]
+                while len(items) < self.batch_size:
+                    try:
+                        items.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if self._process(session, items):
+                    return
+        finally:
+            session.close()
+
+    def _process(self, session: Session, items: list) -> bool:
+        rows = []
+        for kind, payload, waiter in items:
+            if kind == "add":
+                rows.append(payload)
+                continue
+            self._commit(session, rows)
+            rows = []
+            if kind == "stop":
+                return True
+            fn, args = payload
+            started = time.perf_counter()
+            try:
+                result, error = fn(session, *args), None
+            except Exception as exc:
+                session.rollback()
+                self._failed("call", fn, log=not waiter)
+                result, error = None, exc
+            db_commit_seconds.observe(time.perf_counter() - started)
+            if waiter:
+                loop, future = waiter
+                loop.call_soon_threadsafe(_resolve, future, result, error)
+        self._commit(session, rows)
+        return False
+
+    def _commit(self, session: Session, rows: list):
+        if not rows:
+            return
+        started = time.perf_counter()
+        try:
+            session.add_all(rows)
+            session.commit()
+        except Exception:
+            session.rollback()
+            if len(rows) > 1:
+                logger.warning("Batch insert of %d rows failed, retrying row by row", len(rows))
+            for row in rows:
+                try:
+                    session.add(row)
+                    session.commit()
+                except Exception:
+                    session.rollback()
+                    self._failed("row", row)
+        db_commit_seconds.observe(time.perf_counter() - started)
+        db_batch_rows.observe(len(rows))
+
+    def _failed(self, kind: str, what: Any, log: bool = True):
+        """Call from inside the ``except`` block that caught the failure."""
+        self.failures[kind] += 1
+        db_write_failures[kind].inc()
+        if log:
+            logger.exception("DB writer dropped %s %r", kind, what)
+
+
+class InlineDBWriter(DBWriter):
+    """Same interface, executed synchronously on the caller's thread (backtests, scripts)."""
+
+    def __init__(self, session_factory: sessionmaker):
+        super().__init__(session_factory)
+        self.session = session_factory()
+
+    def start(self):
+        return None
+
+    def stop(self):
+        self.session.close()
+
+    def add(self, row):
+        self._commit(self.session, [row])
+
+    def submit(self, fn: Callable[..., Any], *args):
+        try:
+            fn(self.session, *args)
+        except Exception:
+            self.session.rollback()
+            self._failed("call", fn)
+
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        try:
+            return fn(self.session, *args)
+        except Exception:
+            self.session.rollback()
+            self._failed("call", fn, log=False)
+            raise
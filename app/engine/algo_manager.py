@@ -7,12 +7,16 @@ class AlgoManager:
     def __init__(self):
         self.algos: dict[str, AlgoConfig] = {}
         self.paused: set[str] = set()
-        self.trades_by_algo = defaultdict(int)
-        self.open_positions_by_algo = defaultdict(int)
-        self.algo_pnl = defaultdict(float)
+        self.by_symbol: dict[str, set[str]] = defaultdict(set)
 
     def add(self, config: AlgoConfig):
+        previous = self.algos.get(config.name)
+        if previous:
+            for symbol in previous.watchlist:
+                self.by_symbol[symbol].discard(config.name)
         self.algos[config.name] = config
+        for symbol in config.watchlist:
+            self.by_symbol[symbol].add(config.name)
 
     def toggle(self, name: str, pause: bool):
         if pause:
@@ -20,5 +24,8 @@ class AlgoManager:
         else:
             self.paused.discard(name)
 
+    def active_for(self, symbol: str) -> list[AlgoConfig]:
+        return [self.algos[name] for name in self.by_symbol.get(symbol, ()) if name not in self.paused]
+
     def list(self):
         return [{"name": k, "paused": k in self.paused, **v.model_dump()} for k, v in self.algos.items()]
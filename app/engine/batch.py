@@ -0,0 +1,182 @@
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from app.data.candle_builder import CandleBuilder
+from app.engine.strategy import EMA_FAST, EMA_SLOW, MIN_BARS, build_long, evaluation_seconds
+from app.models import AlgoConfig, StrategyTemplate, TradeDecision
+
+HIGH, LOW, CLOSE, VOLUME = range(4)
+
+
+def _ema(closes: np.ndarray, counts: np.ndarray, period: int, window: int) -> np.ndarray:
+    """Per row, the EMA over its last ``window`` closes seeded with the first of them,
+    in the same operation order as ``indicators.EMA`` so both give identical values."""
+    k = 2 / (period + 1)
+    lookback = closes.shape[1]
+    first = lookback - np.minimum(counts, window)
+    result = closes[:, lookback - window].copy()
+    for column in range(lookback - window + 1, lookback):
+        updated = closes[:, column] * k + result * (1 - k)
+        result = np.where(column <= first, closes[:, column], updated)
+    return result
+
+
+def _ema_spread(bars: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    return _ema(bars[CLOSE], counts, *EMA_FAST) - _ema(bars[CLOSE], counts, *EMA_SLOW)
+
+
+def _vwap(bars: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    window = bars[:, :, -10:]
+    volume = window[VOLUME]
+    typical = (window[HIGH] + window[LOW] + window[CLOSE]) / 3
+    volume_total = volume.sum(axis=1)
+    return np.divide((typical * volume).sum(axis=1), volume_total, out=window[CLOSE, :, -1].copy(), where=volume_total > 0)
+
+
+def _recent_high(bars: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    return bars[CLOSE, :, -5:].max(axis=1)
+
+
+FEATURES = {
+    StrategyTemplate.ema_crossover: _ema_spread,
+    StrategyTemplate.vwap_reversion: _vwap,
+    StrategyTemplate.breakout: _recent_high,
+}
+
+SIGNALS = {
+    StrategyTemplate.ema_crossover: lambda feature, ltps: feature > 0,
+    StrategyTemplate.vwap_reversion: lambda feature, ltps: ltps > feature,
+    StrategyTemplate.breakout: lambda feature, ltps: ltps >= feature,
+}
+
+REASONS = {
+    StrategyTemplate.ema_crossover: "EMA crossover",
+    StrategyTemplate.vwap_reversion: "VWAP continuation",
+    StrategyTemplate.breakout: "Breakout",
+}
+
+
+class BatchEvaluator:
+    """Evaluates every symbol of a strategy template in one pass over a bar matrix.
+
+    Rows are refreshed only when a symbol closes a new bar, and per-template
+    features are recomputed only when some row changed, so a cycle without new
+    bars costs one vectorized comparison against the latest prices. Features use
+    the same windows as ``IndicatorEngine`` (``lookback`` must cover the longest),
+    so decisions match ``strategy.evaluate``. Algos on a higher timeframe are
+    evaluated by a child evaluator over that timeframe's bars.
+    """
+
+    def __init__(self, candle_builder: CandleBuilder, lookback: int = 64):
+        self.candle_builder = candle_builder
+        self.lookback = lookback
+        self.rows: dict[str, int] = {}
+        self.bar_counts = np.zeros(0, dtype=np.int64)
+        self.bars = np.zeros((4, 0, lookback), dtype=np.float64)
+        self.version = 0
+        self._seen: list[int] = []
+        self._features: dict[StrategyTemplate, tuple[int, np.ndarray]] = {}
+        self._timeframes: dict[int, BatchEvaluator] = {}
+
+    def _row(self, symbol: str) -> int:
+        row = self.rows[symbol] = len(self.rows)
+        self._seen.append(-1)
+        if row >= self.bars.shape[1]:
+            size = max(2 * self.bars.shape[1], 64)
+            bars = np.zeros((4, size, self.lookback), dtype=np.float64)
+            bars[:, :row] = self.bars[:, :row]
+            counts = np.zeros(size, dtype=np.int64)
+            counts[:row] = self.bar_counts[:row]
+            self.bars, self.bar_counts = bars, counts
+        return row
+
+    def refresh(self, symbols: list[str]) -> np.ndarray:
+        series_by_symbol = self.candle_builder.history.series
+        rows = []
+        changed = False
+        for symbol in symbols:
+            row = self.rows.get(symbol)
+            if row is None:
+                row = self._row(symbol)
+            rows.append(row)
+            series = series_by_symbol.get(symbol)
+            count = series.count if series else 0
+            if count == self._seen[row]:
+                continue
+            self._seen[row] = self.bar_counts[row] = count
+            changed = True
+            if not count:
+                self.bars[:, row] = 0
+                continue
+            block = series.block(self.lookback)[2:]
+            start = self.lookback - block.shape[1]
+            self.bars[:, row, start:] = block
+            self.bars[HIGH:VOLUME, row, :start] = block[HIGH:VOLUME, :1]
+            self.bars[VOLUME, row, :start] = 0
+        if changed:
+            self.version += 1
+        return np.array(rows, dtype=np.int64)
+
+    def feature(self, template: StrategyTemplate) -> np.ndarray:
+        cached = self._features.get(template)
+        if cached is None or cached[0] != self.version:
+            rows = len(self.rows)
+            cached = self._features[template] = (self.version, FEATURES[template](self.bars[:, :rows], self.bar_counts[:rows]))
+        return cached[1]
+
+    def signals(self, template: StrategyTemplate, rows: np.ndarray, ltps: np.ndarray) -> np.ndarray:
+        ready = self.bar_counts[rows] >= MIN_BARS
+        return ready & SIGNALS[template](self.feature(template)[rows], ltps)
+
+    def evaluate(self, algos: list[AlgoConfig], ltps: dict[str, float]) -> list[TradeDecision]:
+        if all(algo.timeframe == 1 for algo in algos):
+            return self._evaluate(algos, ltps)
+        by_timeframe = defaultdict(list)
+        for algo in algos:
+            by_timeframe[algo.timeframe].append(algo)
+        decisions = []
+        for minutes, group in by_timeframe.items():
+            decisions.extend(self._for_timeframe(minutes)._evaluate(group, ltps))
+        return decisions
+
+    def _for_timeframe(self, minutes: int) -> "BatchEvaluator":
+        if minutes == 1:
+            return self
+        evaluator = self._timeframes.get(minutes)
+        if evaluator is None:
+            evaluator = self._timeframes[minutes] = BatchEvaluator(self.candle_builder.timeframe(minutes), self.lookback)
+        return evaluator
+
+    def _evaluate(self, algos: list[AlgoConfig], ltps: dict[str, float]) -> list[TradeDecision]:
+        symbols = list(dict.fromkeys(s for algo in algos for s in algo.watchlist if s in ltps))
+        if not symbols:
+            return []
+        prices = np.fromiter((ltps[s] for s in symbols), dtype=np.float64, count=len(symbols))
+        rows = self.refresh(symbols)
+        elapsed = dict.fromkeys((algo.template for algo in algos), 0.0)
+        hits = {}
+        for template in elapsed:
+            started = time.perf_counter()
+            hits[template] = self.signals(template, rows, prices)
+            elapsed[template] += time.perf_counter() - started
+
+        decisions = []
+        for algo in algos:
+            started = time.perf_counter()
+            watched = np.isin(symbols, algo.watchlist) if len(algo.watchlist) < len(symbols) else True
+            indexes = np.flatnonzero(hits[algo.template] & watched)
+            if len(indexes):
+                decisions.extend(_build_longs(algo, [symbols[i] for i in indexes], prices[indexes]))
+            elapsed[algo.template] += time.perf_counter() - started
+        for template, seconds in elapsed.items():
+            evaluation_seconds[template, "batch"].observe(seconds)
+        return decisions
+
+
+def _build_longs(algo: AlgoConfig, symbols: list[str], ltps: np.ndarray) -> list[TradeDecision]:
+    # Per hit, not per symbol: sizing goes through ``build_long`` so batch and
+    # single evaluation round stops and targets identically.
+    reason = REASONS[algo.template]
+    return [build_long(algo, symbol, ltp, reason) for symbol, ltp in zip(symbols, ltps.tolist())]
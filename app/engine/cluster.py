@@ -0,0 +1,265 @@
+import asyncio
+import multiprocessing as mp
+import queue
+import time
+
+import numpy as np
+
+from app.brokers.factory import get_broker
+from app.core.config import settings
+from app.core.events import EventBus
+from app.data.archive import ArchiveRecorder
+from app.data.market_data import MarketDataManager
+from app.data.shared import WORKER_STATS, SharedCandles, SharedMarket, SharedMarketPublisher
+from app.data.ticks import TickBatch
+from app.engine.algo_manager import AlgoManager
+from app.engine.batch import BatchEvaluator
+from app.models import AlgoConfig, TradeDecision
+
+STATUS_INTERVAL = 0.05
+
+
+def run_feed(spec: tuple, control, broker_name: str):
+    asyncio.run(_feed(spec, control, broker_name))
+
+
+async def _feed(spec: tuple, control, broker_name: str):
+    market = SharedMarket.attach(spec)
+    market_data = MarketDataManager(get_broker(broker_name))
+    publisher = SharedMarketPublisher(market, market_data)
+    recorder = None
+    if settings.archive_dir:
+        recorder = ArchiveRecorder(settings.archive_dir, settings.archive_flush_interval)
+        market_data.events.subscribe("tick", recorder.record_tick)
+        market_data.events.subscribe("tick_batch", recorder.record_batch)
+        market_data.events.subscribe("candle_closed", recorder.record_candle)
+        recorder.run()
+    try:
+        await market_data.broker.connect()
+        market_data.run()
+        while True:
+            try:
+                message = control.get_nowait()
+            except queue.Empty:
+                publisher.sync_status()
+                await asyncio.sleep(STATUS_INTERVAL)
+                continue
+            kind = message[0]
+            if kind == "add":
+                _, symbol, token, slot = message
+                publisher.add(symbol, slot)
+                market_data.add_stock(symbol, token)
+            elif kind == "remove":
+                publisher.remove(message[1])
+                market_data.remove_stock(message[1])
+            elif kind == "stop":
+                break
+    finally:
+        if market_data.feed:
+            await market_data.feed.close()
+        if recorder:
+            await asyncio.to_thread(recorder.flush)
+        market.close()
+
+
+def run_strategy_worker(index: int, spec: tuple, control, results, poll_interval: float):
+    """Evaluates the symbols whose slot falls in this worker's shard (``slot % workers``)
+    whenever their shared price moves, and sends decisions back with the feed's
+    receive time for each symbol."""
+    market = SharedMarket.attach(spec)
+    algos = AlgoManager()
+    slots: dict[str, int] = {}
+    names: dict[int, str] = {}
+    evaluator = BatchEvaluator(SharedCandles(market, slots), market.lookback)
+    seen = np.zeros(market.capacity, dtype=np.int64)
+    owned = np.zeros(0, dtype=np.int64)
+    try:
+        while True:
+            while True:
+                try:
+                    message = control.get_nowait()
+                except queue.Empty:
+                    break
+                kind = message[0]
+                if kind == "algo":
+                    algos.add(message[1])
+                elif kind == "toggle":
+                    algos.toggle(message[1], message[2])
+                elif kind == "add":
+                    _, symbol, slot = message
+                    slots[symbol], names[slot] = slot, symbol
+                    owned = np.array(sorted(names), dtype=np.int64)
+                elif kind == "remove":
+                    names.pop(slots.pop(message[1], -1), None)
+                    owned = np.array(sorted(names), dtype=np.int64)
+                elif kind == "stop":
+                    return
+
+            changed = market.changed(owned, seen)
+            changed = changed[market.warming[changed] == 0]
+            if not len(changed):
+                time.sleep(poll_interval)
+                continue
+            started = time.perf_counter()
+            ltps = dict(zip((names[s] for s in changed.tolist()), market.ltp[changed].tolist()))
+            active = {algo.name: algo for symbol in ltps for algo in algos.active_for(symbol)}
+            decisions = evaluator.evaluate(list(active.values()), ltps) if active else []
+            if decisions:
+                received = dict(zip(changed.tolist(), market.received[changed].tolist()))
+                results.put([(decision, received[slots[decision.symbol]]) for decision in decisions])
+            market.worker_stats[index] += (1, len(changed), len(decisions), time.perf_counter() - started)
+    finally:
+        market.close()
+
+
+class ProcessCluster:
+    """Multi-process mode: a feed process owns the broker feed, ``MarketDataManager`` and
+    ``CandleBuilder`` and mirrors prices and bars into a ``SharedMarket``; strategy
+    workers evaluate symbol shards from shared memory and queue decisions back to
+    this (execution/risk) process. Here, changed prices are polled into
+    ``market_data.latest_ticks`` and published as ``tick_batch`` for positions and the
+    dashboard, one tick per moved symbol per poll."""
+
+    def __init__(
+        self,
+        market_data: MarketDataManager,
+        algo_manager: AlgoManager,
+        events: EventBus,
+        workers: int,
+        capacity: int | None = None,
+        lookback: int | None = None,
+        poll_interval: float | None = None,
+    ):
+        self.market_data = market_data
+        self.algo_manager = algo_manager
+        self.events = events
+        self.workers = workers
+        self.capacity = capacity or settings.shared_symbol_capacity
+        self.lookback = lookback or settings.shared_bar_lookback
+        self.poll_interval = poll_interval or settings.cluster_poll_interval
+        self.market: SharedMarket | None = None
+        self.processes: list[mp.Process] = []
+        self.decisions_received = 0
+        self._context = mp.get_context("spawn")
+        self._feed_control = self._context.Queue()
+        self._worker_controls = [self._context.Queue() for _ in range(workers)]
+        self._results = self._context.Queue()
+        self._slots = np.zeros(0, dtype=np.int64)
+        self._seen = np.zeros(self.capacity, dtype=np.int64)
+        self._task = None
+
+    def start(self):
+        self.market = SharedMarket.create(self.capacity, self.lookback, self.workers)
+        spec = self.market.spec
+        self.processes = [
+            self._context.Process(target=run_feed, args=(spec, self._feed_control, settings.broker_name), name="feed", daemon=True)
+        ] + [
+            self._context.Process(
+                target=run_strategy_worker,
+                args=(index, spec, control, self._results, self.poll_interval),
+                name=f"strategy-{index}",
+                daemon=True,
+            )
+            for index, control in enumerate(self._worker_controls)
+        ]
+        for process in self.processes:
+            process.start()
+        for symbol, token in self.market_data.subscriptions.items():
+            self._send_add(symbol, token)
+        for config in self.algo_manager.algos.values():
+            self._to_workers("algo", config)
+        for name in self.algo_manager.paused:
+            self._to_workers("toggle", name, True)
+        self._task = asyncio.create_task(self.poll())
+
+    def _to_workers(self, *message):
+        for control in self._worker_controls:
+            control.put(message)
+
+    def _send_add(self, symbol: str, token: str):
+        slot = self.market_data.symbols.ids[symbol]
+        self._feed_control.put(("add", symbol, token, slot))
+        self._worker_controls[slot % self.workers].put(("add", symbol, slot))
+
+    def _refresh_slots(self):
+        ids = self.market_data.symbols.ids
+        self._slots = np.array(sorted(ids[s] for s in self.market_data.subscriptions), dtype=np.int64)
+
+    def add_stock(self, symbol: str, token: str):
+        slot = self.market_data.symbols.intern(symbol)
+        if slot >= self.capacity:
+            raise ValueError(f"Shared market capacity of {self.capacity} symbols reached")
+        self.market_data.subscriptions[symbol] = token
+        self._refresh_slots()
+        if self.market:
+            self._send_add(symbol, token)
+
+    def remove_stock(self, symbol: str):
+        if self.market_data.subscriptions.pop(symbol, None) is None:
+            return
+        self._refresh_slots()
+        if self.market:
+            self._feed_control.put(("remove", symbol))
+            self._to_workers("remove", symbol)
+
+    def upsert_algo(self, config: AlgoConfig):
+        self.algo_manager.add(config)
+        if self.market:
+            self._to_workers("algo", config)
+
+    def toggle(self, name: str, pause: bool):
+        self.algo_manager.toggle(name, pause)
+        if self.market:
+            self._to_workers("toggle", name, pause)
+
+    async def poll(self):
+        market, table = self.market, self.market_data.symbols
+        while True:
+            self.market_data.connected = market.connected
+            changed = market.changed(self._slots, self._seen)
+            if len(changed):
+                ts, ltp, volume = market.ts[changed], market.ltp[changed], market.volume[changed]
+                self.market_data.latest_ticks.update_batch(changed, ts, ltp, volume)
+                self.events.publish("tick_batch", TickBatch(table, changed, ts, ltp, volume))
+            await asyncio.sleep(self.poll_interval)
+
+    async def decisions(self, timeout: float | None = None) -> list[tuple[TradeDecision, float]]:
+        try:
+            batch = await asyncio.to_thread(self._results.get, True, timeout)
+        except queue.Empty:
+            return []
+        while True:
+            try:
+                batch.extend(self._results.get_nowait())
+            except queue.Empty:
+                break
+        self.decisions_received += len(batch)
+        return batch
+
+    def stop(self, timeout: float = 5.0):
+        if self._task:
+            self._task.cancel()
+        self._feed_control.put(("stop",))
+        self._to_workers("stop")
+        for process in self.processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        if self.market:
+            self.market.close()
+            self.market = None
+
+    def stats(self) -> dict:
+        workers = []
+        if self.market:
+            for index, row in enumerate(self.market.worker_stats.tolist()):
+                workers.append({"worker": index, **dict(zip(WORKER_STATS, row))})
+        return {
+            "workers": self.workers,
+            "processes": [{"name": p.name, "pid": p.pid, "alive": p.is_alive()} for p in self.processes],
+            "symbols": len(self._slots),
+            "capacity": self.capacity,
+            "connected": self.market.connected if self.market else False,
+            "decisions_received": self.decisions_received,
+            "shards": workers,
+        }
@@ -0,0 +1,123 @@
+import asyncio
+import time
+from typing import Callable
+
+from app.core.config import settings
+from app.core.metrics import histogram
+
+dispatch_depth = histogram(
+    "dispatch_depth_symbols", "Symbols waiting for evaluation when the trading loop drains",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000),
+)
+dispatch_lag = histogram(
+    "dispatch_lag_seconds", "Age of the oldest waiting symbol when the trading loop drains",
+)
+
+
+class EvaluationDispatcher:
+    """Bounded, conflating hand-off from the feed to strategy evaluation. A symbol holds
+    at most one pending entry (later ticks only refresh its receive time) and new
+    symbols are dropped once ``capacity`` are waiting. Candles and positions still see
+    every tick.
+
+    Pressure follows consumer lag, the age of the oldest waiting entry, not the number
+    of waiting symbols: a whole-universe burst drained promptly is not a backlog. Lag at
+    ``high_lag`` (seen on a later tick or at the drain) calls ``on_pressure(True)``; a
+    drain at or below ``low_lag`` calls ``on_pressure(False)``."""
+
+    def __init__(
+        self,
+        capacity: int | None = None,
+        high_lag: float | None = None,
+        low_lag: float | None = None,
+        on_pressure: Callable[[bool], None] | None = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        self.capacity = capacity or settings.dispatch_capacity
+        self.high_lag = settings.dispatch_high_lag_seconds if high_lag is None else high_lag
+        self.low_lag = settings.dispatch_low_lag_seconds if low_lag is None else low_lag
+        self.on_pressure = on_pressure
+        self.clock = clock
+        self.pending: dict[str, float] = {}
+        self.oldest: float | None = None
+        self.enqueued = 0
+        self.conflated = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self.max_lag = 0.0
+        self.pressured = False
+        self._wakeup = asyncio.Event()
+
+    def _offer(self, symbol: str, received_at: float):
+        pending = self.pending
+        if symbol in pending:
+            pending[symbol] = received_at
+            self.conflated += 1
+        else:
+            depth = len(pending)
+            if depth >= self.capacity:
+                self.dropped += 1
+                return
+            if not depth:
+                self.oldest = received_at
+            pending[symbol] = received_at
+            self.enqueued += 1
+            if depth >= self.max_depth:
+                self.max_depth = depth + 1
+        if not self.pressured and received_at - self.oldest >= self.high_lag:
+            self._set_pressure(True)
+
+    def _set_pressure(self, pressured: bool):
+        self.pressured = pressured
+        if self.on_pressure:
+            self.on_pressure(pressured)
+
+    def on_tick(self, tick: dict):
+        self._offer(tick["symbol"], self.clock())
+        self._wakeup.set()
+
+    def on_tick_batch(self, batch):
+        received_at = self.clock()
+        symbols = batch.symbols()
+        self.conflated += len(batch) - len(symbols)
+        for symbol in symbols:
+            self._offer(symbol, received_at)
+        self._wakeup.set()
+
+    async def wait(self, timeout: float | None = None) -> dict[str, float]:
+        if not self.pending:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        self._wakeup.clear()
+        pending, self.pending = self.pending, {}
+        lag = self.lag()
+        self.oldest = None
+        if pending:
+            dispatch_depth.observe(len(pending))
+            dispatch_lag.observe(lag)
+            self.max_lag = max(self.max_lag, lag)
+        if self.pressured and lag <= self.low_lag:
+            self._set_pressure(False)
+        elif not self.pressured and lag >= self.high_lag:
+            self._set_pressure(True)
+        return pending
+
+    def lag(self) -> float:
+        return self.clock() - self.oldest if self.oldest is not None else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "depth": len(self.pending),
+            "capacity": self.capacity,
+            "lag_seconds": round(self.lag(), 6),
+            "high_lag_seconds": self.high_lag,
+            "low_lag_seconds": self.low_lag,
+            "pressured": self.pressured,
+            "max_depth": self.max_depth,
+            "max_lag_seconds": round(self.max_lag, 6),
+            "enqueued": self.enqueued,
+            "conflated": self.conflated,
+            "dropped": self.dropped,
+        }
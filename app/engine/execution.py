@@ -1,24 +1,60 @@
 import asyncio
-from datetime import datetime
+import time
 
 from sqlalchemy.orm import Session
 
+from app.core.clock import Clock, system_clock
 from app.core.config import settings
+from app.core.metrics import histogram
 from app.db.models import SystemEvent, TradeLog
+from app.db.writer import DBWriter
+from app.engine.orders import INTENT_EVENT, OrderTracker, TrackedOrder
 from app.models import TradeDecision
 from app.services.alerts import send_telegram_alert
 
+entry_ack_seconds = histogram("order_entry_ack_seconds", "Entry order round-trip including retries")
+sl_ack_seconds = histogram("order_sl_ack_seconds", "Stop-loss order round-trip after the entry ack")
+
+
+class EntryLeftOpen(RuntimeError):
+    """The entry was acked by the broker but could not be protected (and flattened) or
+    recorded. The position is live, so its risk reservation must be kept."""
+
+    def __init__(self, message: str, order: TrackedOrder | None):
+        super().__init__(message)
+        self.order = order
+
+
+def _insert(db: Session, row):
+    db.add(row)
+    db.commit()
+    db.refresh(row)
+    return row
+
 
 class ExecutionEngine:
-    def __init__(self, broker):
+    def __init__(
+        self,
+        broker,
+        writer: DBWriter,
+        clock: Clock = system_clock,
+        notify=send_telegram_alert,
+        orders: OrderTracker | None = None,
+    ):
         self.broker = broker
-        self.order_keys: set[str] = set()
+        self.writer = writer
+        self.clock = clock
+        self.notify = notify
+        self.orders = orders or OrderTracker(settings.order_dedupe_window_seconds)
+        self._background: set[asyncio.Task] = set()
+
+    async def execute_trade(self, decision: TradeDecision) -> TradeLog:
+        return await self.record(decision, await self.place(decision))
 
-    async def execute_trade(self, db: Session, decision: TradeDecision) -> TradeLog:
-        dedupe_key = f"{decision.algo_name}:{decision.symbol}:{datetime.utcnow().strftime('%Y%m%d%H%M')}"
-        if dedupe_key in self.order_keys:
-            raise ValueError("Duplicate order prevented")
-        self.order_keys.add(dedupe_key)
+    async def place(self, decision: TradeDecision) -> dict:
+        now = self.clock.utcnow()
+        order = self.orders.reserve(decision.algo_name, decision.symbol, now)
+        self._log_event("INFO", INTENT_EVENT, order.key)
 
         payload = {
             "symbol": decision.symbol,
@@ -29,17 +65,39 @@ class ExecutionEngine:
             "order_type": "LIMIT",
         }
 
-        order_response = await self._retry(self.broker.place_limit_order, payload)
+        started = time.perf_counter()
+        try:
+            order_response = await self._retry(self.broker.place_limit_order, payload)
+        except RuntimeError:
+            self.orders.failed(order)
+            raise
+        entry_acked = time.perf_counter()
+        entry_ack_seconds.observe(entry_acked - started)
         if order_response.get("status") != "success":
-            self._log_event(db, "ERROR", "ORDER_FAILED", str(order_response))
+            self.orders.failed(order)
+            self._log_event("ERROR", "ORDER_FAILED", str(order_response))
             raise RuntimeError("Entry order failed")
+        self.orders.entry_acked(order, order_response.get("order_id"))
 
         sl_payload = payload | {"trigger_price": decision.stoploss_price, "price": decision.stoploss_price}
-        sl_response = await self._retry(self.broker.place_stoploss_order, sl_payload)
+        self.orders.sl_pending(order)
+        try:
+            sl_response = await self._retry(self.broker.place_stoploss_order, sl_payload)
+        except RuntimeError as exc:
+            sl_response = {"status": "error", "message": str(exc)}
+        sl_ack_seconds.observe(time.perf_counter() - entry_acked)
         if sl_response.get("status") != "success":
-            self._log_event(db, "ERROR", "SL_FAILED", str(sl_response))
-            raise RuntimeError("SL placement failed; entry should be exited manually")
+            self._log_event("ERROR", "SL_FAILED", str(sl_response))
+            await self._flatten(decision, order)
+        self.orders.sl_acked(order, sl_response.get("order_id"))
+        return {
+            "order_id": order.order_id,
+            "sl_order_id": order.sl_order_id,
+            "placed_at": now,
+            "key": order.key,
+        }
 
+    async def record(self, decision: TradeDecision, ack: dict) -> TradeLog:
         row = TradeLog(
             algo_name=decision.algo_name,
             symbol=decision.symbol,
@@ -48,14 +106,46 @@ class ExecutionEngine:
             entry_price=decision.ltp,
             stoploss_price=decision.stoploss_price,
             target_price=decision.target_price,
-            broker_order_id=order_response.get("order_id"),
+            broker_order_id=ack["order_id"],
+            sl_order_id=ack["sl_order_id"],
+            created_at=ack["placed_at"],
+            updated_at=ack["placed_at"],
         )
-        db.add(row)
-        db.commit()
-        db.refresh(row)
-        await send_telegram_alert(f"ENTRY: {decision.algo_name} {decision.symbol} @ {decision.ltp}")
+        self._in_background(self.notify(f"ENTRY: {decision.algo_name} {decision.symbol} @ {decision.ltp}"))
+        try:
+            row = await self.writer.run(_insert, row)
+        except Exception as exc:
+            self._in_background(self.notify(
+                f"UNRECORDED ENTRY: {decision.algo_name} {decision.symbol} order {ack['order_id']}; reconcile manually"
+            ))
+            raise EntryLeftOpen(f"Entry placed but not recorded: {exc}", self.orders.by_key.get(ack["key"])) from exc
+        self.orders.recorded(ack["key"], row.id)
         return row
 
+    async def _flatten(self, decision: TradeDecision, order: TrackedOrder):
+        """Exits an acked entry whose stop-loss could not be placed. Always raises:
+        ``RuntimeError`` once flat, ``EntryLeftOpen`` if the exit failed too."""
+        self.orders.failed(order)
+        payload = {"symbol": decision.symbol, "qty": decision.quantity, "price": decision.ltp}
+        try:
+            response = await self._retry(self.broker.exit_position, payload)
+        except RuntimeError as exc:
+            response = {"status": "error", "message": str(exc)}
+        if response.get("status") == "success":
+            self.orders.flattened(order)
+            self._in_background(self.notify(f"SL FAILED, ENTRY FLATTENED: {decision.algo_name} {decision.symbol}"))
+            raise RuntimeError("SL placement failed; entry flattened")
+        self._log_event("ERROR", "FLATTEN_FAILED", str(response))
+        self._in_background(self.notify(
+            f"UNPROTECTED ENTRY: {decision.algo_name} {decision.symbol} order {order.order_id}; exit manually"
+        ))
+        raise EntryLeftOpen("SL placement and flatten failed; entry must be exited manually", order)
+
+    def _in_background(self, coro):
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
     async def _retry(self, fn, payload):
         error = None
         for _ in range(settings.broker_retry_attempts):
@@ -63,10 +153,8 @@ class ExecutionEngine:
                 return await fn(payload)
             except Exception as exc:
                 error = exc
-                await asyncio.sleep(0.5)
+                await asyncio.sleep(settings.broker_retry_delay)
         raise RuntimeError(f"Broker API failed repeatedly: {error}")
 
-    @staticmethod
-    def _log_event(db: Session, level: str, event_type: str, message: str):
-        db.add(SystemEvent(level=level, event_type=event_type, message=message))
-        db.commit()
+    def _log_event(self, level: str, event_type: str, message: str):
+        self.writer.add(SystemEvent(level=level, event_type=event_type, message=message))
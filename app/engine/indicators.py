@@ -0,0 +1,200 @@
+from collections import defaultdict, deque
+
+from app.data.candle_builder import CandleBuilder
+from app.data.candle_store import CandleSeries
+from app.data.timeframes import TimeframeStore
+
+
+class EMA:
+    """EMA of ``period`` over the whole history, or, with ``window``, over only the
+    last ``window`` closes seeded with the first of them, like the original
+    list-based ``ema(closes[-window:], period)``. The windowed form is recomputed
+    per closed bar, which costs ``window`` multiply-adds and matches it exactly."""
+
+    __slots__ = ("period", "k", "window", "closes", "value", "count")
+
+    def __init__(self, period: int, window: int | None = None):
+        self.period = period
+        self.k = 2 / (period + 1)
+        self.window = window
+        self.closes: deque[float] | None = deque(maxlen=window) if window else None
+        self.value = 0.0
+        self.count = 0
+
+    def update(self, high: float, low: float, close: float, volume: float):
+        self.count += 1
+        if self.closes is None:
+            self.value = close if self.count == 1 else close * self.k + self.value * (1 - self.k)
+            return
+        self.closes.append(close)
+        k = self.k
+        closes = iter(self.closes)
+        value = next(closes)
+        for close in closes:
+            value = close * k + value * (1 - k)
+        self.value = value
+
+
+class RollingMean:
+    __slots__ = ("period", "window", "total", "value", "count")
+
+    def __init__(self, period: int):
+        self.period = period
+        self.window: deque[float] = deque()
+        self.total = 0.0
+        self.value = 0.0
+        self.count = 0
+
+    def update(self, high: float, low: float, close: float, volume: float):
+        self.window.append(close)
+        self.total += close
+        if len(self.window) > self.period:
+            self.total -= self.window.popleft()
+        self.value = self.total / len(self.window)
+        self.count += 1
+
+
+class VWAP:
+    __slots__ = ("period", "window", "pv_total", "volume_total", "value", "count")
+
+    def __init__(self, period: int):
+        self.period = period
+        self.window: deque[tuple[float, float]] = deque()
+        self.pv_total = 0.0
+        self.volume_total = 0.0
+        self.value = 0.0
+        self.count = 0
+
+    def update(self, high: float, low: float, close: float, volume: float):
+        pv = (high + low + close) / 3 * volume
+        self.window.append((pv, volume))
+        self.pv_total += pv
+        self.volume_total += volume
+        if len(self.window) > self.period:
+            old_pv, old_volume = self.window.popleft()
+            self.pv_total -= old_pv
+            self.volume_total -= old_volume
+        self.value = self.pv_total / self.volume_total if self.volume_total else close
+        self.count += 1
+
+
+class RollingMax:
+    __slots__ = ("period", "window", "value", "count")
+    sign = 1
+
+    def __init__(self, period: int):
+        self.period = period
+        self.window: deque[tuple[int, float]] = deque()
+        self.value = 0.0
+        self.count = 0
+
+    def update(self, high: float, low: float, close: float, volume: float):
+        key = close * self.sign
+        while self.window and self.window[-1][1] <= key:
+            self.window.pop()
+        self.window.append((self.count, key))
+        if self.window[0][0] <= self.count - self.period:
+            self.window.popleft()
+        self.value = self.window[0][1] * self.sign
+        self.count += 1
+
+
+class RollingMin(RollingMax):
+    __slots__ = ()
+    sign = -1
+
+
+INDICATORS = {
+    "ema": EMA,
+    "sma": RollingMean,
+    "vwap": VWAP,
+    "max": RollingMax,
+    "min": RollingMin,
+}
+
+
+class IndicatorEngine:
+    def __init__(self, candle_builder: CandleBuilder):
+        self.candle_builder = candle_builder
+        self.by_symbol: dict[str, dict[tuple[str, int], object]] = defaultdict(dict)
+        self.timeframes: dict[int, TimeframeIndicators] = {}
+
+    def timeframe(self, minutes: int) -> "IndicatorEngine":
+        if minutes == 1:
+            return self
+        engine = self.timeframes.get(minutes)
+        if engine is None:
+            engine = self.timeframes[minutes] = TimeframeIndicators(self.candle_builder.timeframe(minutes))
+        return engine
+
+    def bars(self, symbol: str) -> int:
+        return self.candle_builder.history.count(symbol)
+
+    def get(self, symbol: str, kind: str, period: int, window: int | None = None):
+        """Shared indicator ``kind`` of ``period``; ``window`` limits an EMA to the last bars."""
+        indicators = self.by_symbol[symbol]
+        indicator = indicators.get((kind, period, window))
+        if indicator is None:
+            indicator = INDICATORS[kind](period, window) if window else INDICATORS[kind](period)
+            indicators[(kind, period, window)] = indicator
+            self._seed(symbol, indicator)
+        return indicator
+
+    def reset(self, symbol: str):
+        self.by_symbol.pop(symbol, None)
+        for engine in self.timeframes.values():
+            engine.reset(symbol)
+
+    def on_candle_closed(self, event: dict):
+        indicators = self.by_symbol.get(event["symbol"])
+        if not indicators:
+            return
+        candle = event["candle"]
+        for indicator in indicators.values():
+            indicator.update(candle["high"], candle["low"], candle["close"], candle["volume"])
+
+    def _seed(self, symbol: str, indicator):
+        window = self.candle_builder.get_recent(symbol, self.candle_builder.history.capacity)
+        for high, low, close, volume in zip(
+            window.high.tolist(), window.low.tolist(), window.close.tolist(), window.volume.tolist()
+        ):
+            indicator.update(high, low, close, volume)
+
+
+class TimeframeIndicators(IndicatorEngine):
+    """Indicators over a ``TimeframeStore``. Instead of ``candle_closed`` events, a
+    symbol's indicators are fed the bars it closed since the last read."""
+
+    def __init__(self, store: TimeframeStore):
+        super().__init__(store)
+        self.synced: dict[str, tuple[CandleSeries, int]] = {}
+
+    def bars(self, symbol: str) -> int:
+        return self.candle_builder.count(symbol)
+
+    def get(self, symbol: str, kind: str, period: int, window: int | None = None):
+        series = self.candle_builder.get(symbol)
+        if series is not None:
+            self._catch_up(symbol, series)
+        return super().get(symbol, kind, period, window)
+
+    def reset(self, symbol: str):
+        self.by_symbol.pop(symbol, None)
+        self.synced.pop(symbol, None)
+
+    def _catch_up(self, symbol: str, series: CandleSeries):
+        previous, count = self.synced.get(symbol, (None, 0))
+        if previous is series and count == series.count:
+            return
+        self.synced[symbol] = (series, series.count)
+        indicators = self.by_symbol.get(symbol)
+        if not indicators:
+            return
+        fresh = series.count - count
+        if previous is not series or fresh > len(series):
+            self.by_symbol.pop(symbol)
+            return
+        window = series.window(fresh)
+        for bar in zip(window.high.tolist(), window.low.tolist(), window.close.tolist(), window.volume.tolist()):
+            for indicator in indicators.values():
+                indicator.update(*bar)
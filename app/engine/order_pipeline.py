@@ -0,0 +1,40 @@
+import asyncio
+import time
+
+from app.core.metrics import histogram
+from app.engine.execution import ExecutionEngine
+from app.models import TradeDecision
+
+tick_to_order = histogram("tick_to_order_seconds", "Latency from tick receipt to acknowledged entry + SL orders")
+order_queue_seconds = histogram("order_queue_seconds", "Time an order waited for its symbol lane and a dispatch slot")
+
+
+class OrderPipeline:
+    """Dispatches orders concurrently, at most ``concurrency`` broker round-trips at a
+    time, while orders for the same symbol are placed strictly in submission order.
+    Persistence and alerts run after the symbol lane and dispatch slot are released."""
+
+    def __init__(self, engine: ExecutionEngine, concurrency: int):
+        self.engine = engine
+        self.in_flight = 0
+        self._slots = asyncio.Semaphore(concurrency)
+        self._lanes: dict[str, asyncio.Lock] = {}
+
+    def submit(self, decision: TradeDecision, received_at: float | None = None) -> asyncio.Task:
+        self.in_flight += 1
+        task = asyncio.create_task(self._process(decision, received_at, time.perf_counter()))
+        task.add_done_callback(self._done)
+        return task
+
+    async def _process(self, decision: TradeDecision, received_at: float | None, submitted_at: float):
+        lane = self._lanes.setdefault(decision.symbol, asyncio.Lock())
+        async with lane:
+            async with self._slots:
+                order_queue_seconds.observe(time.perf_counter() - submitted_at)
+                ack = await self.engine.place(decision)
+        if received_at is not None:
+            tick_to_order.observe(time.perf_counter() - received_at)
+        return await self.engine.record(decision, ack)
+
+    def _done(self, task: asyncio.Task):
+        self.in_flight -= 1
@@ -0,0 +1,217 @@
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from enum import Enum
+
+from sqlalchemy.orm import Session
+
+from app.db.models import SystemEvent, TradeLog
+
+INTENT_EVENT = "ORDER_INTENT"
+
+
+class OrderStage(str, Enum):
+    ENTRY_PENDING = "ENTRY_PENDING"
+    ENTRY_ACKED = "ENTRY_ACKED"
+    SL_PENDING = "SL_PENDING"
+    SL_ACKED = "SL_ACKED"
+    EXITED = "EXITED"
+    FAILED = "FAILED"
+
+
+@dataclass(slots=True)
+class TrackedOrder:
+    key: str
+    algo_name: str
+    symbol: str
+    placed_at: datetime
+    stage: OrderStage = OrderStage.ENTRY_PENDING
+    order_id: str | None = None
+    sl_order_id: str | None = None
+    trade_id: int | None = None
+    exit_status: str | None = None
+
+
+def order_key(algo_name: str, symbol: str, at: datetime) -> str:
+    return f"{algo_name}:{symbol}:{at.strftime('%Y%m%d%H%M')}"
+
+
+def _recent_orders(db: Session, since: datetime):
+    trades = (
+        db.query(TradeLog)
+        .filter((TradeLog.created_at >= since) | (TradeLog.status == "OPEN"))
+        .order_by(TradeLog.created_at)
+        .all()
+    )
+    intents = (
+        db.query(SystemEvent.message, SystemEvent.created_at)
+        .filter(SystemEvent.event_type == INTENT_EVENT, SystemEvent.created_at >= since)
+        .order_by(SystemEvent.created_at)
+        .all()
+    )
+    return trades, intents
+
+
+class OrderTracker:
+    """Idempotency index plus lifecycle of every order placed by ``ExecutionEngine``.
+
+    Keys (``algo:symbol:minute``) are kept for ``window`` seconds after placement and
+    evicted oldest-first, so the index holds one window of orders however long the
+    process runs; the window must cover the one-minute key bucket. Orders are indexed
+    by key, broker order id (entry and SL), trade id and symbol until they exit."""
+
+    def __init__(self, window: float = 120.0):
+        self.window = timedelta(seconds=window)
+        self.keys: OrderedDict[str, datetime] = OrderedDict()
+        self.by_key: dict[str, TrackedOrder] = {}
+        self.by_order_id: dict[str, TrackedOrder] = {}
+        self.by_trade: dict[int, TrackedOrder] = {}
+        self.by_symbol: dict[str, dict[str, TrackedOrder]] = defaultdict(dict)
+        self.evicted = 0
+
+    def _evict(self, now: datetime):
+        keys = self.keys
+        while keys:
+            key, expires = next(iter(keys.items()))
+            if expires > now:
+                break
+            keys.popitem(last=False)
+            self.evicted += 1
+            order = self.by_key.get(key)
+            if order and order.key not in self.by_symbol.get(order.symbol, ()):
+                del self.by_key[key]
+
+    def _remember(self, key: str, at: datetime):
+        self.keys[key] = at + self.window
+        self.keys.move_to_end(key)
+
+    def reserve(self, algo_name: str, symbol: str, now: datetime) -> TrackedOrder:
+        self._evict(now)
+        key = order_key(algo_name, symbol, now)
+        if key in self.keys:
+            raise ValueError("Duplicate order prevented")
+        self._remember(key, now)
+        order = TrackedOrder(key, algo_name, symbol, now)
+        self.by_key[key] = order
+        self.by_symbol[symbol][key] = order
+        return order
+
+    def entry_acked(self, order: TrackedOrder, order_id: str | None):
+        order.stage = OrderStage.ENTRY_ACKED
+        order.order_id = order_id
+        if order_id:
+            self.by_order_id[order_id] = order
+
+    def sl_pending(self, order: TrackedOrder):
+        order.stage = OrderStage.SL_PENDING
+
+    def sl_acked(self, order: TrackedOrder, sl_order_id: str | None):
+        order.stage = OrderStage.SL_ACKED
+        order.sl_order_id = sl_order_id
+        if sl_order_id:
+            self.by_order_id[sl_order_id] = order
+
+    def failed(self, order: TrackedOrder):
+        """An entry that never filled leaves the indexes (its key still blocks retries
+        until it expires); one acked without a stop-loss stays visible as unprotected."""
+        order.stage = OrderStage.FAILED
+        if order.order_id is None:
+            self._unindex(order)
+
+    def flattened(self, order: TrackedOrder):
+        """An unprotected entry that was exited right away; it never became a trade."""
+        order.stage = OrderStage.EXITED
+        order.exit_status = "FLATTENED"
+        self._unindex(order)
+
+    def recorded(self, key: str, trade_id: int):
+        order = self.by_key.get(key)
+        if order:
+            order.trade_id = trade_id
+            self.by_trade[trade_id] = order
+
+    def exited(self, trade_id: int, status: str):
+        order = self.by_trade.get(trade_id)
+        if order:
+            order.stage = OrderStage.EXITED
+            order.exit_status = status
+            self._unindex(order)
+
+    def on_position(self, event: dict):
+        status = event.get("status")
+        if status and status != "OPEN" and "trade_id" in event:
+            self.exited(event["trade_id"], status)
+
+    def _unindex(self, order: TrackedOrder):
+        self.by_order_id.pop(order.order_id, None)
+        self.by_order_id.pop(order.sl_order_id, None)
+        self.by_trade.pop(order.trade_id, None)
+        orders = self.by_symbol.get(order.symbol)
+        if orders is not None:
+            orders.pop(order.key, None)
+            if not orders:
+                del self.by_symbol[order.symbol]
+        if order.key not in self.keys:
+            self.by_key.pop(order.key, None)
+
+    def merge_keys(self, keys: dict[str, datetime], now: datetime):
+        """Adds keys from elsewhere (a state snapshot), keeping expiry order."""
+        merged = {**keys, **self.keys}
+        self.keys = OrderedDict(sorted(((k, v) for k, v in merged.items() if v > now), key=lambda item: item[1]))
+
+    def get(self, order_id: str) -> TrackedOrder | None:
+        return self.by_order_id.get(order_id)
+
+    def for_symbol(self, symbol: str) -> list[TrackedOrder]:
+        return list(self.by_symbol.get(symbol, {}).values())
+
+    def clear(self):
+        self.keys.clear()
+        self.by_key.clear()
+        self.by_order_id.clear()
+        self.by_trade.clear()
+        self.by_symbol.clear()
+
+    async def load(self, writer, now: datetime) -> int:
+        """Rebuilds the index from the DB: keys of trades and order intents inside the
+        window, and every still-open trade as an SL-acked order."""
+        trades, intents = await writer.run(_recent_orders, now - self.window)
+        self.clear()
+        placed = [(at, key) for key, at in intents]
+        placed += [(t.created_at, order_key(t.algo_name, t.symbol, t.created_at)) for t in trades]
+        for at, key in sorted(placed):
+            if at + self.window > now:
+                self._remember(key, at)
+        for trade in trades:
+            key = order_key(trade.algo_name, trade.symbol, trade.created_at)
+            if trade.status != "OPEN":
+                continue
+            order = TrackedOrder(key, trade.algo_name, trade.symbol, trade.created_at, OrderStage.SL_ACKED)
+            self.by_key[key] = order
+            self.by_symbol[trade.symbol][key] = order
+            if trade.broker_order_id:
+                order.order_id = trade.broker_order_id
+                self.by_order_id[trade.broker_order_id] = order
+            if trade.sl_order_id:
+                order.sl_order_id = trade.sl_order_id
+                self.by_order_id[trade.sl_order_id] = order
+            self.recorded(key, trade.id)
+        self._evict(now)
+        return len(self.keys)
+
+    def stats(self) -> dict:
+        stages: dict[str, int] = defaultdict(int)
+        for order in self.by_key.values():
+            stages[order.stage.value] += 1
+        return {
+            "window_seconds": self.window.total_seconds(),
+            "keys": len(self.keys),
+            "tracked": len(self.by_key),
+            "evicted": self.evicted,
+            "stages": dict(stages),
+            "unprotected": [
+                {"key": o.key, "symbol": o.symbol, "order_id": o.order_id}
+                for o in self.by_key.values()
+                if o.stage is OrderStage.FAILED and o.order_id
+            ],
+        }
@@ -0,0 +1,240 @@
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.core.clock import Clock, system_clock
+from app.core.config import settings
+from app.core.events import EventBus
+from app.core.metrics import counter
+from app.db.models import TradeLog
+from app.db.writer import DBWriter
+from app.engine.risk import RiskState
+from app.services.alerts import send_telegram_alert
+
+position_exit_failures = counter("position_exit_failures_total", "Exit attempts (SL cancel or exit order) that failed")
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class Position:
+    trade_id: int
+    algo_name: str
+    symbol: str
+    quantity: int
+    entry_price: float
+    stoploss_price: float
+    target_price: float
+    ltp: float
+    sl_order_id: str | None = None
+    protected: bool = True
+    unrealized: float = 0.0
+    closing: bool = False
+    exit_failures: int = 0
+    retry_at: float = 0.0
+
+
+def exit_for(position, ltp: float) -> tuple[float, str] | None:
+    """Exit price and status once ``ltp`` crosses a stop-loss or target, else None.
+    The resting stop-loss order (limit price = trigger) fills at its own price only
+    when ``ltp`` touches it; a gap through it exits at ``ltp``. The target exits at
+    ``ltp``. ``position`` is a ``Position`` or a ``TradeLog``, so live trading and the
+    backtester exit by the same rule."""
+    if ltp <= position.stoploss_price:
+        return min(ltp, position.stoploss_price), "SL_HIT"
+    if ltp >= position.target_price:
+        return ltp, "TARGET_HIT"
+    return None
+
+
+def _open_trades(db: Session) -> list[TradeLog]:
+    return db.query(TradeLog).filter(TradeLog.status == "OPEN").all()
+
+
+def _write_marks(db: Session, marks: list[dict]):
+    db.execute(update(TradeLog), marks)
+    db.commit()
+
+
+def _close_trade(db: Session, trade_id: int, exit_price: float, pnl: float, status: str, closed_at: datetime):
+    db.execute(
+        update(TradeLog),
+        [{"id": trade_id, "exit_price": exit_price, "pnl": pnl, "status": status, "updated_at": closed_at}],
+    )
+    db.commit()
+
+
+class PositionManager:
+    """In-memory book of open trades indexed by symbol. Each tick re-marks only the
+    positions on that symbol and triggers stop-loss/target exits; unrealized PnL is
+    written back in one batched update per ``flush`` for the positions that moved.
+    A stop touched at its price fills by itself; every other exit cancels the resting
+    stop-loss order before sending the exit order. A failed exit is counted and
+    alerted, and the next tick-driven attempt waits ``exit_retry`` seconds, doubling
+    per consecutive failure up to ``exit_retry_max``."""
+
+    def __init__(
+        self,
+        broker,
+        writer: DBWriter,
+        risk: RiskState,
+        capital=None,
+        events: EventBus | None = None,
+        clock: Clock = system_clock,
+        flush_interval: float = 1.0,
+        notify=send_telegram_alert,
+        exit_retry: float | None = None,
+        exit_retry_max: float | None = None,
+    ):
+        self.broker = broker
+        self.writer = writer
+        self.risk = risk
+        self.capital = capital
+        self.events = events or EventBus()
+        self.clock = clock
+        self.flush_interval = flush_interval
+        self.notify = notify
+        self.exit_retry = settings.position_exit_retry_seconds if exit_retry is None else exit_retry
+        self.exit_retry_max = settings.position_exit_retry_max_seconds if exit_retry_max is None else exit_retry_max
+        self.by_symbol: dict[str, dict[int, Position]] = defaultdict(dict)
+        self.by_id: dict[int, Position] = {}
+        self._dirty: set[int] = set()
+        self._exits: set[asyncio.Task] = set()
+        self._background: set[asyncio.Task] = set()
+        self._task = None
+
+    def open(self, trade: TradeLog) -> Position:
+        position = Position(
+            trade.id,
+            trade.algo_name,
+            trade.symbol,
+            trade.quantity,
+            trade.entry_price,
+            trade.stoploss_price,
+            trade.target_price,
+            trade.entry_price,
+            trade.sl_order_id,
+        )
+        self.by_symbol[position.symbol][position.trade_id] = position
+        self.by_id[position.trade_id] = position
+        self.events.publish("position", {"trade_id": position.trade_id, "status": "OPEN"})
+        return position
+
+    async def load(self) -> int:
+        self.by_symbol.clear()
+        self.by_id.clear()
+        for trade in await self.writer.run(_open_trades):
+            self.open(trade)
+            self.risk.on_restored(trade.algo_name)
+        return len(self.by_id)
+
+    def on_tick(self, tick: dict):
+        positions = self.by_symbol.get(tick["symbol"])
+        if positions:
+            self._mark(positions, tick["ltp"])
+
+    def on_tick_batch(self, batch):
+        if not self.by_symbol:
+            return
+        for index, symbol in enumerate(batch.symbols()):
+            positions = self.by_symbol.get(symbol)
+            if positions:
+                for ltp in batch.ticks_for(index)[1].tolist():
+                    self._mark(positions, ltp)
+
+    def _mark(self, positions: dict[int, Position], ltp: float):
+        for position in positions.values():
+            if position.closing or ltp == position.ltp:
+                continue
+            unrealized = (ltp - position.entry_price) * position.quantity
+            self.risk.on_mark(position.algo_name, unrealized - position.unrealized)
+            position.ltp = ltp
+            position.unrealized = unrealized
+            self._dirty.add(position.trade_id)
+            exit = exit_for(position, ltp)
+            if exit and (not position.exit_failures or time.monotonic() >= position.retry_at):
+                price, status = exit
+                filled = status == "SL_HIT" and price == position.stoploss_price and position.protected
+                self._schedule_exit(position, price, status, place_order=not filled)
+
+    def _schedule_exit(self, position: Position, price: float, status: str, place_order: bool = True):
+        position.closing = True
+        task = asyncio.create_task(self.close(position.trade_id, price, status, place_order))
+        self._exits.add(task)
+        task.add_done_callback(self._exits.discard)
+
+    async def close(self, trade_id: int, price: float | None = None, status: str = "CLOSED", place_order: bool = True):
+        position = self.by_id.get(trade_id)
+        if not position:
+            return None
+        position.closing = True
+        price = position.ltp if price is None else price
+        if place_order:
+            try:
+                if position.protected and position.sl_order_id:
+                    await self._cancel_stoploss(position)
+                response = await self.broker.exit_position({"symbol": position.symbol, "qty": position.quantity, "price": price})
+                if response.get("status") != "success":
+                    raise RuntimeError(f"Exit order failed: {response}")
+            except Exception as exc:
+                self._exit_failed(position, status, exc)
+                return None
+        pnl = (price - position.entry_price) * position.quantity
+        del self.by_id[trade_id]
+        del self.by_symbol[position.symbol][trade_id]
+        if not self.by_symbol[position.symbol]:
+            del self.by_symbol[position.symbol]
+        self._dirty.discard(trade_id)
+        self.risk.on_exit(position.algo_name, pnl, position.unrealized)
+        if self.capital:
+            self.capital.on_trade_closed(pnl)
+        self.writer.submit(_close_trade, trade_id, price, pnl, status, self.clock.utcnow())
+        self.events.publish("position", {"trade_id": trade_id, "status": status, "pnl": pnl})
+        return pnl
+
+    def _exit_failed(self, position: Position, status: str, error: Exception):
+        position.closing = False
+        position.exit_failures += 1
+        delay = min(self.exit_retry * 2 ** (position.exit_failures - 1), self.exit_retry_max)
+        position.retry_at = time.monotonic() + delay
+        position_exit_failures.inc()
+        logger.warning("Position %s %s exit failed (attempt %d), retrying in %.1fs: %s",
+                       position.trade_id, status, position.exit_failures, delay, error)
+        task = asyncio.create_task(self.notify(
+            f"EXIT FAILED: {position.algo_name} {position.symbol} trade {position.trade_id} {status} "
+            f"(attempt {position.exit_failures}): {error}"
+        ))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _cancel_stoploss(self, position: Position):
+        """The resting stop must go before any other exit, or it could later fill
+        against a flat position and open a short."""
+        response = await self.broker.cancel_order(position.sl_order_id)
+        if response.get("status") != "success":
+            raise RuntimeError(f"Stop-loss cancel failed: {response}")
+        position.protected = False
+
+    def flush(self) -> int:
+        if not self._dirty:
+            return 0
+        marks = [{"id": i, "pnl": self.by_id[i].unrealized} for i in self._dirty]
+        self._dirty.clear()
+        self.writer.submit(_write_marks, marks)
+        self.events.publish("position", {"marked": [mark["id"] for mark in marks]})
+        return len(marks)
+
+    async def start(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            self.flush()
+
+    def run(self):
+        if not self._task:
+            self._task = asyncio.create_task(self.start())
@@ -1,43 +1,138 @@
-from dataclasses import dataclass
+import time
+from collections import Counter, defaultdict
+from typing import Iterable
 
 from app.core.config import settings
+from app.core.metrics import histogram
 from app.models import AlgoConfig, CapitalSnapshot, TradeDecision
 
+risk_screen_seconds = histogram("risk_screen_seconds", "Time to pre-screen one batch of decisions")
 
-@dataclass
-class RiskContext:
-    websocket_connected: bool
-    global_daily_loss: float
-    global_max_daily_loss: float
-    global_open_positions: int
-    global_max_open_positions: int
-    open_positions_by_algo: dict[str, int]
-    trades_by_algo: dict[str, int]
-    algo_pnl: dict[str, float]
 
+class RiskState:
+    """Owns the counters the risk checks read and keeps them current from order,
+    fill, mark and exit events, so each check is a handful of dict lookups no
+    matter how many algos or positions are live."""
 
-class RiskEngine:
-    def __init__(self):
-        self.halted_reason: str | None = None
+    def __init__(self, global_max_open_positions: int = 2, global_max_daily_loss: float = 3000.0):
+        self.global_max_open_positions = global_max_open_positions
+        self.global_max_daily_loss = global_max_daily_loss
+        self.connected = True
+        self.halts: dict[str, str] = {}
+        self.open_positions = 0
+        self.unrealized_pnl = 0.0
+        self.open_positions_by_algo: dict[str, int] = defaultdict(int)
+        self.trades_by_algo: dict[str, int] = defaultdict(int)
+        self.realized_by_algo: dict[str, float] = defaultdict(float)
+        self.unrealized_by_algo: dict[str, float] = defaultdict(float)
+        self.rejections: Counter[str] = Counter()
+        self.accepted = 0
 
-    def validate(self, decision: TradeDecision, algo: AlgoConfig, capital: CapitalSnapshot, ctx: RiskContext) -> tuple[bool, str]:
-        if not ctx.websocket_connected:
+    @property
+    def halted_reason(self) -> str | None:
+        return next(iter(self.halts.values()), None)
+
+    def halt(self, key: str, reason: str):
+        if key not in self.halts:
+            print("Trading halted", key, reason)
+        self.halts[key] = reason
+
+    def resume(self, key: str):
+        if self.halts.pop(key, None):
+            print("Trading resumed", key)
+
+    def reserve(self, algo_name: str):
+        self.open_positions += 1
+        self.open_positions_by_algo[algo_name] += 1
+        self.trades_by_algo[algo_name] += 1
+
+    def release(self, algo_name: str):
+        self.open_positions -= 1
+        self.open_positions_by_algo[algo_name] -= 1
+        self.trades_by_algo[algo_name] -= 1
+
+    def on_restored(self, algo_name: str):
+        self.open_positions += 1
+        self.open_positions_by_algo[algo_name] += 1
+
+    def on_mark(self, algo_name: str, delta: float):
+        self.unrealized_by_algo[algo_name] += delta
+        self.unrealized_pnl += delta
+
+    def on_exit(self, algo_name: str, pnl: float, unrealized: float = 0.0):
+        self.open_positions -= 1
+        self.open_positions_by_algo[algo_name] -= 1
+        self.realized_by_algo[algo_name] += pnl
+        self.on_mark(algo_name, -unrealized)
+
+    def reset_day(self):
+        self.trades_by_algo.clear()
+        self.realized_by_algo.clear()
+
+    def algo_pnl(self, algo_name: str) -> float:
+        return self.realized_by_algo.get(algo_name, 0.0) + self.unrealized_by_algo.get(algo_name, 0.0)
+
+    def check(self, decision: TradeDecision, algo: AlgoConfig, capital: CapitalSnapshot, free_margin: float | None = None) -> tuple[bool, str]:
+        if self.halts:
+            return False, self.halted_reason
+        if not self.connected:
             return False, "WebSocket disconnected; trading paused"
         if capital.available_balance < settings.min_balance_threshold:
             return False, "Balance below ₹1000 threshold"
-        if ctx.global_daily_loss <= -ctx.global_max_daily_loss:
+        if capital.today_pnl + self.unrealized_pnl <= -self.global_max_daily_loss:
             return False, "Global max daily loss reached"
-        if ctx.global_open_positions >= ctx.global_max_open_positions:
+        if self.open_positions >= self.global_max_open_positions:
             return False, "Global max open positions reached"
-        if ctx.open_positions_by_algo.get(algo.name, 0) >= algo.max_open_trades:
+        if self.open_positions_by_algo.get(algo.name, 0) >= algo.max_open_trades:
             return False, "Algo max concurrent trades reached"
-        if ctx.trades_by_algo.get(algo.name, 0) >= algo.max_trades_per_day:
+        if self.trades_by_algo.get(algo.name, 0) >= algo.max_trades_per_day:
             return False, "Algo max trades/day reached"
-        if ctx.algo_pnl.get(algo.name, 0) <= -algo.max_daily_loss:
+        if self.algo_pnl(algo.name) <= -algo.max_daily_loss:
             return False, "Algo max daily loss reached"
         cost = decision.quantity * decision.ltp
         if cost > algo.capital_per_trade:
             return False, "Capital per trade exceeded"
-        if cost > capital.free_margin:
+        if cost > (capital.free_margin if free_margin is None else free_margin):
             return False, "Insufficient free margin"
         return True, "OK"
+
+    def screen(
+        self,
+        decisions: Iterable[TradeDecision],
+        algos: dict[str, AlgoConfig],
+        capital: CapitalSnapshot,
+    ) -> list[TradeDecision]:
+        """Checks a batch in order and reserves counters and margin for each accepted
+        decision, so later decisions in the same batch see the earlier ones."""
+        started = time.perf_counter()
+        accepted = []
+        free_margin = capital.free_margin
+        for decision in decisions:
+            ok, reason = self.check(decision, algos[decision.algo_name], capital, free_margin)
+            if not ok:
+                self.rejections[reason] += 1
+                continue
+            self.reserve(decision.algo_name)
+            free_margin -= decision.quantity * decision.ltp
+            accepted.append(decision)
+        self.accepted += len(accepted)
+        risk_screen_seconds.observe(time.perf_counter() - started)
+        return accepted
+
+    def stats(self) -> dict:
+        return {
+            "halted_reason": self.halted_reason,
+            "halts": dict(self.halts),
+            "connected": self.connected,
+            "open_positions": self.open_positions,
+            "unrealized_pnl": self.unrealized_pnl,
+            "open_positions_by_algo": dict(self.open_positions_by_algo),
+            "trades_by_algo": dict(self.trades_by_algo),
+            "realized_by_algo": dict(self.realized_by_algo),
+            "accepted": self.accepted,
+            "rejections": dict(self.rejections),
+        }
+
+
+# Former name, kept so code written against ``RiskEngine`` (``halted_reason`` etc.) still imports.
+RiskEngine = RiskState
@@ -1,37 +1,61 @@
-from statistics import mean
+import time
 
-from app.models import AlgoConfig, TradeDecision
+from app.core.metrics import histogram
+from app.engine.indicators import IndicatorEngine
+from app.models import AlgoConfig, StrategyTemplate, TradeDecision
 
+MIN_BARS = 5
+# (period, window): each EMA runs over only the last ``window`` closes.
+EMA_FAST = (5, 9)
+EMA_SLOW = (10, 21)
 
-def ema(values: list[float], period: int) -> float:
-    if not values:
-        return 0
-    k = 2 / (period + 1)
-    result = values[0]
-    for value in values[1:]:
-        result = value * k + result * (1 - k)
-    return result
 
+def _ema_crossover(algo: AlgoConfig, symbol: str, indicators: IndicatorEngine, ltp: float) -> TradeDecision | None:
+    if indicators.get(symbol, "ema", *EMA_FAST).value > indicators.get(symbol, "ema", *EMA_SLOW).value:
+        return build_long(algo, symbol, ltp, "EMA crossover")
+    return None
+
+
+def _vwap_reversion(algo: AlgoConfig, symbol: str, indicators: IndicatorEngine, ltp: float) -> TradeDecision | None:
+    if ltp > indicators.get(symbol, "vwap", 10).value:
+        return build_long(algo, symbol, ltp, "VWAP continuation")
+    return None
 
-def evaluate(algo: AlgoConfig, symbol: str, candles: list[dict], ltp: float) -> TradeDecision | None:
-    if len(candles) < 5:
-        return None
 
-    closes = [c["close"] for c in candles]
-    if algo.template.value == "ema_crossover":
-        if ema(closes[-9:], 5) > ema(closes[-21:], 10):
-            return _build_long(algo, symbol, ltp, "EMA crossover")
-    elif algo.template.value == "vwap_reversion":
-        vwap = mean(closes[-10:])
-        if ltp > vwap:
-            return _build_long(algo, symbol, ltp, "VWAP continuation")
-    elif algo.template.value == "breakout":
-        if ltp >= max(closes[-5:]):
-            return _build_long(algo, symbol, ltp, "Breakout")
+def _breakout(algo: AlgoConfig, symbol: str, indicators: IndicatorEngine, ltp: float) -> TradeDecision | None:
+    if ltp >= indicators.get(symbol, "max", 5).value:
+        return build_long(algo, symbol, ltp, "Breakout")
     return None
 
 
-def _build_long(algo: AlgoConfig, symbol: str, ltp: float, reason: str) -> TradeDecision:
+TEMPLATES = {
+    StrategyTemplate.ema_crossover: _ema_crossover,
+    StrategyTemplate.vwap_reversion: _vwap_reversion,
+    StrategyTemplate.breakout: _breakout,
+}
+
+evaluation_seconds = {
+    (template, mode): histogram(
+        "strategy_evaluation_seconds",
+        "Strategy template evaluation time, per algo/symbol call (single) or per vectorized pass (batch)",
+        labels={"template": template.value, "mode": mode},
+    )
+    for template in TEMPLATES
+    for mode in ("single", "batch")
+}
+
+
+def evaluate(algo: AlgoConfig, symbol: str, indicators: IndicatorEngine, ltp: float) -> TradeDecision | None:
+    indicators = indicators.timeframe(algo.timeframe)
+    if indicators.bars(symbol) < MIN_BARS:
+        return None
+    started = time.perf_counter()
+    decision = TEMPLATES[algo.template](algo, symbol, indicators, ltp)
+    evaluation_seconds[algo.template, "single"].observe(time.perf_counter() - started)
+    return decision
+
+
+def build_long(algo: AlgoConfig, symbol: str, ltp: float, reason: str) -> TradeDecision:
     sl = round(ltp * (1 - algo.stoploss_pct / 100), 2)
     target = round(ltp * (1 + algo.target_pct / 100), 2)
     risk_per_share = max(ltp - sl, 0.01)
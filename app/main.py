@@ -1,8 +1,10 @@
 import asyncio
-from datetime import datetime
+import logging
+import time
+from functools import partial
 
 from fastapi import FastAPI
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from starlette.requests import Request
@@ -10,12 +12,19 @@ from starlette.requests import Request
 from app.state import state
 from app.api.routes import algos, control, dashboard, stocks
 from app.core.config import settings
-from app.db.database import Base, SessionLocal, engine
-from app.engine.risk import RiskContext
+from app.core.metrics import counter, histogram, monitor_event_loop_lag, render_prometheus
+from app.db.database import Base, engine, ensure_columns, ensure_indexes
+from app.engine.execution import EntryLeftOpen
 from app.engine.strategy import evaluate
-from app.services.ledger import snapshot
+from app.services.alerts import alert_service
 from app.services.reset_service import should_square_off
 
+logger = logging.getLogger(__name__)
+entry_orders = {
+    outcome: counter("entry_orders_total", "Entry order outcomes: opened, failed, or left open at the broker", {"outcome": outcome})
+    for outcome in ("opened", "failed", "left_open")
+}
+trading_loop_cycle_seconds = histogram("trading_loop_cycle_seconds", "Trading loop work per wake-up: evaluation, risk screen and order submission")
 
 app = FastAPI(title=settings.app_name)
 app.mount("/static", StaticFiles(directory="app/ui/static"), name="static")
@@ -34,52 +43,127 @@ def home(request: Request):
 
 @app.on_event("startup")
 async def on_startup():
+    started = time.perf_counter()
     Base.metadata.create_all(bind=engine)
+    ensure_columns()
+    ensure_indexes()
+    state.db_writer.start()
+    await alert_service.start()
+    asyncio.create_task(monitor_event_loop_lag())
     await state.broker.connect()
-    state.market_data.disconnect_callback = lambda: setattr(state.risk_engine, "halted_reason", "WS disconnect")
-    state.market_data.run()
+    snapshot = state.snapshots.load()
+    restored = state.snapshots.restore_config(snapshot) if snapshot else {}
+    await state.capital.load()
+    await state.positions.load()
+    await state.execution_engine.orders.load(state.db_writer, state.clock.utcnow())
+    restored |= await state.snapshots.restore_risk(snapshot)
+    state.market_data.disconnect_callback = lambda: setattr(state.risk, "connected", False)
+    if state.cluster:
+        state.cluster.start()
+    else:
+        state.market_data.warm_up()
+        state.market_data.run()
+    if state.recorder:
+        state.recorder.run()
+    state.positions.run()
+    state.retention.run()
+    state.dashboard.run()
+    state.snapshots.run()
     asyncio.create_task(trading_loop())
+    state.snapshots.restored = restored | {"ready_seconds": round(time.perf_counter() - started, 3)}
+    print("Trading ready", state.snapshots.restored)
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    if state.snapshots.path:
+        await state.snapshots.save()
+    if state.cluster:
+        await asyncio.to_thread(state.cluster.stop)
+    if state.market_data.feed:
+        await state.market_data.feed.close()
+    if state.recorder:
+        await asyncio.to_thread(state.recorder.flush)
+    await asyncio.to_thread(state.db_writer.stop)
+    await alert_service.stop()
 
 
 async def trading_loop():
+    today = state.clock.now().date()
     while True:
-        db = SessionLocal()
-        try:
-            capital = snapshot(db, await state.broker.fetch_balance())
-            if should_square_off(datetime.now()):
-                state.risk_engine.halted_reason = "Auto square-off window"
-
-            for algo_name, algo in state.algo_manager.algos.items():
-                if algo_name in state.algo_manager.paused:
-                    continue
-                for symbol in algo.watchlist:
-                    tick = state.market_data.latest_ticks.get(symbol)
-                    if not tick:
-                        continue
-                    candles = state.market_data.candle_builder.get_recent(symbol)
-                    decision = evaluate(algo, symbol, candles, tick["ltp"])
-                    if not decision:
-                        continue
-                    ctx = RiskContext(
-                        websocket_connected=state.market_data.connected,
-                        global_daily_loss=capital.today_pnl,
-                        global_max_daily_loss=state.global_max_daily_loss,
-                        global_open_positions=sum(state.algo_manager.open_positions_by_algo.values()),
-                        global_max_open_positions=state.global_max_open_positions,
-                        open_positions_by_algo=state.algo_manager.open_positions_by_algo,
-                        trades_by_algo=state.algo_manager.trades_by_algo,
-                        algo_pnl=state.algo_manager.algo_pnl,
-                    )
-                    ok, reason = state.risk_engine.validate(decision, algo, capital, ctx)
-                    if not ok:
-                        continue
-                    trade = await state.execution_engine.execute_trade(db, decision)
-                    state.algo_manager.open_positions_by_algo[algo.name] += 1
-                    state.algo_manager.trades_by_algo[algo.name] += 1
-                    print("Trade opened", trade.id, reason)
-            await asyncio.sleep(1)
-        finally:
-            db.close()
+        if state.cluster:
+            batch = await state.cluster.decisions(timeout=1)
+        else:
+            batch = await state.dispatcher.wait(timeout=1)
+        now = state.clock.now()
+        if now.date() != today:
+            today = now.date()
+            state.risk.reset_day()
+        if should_square_off(now):
+            state.risk.halt("square_off", "Auto square-off window")
+        else:
+            state.risk.resume("square_off")
+        state.risk.connected = state.market_data.connected
+        if not batch or state.risk.halts:
+            continue
+        started = time.perf_counter()
+        capital = await state.capital.snapshot()
+        decisions, algos, received = _remote_decisions(batch) if state.cluster else _evaluate(batch)
+
+        for decision in state.risk.screen(decisions, algos, capital):
+            task = state.order_pipeline.submit(decision, received[decision.symbol])
+            task.add_done_callback(partial(_on_order_done, decision))
+        trading_loop_cycle_seconds.observe(time.perf_counter() - started)
+
+
+def _evaluate(pending: dict[str, float]):
+    latest_ticks, warming = state.market_data.latest_ticks, state.market_data.warming
+    ltps = {s: latest_ticks[s]["ltp"] for s in pending if s in latest_ticks and s not in warming}
+    algos = {algo.name: algo for symbol in ltps for algo in state.algo_manager.active_for(symbol)}
+    if len(ltps) >= settings.batch_eval_min_symbols:
+        decisions = state.batch_evaluator.evaluate(list(algos.values()), ltps)
+    else:
+        decisions = [
+            decision
+            for symbol, ltp in ltps.items()
+            for algo in state.algo_manager.active_for(symbol)
+            if (decision := evaluate(algo, symbol, state.market_data.indicators, ltp))
+        ]
+    return decisions, algos, pending
+
+
+def _remote_decisions(batch):
+    manager = state.algo_manager
+    decisions = [
+        decision
+        for decision, _ in batch
+        if decision.algo_name in manager.algos and decision.algo_name not in manager.paused
+    ]
+    algos = {decision.algo_name: manager.algos[decision.algo_name] for decision in decisions}
+    received = {decision.symbol: received_at for decision, received_at in batch}
+    return decisions, algos, received
+
+
+def _on_order_done(decision, task: asyncio.Task):
+    error = None if task.cancelled() else task.exception()
+    if isinstance(error, EntryLeftOpen):
+        entry_orders["left_open"].inc()
+        logger.warning("Entry left open, keeping its risk reservation: %s %s: %s", decision.algo_name, decision.symbol, error)
+        return
+    if task.cancelled() or error:
+        state.risk.release(decision.algo_name)
+        entry_orders["failed"].inc()
+        logger.warning("Trade failed: %s %s: %s", decision.algo_name, decision.symbol, error or "cancelled")
+        return
+    state.capital.on_trade_opened()
+    state.positions.open(task.result())
+    entry_orders["opened"].inc()
+    logger.info("Trade opened: %s %s", task.result().id, decision.reason)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
 
 
 @app.get("/health")
@@ -1,7 +1,9 @@
 from datetime import datetime
 from enum import Enum
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
+
+from app.core.config import settings
 
 
 class StrategyTemplate(str, Enum):
@@ -26,6 +28,14 @@ class AlgoConfig(BaseModel):
     max_open_trades: int = Field(gt=0, le=10)
     capital_per_trade: float = Field(gt=0)
     watchlist: list[str] = Field(default_factory=list)
+    timeframe: int = 1
+
+    @field_validator("timeframe")
+    @classmethod
+    def _configured_timeframe(cls, minutes: int) -> int:
+        if minutes != 1 and minutes not in settings.candle_timeframes:
+            raise ValueError(f"timeframe must be 1 or one of {settings.candle_timeframes} minutes")
+        return minutes
 
 
 class TradeDecision(BaseModel):
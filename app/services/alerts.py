@@ -1,11 +1,186 @@
+import asyncio
+
 import httpx
 
 from app.core.config import settings
 
+TELEGRAM_MAX_TEXT = 4096
+DEFAULT_RETRY_AFTER = 1.0
+
+
+class RateLimiter:
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated: float | None = None
+
+    async def acquire(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            if self._updated is not None:
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AlertService:
+    """Long-lived Telegram sender: a bounded queue drained by one background task
+    that coalesces bursts into batched messages, rate limits sends and reuses
+    one pooled HTTP client."""
+
+    def __init__(
+        self,
+        token: str | None,
+        chat_id: str | None,
+        base_url: str = "https://api.telegram.org",
+        max_queue: int = 1000,
+        batch_window: float = 0.5,
+        max_batch: int = 20,
+        rate_per_second: float = 1.0,
+        client: httpx.AsyncClient | None = None,
+    ):
+        self.token = token
+        self.chat_id = chat_id
+        self.base_url = base_url
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.limiter = RateLimiter(rate_per_second)
+        self.sent = 0
+        self.batches = 0
+        self.dropped = 0
+        self.failed = 0
+        self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize=max_queue)
+        self._client = client
+        self._owns_client = client is None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.token and self.chat_id)
+
+    def enqueue(self, message: str) -> bool:
+        if not self.enabled:
+            return False
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+        return True
+
+    async def start(self):
+        if not self.enabled or self._task:
+            return
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=5,
+                limits=httpx.Limits(max_connections=4, max_keepalive_connections=2),
+            )
+        self._task = asyncio.create_task(self._drain())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._client and self._owns_client:
+            await self._client.aclose()
+            self._client = None
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "sent": self.sent,
+            "batches": self.batches,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+    async def _next_batch(self) -> list[str]:
+        messages = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.batch_window
+        while len(messages) < self.max_batch:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                messages.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return messages
+
+    async def _drain(self):
+        while True:
+            messages = await self._next_batch()
+            for text, count in _pack(messages):
+                await self.limiter.acquire()
+                if await self._post(text):
+                    self.batches += 1
+                    self.sent += count
+                else:
+                    self.failed += count
+
+    async def _post(self, text: str) -> bool:
+        url = f"/bot{self.token}/sendMessage"
+        for _ in range(2):
+            try:
+                response = await self._client.post(url, json={"chat_id": self.chat_id, "text": text})
+            except httpx.HTTPError:
+                return False
+            if response.status_code != 429:
+                return response.is_success
+            await asyncio.sleep(_retry_after(response))
+        return False
+
+
+def _retry_after(response: httpx.Response) -> float:
+    """Seconds to wait after a 429: Telegram's ``parameters.retry_after``, else the
+    ``Retry-After`` header, else ``DEFAULT_RETRY_AFTER``."""
+    try:
+        return float(response.json()["parameters"]["retry_after"])
+    except (ValueError, KeyError, TypeError):
+        pass
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return DEFAULT_RETRY_AFTER
+
+
+def _pack(messages: list[str]) -> list[tuple[str, int]]:
+    chunks, current, count = [], "", 0
+    for message in messages:
+        message = message[:TELEGRAM_MAX_TEXT]
+        if current and len(current) + 1 + len(message) > TELEGRAM_MAX_TEXT:
+            chunks.append((current, count))
+            current, count = "", 0
+        current = f"{current}\n{message}" if current else message
+        count += 1
+    if current:
+        chunks.append((current, count))
+    return chunks
+
+
+alert_service = AlertService(
+    settings.telegram_token,
+    settings.telegram_chat_id,
+    base_url=settings.telegram_api_url,
+    max_queue=settings.alert_queue_size,
+    batch_window=settings.alert_batch_window,
+    rate_per_second=settings.alert_rate_per_second,
+)
+
 
 async def send_telegram_alert(message: str):
-    if not settings.telegram_token or not settings.telegram_chat_id:
-        return
-    url = f"https://api.telegram.org/bot{settings.telegram_token}/sendMessage"
-    async with httpx.AsyncClient(timeout=5) as client:
-        await client.post(url, json={"chat_id": settings.telegram_chat_id, "text": message})
+    alert_service.enqueue(message)
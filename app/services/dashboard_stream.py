@@ -0,0 +1,179 @@
+import asyncio
+import json
+import time
+
+from sqlalchemy.orm import Session
+
+from app.db.models import TradeLog
+
+
+def _recent_trades(db: Session, limit: int = 100) -> list[dict]:
+    rows = db.query(TradeLog).order_by(TradeLog.created_at.desc()).limit(limit).all()
+    return [{c.name: getattr(row, c.name) for c in TradeLog.__table__.columns} for row in rows]
+
+
+def _encode(message: dict) -> bytes:
+    return f"data: {json.dumps(message, default=str)}\n\n".encode()
+
+
+def _merge(pending: dict, diff: dict) -> dict:
+    merged = {**pending, **diff}
+    for key in ("ticks", "marks"):
+        if key in pending and key in diff:
+            merged[key] = {**pending[key], **diff[key]}
+    if "positions" in diff and "marks" not in diff:
+        merged.pop("marks", None)
+    return merged
+
+
+class DashboardClient:
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self.pending: dict | None = None
+        self.encoded: bytes | None = None
+        self.ready = asyncio.Event()
+        self.sent_at = 0.0
+
+    def push(self, diff: dict, encoded: bytes):
+        if self.pending is None:
+            self.pending, self.encoded = diff, encoded
+        else:
+            self.pending, self.encoded = _merge(self.pending, diff), None
+        self.ready.set()
+
+    def take(self) -> bytes:
+        data = self.encoded or _encode(self.pending)
+        self.pending = self.encoded = None
+        self.ready.clear()
+        self.sent_at = time.monotonic()
+        return data
+
+
+class DashboardStream:
+    """Shared fan-out for dashboard viewers. A single producer task computes one
+    diff per interval (dirty ticks, capital, stocks, algos, the trade list after a
+    trade opens or closes, and ``marks`` for re-marked open positions) and encodes it
+    once. Marks come from the ``positions`` book in memory, so only opens and closes
+    reload the trade list from the DB. Each client then coalesces diffs it has not
+    yet received and is throttled to its own rate."""
+
+    def __init__(self, events, market_data, algo_manager, capital, writer, interval: float = 0.5, positions=None):
+        self.market_data = market_data
+        self.algo_manager = algo_manager
+        self.capital = capital
+        self.writer = writer
+        self.interval = interval
+        self.positions = positions
+        self.clients: set[DashboardClient] = set()
+        self.current: dict = {}
+        self._dirty_ticks: set[str] = set()
+        self._dirty_marks: set[int] = set()
+        self._positions_dirty = True
+        self._task = None
+        events.subscribe("tick", self.on_tick)
+        events.subscribe("tick_batch", self.on_tick_batch)
+        events.subscribe("position", self.on_position)
+
+    def on_tick(self, tick: dict):
+        if self.clients:
+            self._dirty_ticks.add(tick["symbol"])
+
+    def on_tick_batch(self, batch):
+        if self.clients:
+            self._dirty_ticks.update(batch.symbols())
+
+    def on_position(self, event=None):
+        if event and "marked" in event and self.positions is not None:
+            if self.clients:
+                self._dirty_marks.update(event["marked"])
+            return
+        self._positions_dirty = True
+
+    def _marks(self, trade_ids) -> dict[int, dict]:
+        book = self.positions.by_id if self.positions is not None else {}
+        return {i: {"ltp": book[i].ltp, "pnl": book[i].unrealized} for i in trade_ids if i in book}
+
+    async def _load_positions(self) -> list[dict]:
+        rows = await self.writer.run(_recent_trades)
+        marks = self._marks(row["id"] for row in rows)
+        for row in rows:
+            if row["id"] in marks:
+                row["pnl"] = marks[row["id"]]["pnl"]
+        return rows
+
+    async def _collect(self) -> dict:
+        capital = await self.capital.snapshot()
+        sections = {
+            "capital": capital.model_dump(),
+            "stocks": dict(self.market_data.subscriptions),
+            "algos": self.algo_manager.list(),
+        }
+        if self._positions_dirty:
+            self._positions_dirty = False
+            self._dirty_marks.clear()
+            sections["positions"] = await self._load_positions()
+        diff = {key: value for key, value in sections.items() if self.current.get(key) != value}
+        self.current.update(diff)
+        if self._dirty_marks:
+            marks = self._marks(self._dirty_marks)
+            self._dirty_marks.clear()
+            for row in self.current.get("positions", ()):
+                if row["id"] in marks:
+                    row["pnl"] = marks[row["id"]]["pnl"]
+            if marks:
+                diff["marks"] = marks
+        if self._dirty_ticks:
+            latest = self.market_data.latest_ticks
+            diff["ticks"] = {s: latest[s] for s in self._dirty_ticks if s in latest}
+            self._dirty_ticks.clear()
+        return diff
+
+    async def publish_once(self):
+        if not self.clients:
+            return
+        diff = await self._collect()
+        if not diff:
+            return
+        encoded = _encode(diff)
+        for client in self.clients:
+            client.push(diff, encoded)
+
+    async def start(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.publish_once()
+            except Exception as exc:
+                print("Dashboard stream error", exc)
+
+    def run(self):
+        if not self._task:
+            self._task = asyncio.create_task(self.start())
+
+    async def connect(self, min_interval: float | None = None) -> DashboardClient:
+        client = DashboardClient(max(min_interval or 0.0, self.interval))
+        if not self.clients:
+            self._positions_dirty = True
+            self.current = {}
+            await self._collect()
+        client.push({**self.current, "ticks": dict(self.market_data.latest_ticks)}, None)
+        self.clients.add(client)
+        return client
+
+    def disconnect(self, client: DashboardClient):
+        self.clients.discard(client)
+
+    async def stream(self, client: DashboardClient, keepalive: float = 15.0):
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(client.ready.wait(), keepalive)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                delay = client.sent_at + client.min_interval - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                yield client.take()
+        finally:
+            self.disconnect(client)
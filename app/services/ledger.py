@@ -1,14 +1,19 @@
-from datetime import date
+import asyncio
+from datetime import date, datetime, time
+from time import monotonic
 
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from app.core.clock import Clock, system_clock
+from app.core.config import settings
 from app.db.models import DailyLedger, TradeLog
+from app.db.writer import DBWriter
 from app.models import CapitalSnapshot
 
 
-def get_or_create_ledger(db: Session, opening_balance: float) -> DailyLedger:
-    today = date.today()
+def get_or_create_ledger(db: Session, opening_balance: float, today: date | None = None) -> DailyLedger:
+    today = today or date.today()
     ledger = db.query(DailyLedger).filter(DailyLedger.trading_date == today).first()
     if ledger:
         return ledger
@@ -26,19 +31,84 @@ def get_or_create_ledger(db: Session, opening_balance: float) -> DailyLedger:
     return ledger
 
 
-def snapshot(db: Session, balance: dict) -> CapitalSnapshot:
-    ledger = get_or_create_ledger(db, opening_balance=balance["available_balance"])
-    total_pnl = db.query(func.coalesce(func.sum(TradeLog.pnl), 0)).scalar() or 0
-    ledger.pnl = float(total_pnl)
-    ledger.used_margin = balance["used_margin"]
-    ledger.free_margin = balance["free_margin"]
-    db.commit()
-    warning = "Balance below threshold" if balance["available_balance"] < 1000 else None
-    return CapitalSnapshot(
-        available_balance=balance["available_balance"],
-        used_margin=ledger.used_margin,
-        free_margin=ledger.free_margin,
-        today_pnl=ledger.pnl,
-        trading_enabled=ledger.trading_enabled,
-        warning=warning,
+def _load_today(db: Session, today: date, since: datetime, opening_balance: float) -> tuple[float, bool]:
+    ledger = get_or_create_ledger(db, opening_balance, today)
+    pnl = (
+        db.query(func.coalesce(func.sum(TradeLog.pnl), 0))
+        .filter(TradeLog.created_at >= since, TradeLog.status != "OPEN")
+        .scalar()
+        or 0
     )
+    return float(pnl), ledger.trading_enabled
+
+
+def _persist(db: Session, today: date, pnl: float, used_margin: float, free_margin: float):
+    ledger = db.query(DailyLedger).filter(DailyLedger.trading_date == today).first()
+    if not ledger:
+        return
+    ledger.pnl = pnl
+    ledger.used_margin = used_margin
+    ledger.free_margin = free_margin
+    db.commit()
+
+
+class CapitalTracker:
+    """In-memory capital/PnL state: today's PnL is loaded once per day and then
+    accumulated from trade events, the broker balance is cached for
+    ``balance_ttl`` seconds, and the DailyLedger row is written only on change."""
+
+    def __init__(self, broker, writer: DBWriter, clock: Clock = system_clock, balance_ttl: float | None = None):
+        self.broker = broker
+        self.writer = writer
+        self.clock = clock
+        self.balance_ttl = settings.balance_refresh_seconds if balance_ttl is None else balance_ttl
+        self.balance: dict | None = None
+        self.today: date | None = None
+        self.today_pnl = 0.0
+        self.trading_enabled = True
+        self._balance_at = 0.0
+        self._persisted: tuple | None = None
+        self._lock = asyncio.Lock()
+
+    async def refresh_balance(self, force: bool = False) -> dict:
+        async with self._lock:
+            if force or self.balance is None or monotonic() - self._balance_at >= self.balance_ttl:
+                self.balance = await self.broker.fetch_balance()
+                self._balance_at = monotonic()
+        return self.balance
+
+    async def load(self):
+        balance = await self.refresh_balance(force=True)
+        now = self.clock.now()
+        today = now.date()
+        since = datetime.combine(today, time.min) + (self.clock.utcnow() - now)
+        self.today_pnl, self.trading_enabled = await self.writer.run(
+            _load_today, today, since, balance["available_balance"]
+        )
+        self.today = today
+        self._persisted = None
+
+    def on_trade_opened(self):
+        self._balance_at = 0.0
+
+    def on_trade_closed(self, pnl: float):
+        self.today_pnl += pnl
+        self._balance_at = 0.0
+
+    async def snapshot(self) -> CapitalSnapshot:
+        if self.clock.now().date() != self.today:
+            await self.load()
+        balance = await self.refresh_balance()
+        state = (self.today_pnl, balance["used_margin"], balance["free_margin"])
+        if state != self._persisted:
+            self._persisted = state
+            self.writer.submit(_persist, self.today, *state)
+        warning = "Balance below threshold" if balance["available_balance"] < settings.min_balance_threshold else None
+        return CapitalSnapshot(
+            available_balance=balance["available_balance"],
+            used_margin=balance["used_margin"],
+            free_margin=balance["free_margin"],
+            today_pnl=self.today_pnl,
+            trading_enabled=self.trading_enabled,
+            warning=warning,
+        )
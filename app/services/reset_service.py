@@ -10,9 +10,7 @@ def should_square_off(now: datetime) -> bool:
 
 
 def reset_for_new_day(db: Session):
-    open_trades = db.query(TradeLog).filter(TradeLog.status == "OPEN").all()
-    for trade in open_trades:
-        trade.status = "FORCE_EXIT_PENDING"
+    db.query(TradeLog).filter(TradeLog.status == "OPEN").update({"status": "FORCE_EXIT_PENDING"}, synchronize_session=False)
 
     today = date.today()
     for ledger in db.query(DailyLedger).filter(DailyLedger.trading_date < today).all():
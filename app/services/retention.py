@@ -0,0 +1,99 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import Column, MetaData, Table, delete, func, insert, select, true
+from sqlalchemy.orm import Session
+
+from app.core.clock import Clock, system_clock
+from app.core.config import settings
+from app.db.models import SystemEvent, TradeLog
+from app.db.writer import DBWriter
+
+ACTIVE_STATUSES = ("OPEN", "FORCE_EXIT_PENDING")
+
+_archive_metadata = MetaData()
+
+
+def archive_table(source: Table, month: str) -> Table:
+    """``<table>_<YYYYMM>``: same columns as ``source``, no secondary indexes."""
+    name = f"{source.name}_{month}"
+    table = _archive_metadata.tables.get(name)
+    if table is None:
+        table = Table(name, _archive_metadata, *(Column(c.name, c.type, primary_key=c.primary_key) for c in source.columns))
+    return table
+
+
+def _move_oldest_month(db: Session, model, condition, before: datetime) -> dict[str, int]:
+    source = model.__table__
+    condition = condition & (model.created_at < before)
+    first = db.query(func.min(model.created_at)).filter(condition).scalar()
+    if first is None:
+        return {}
+    start = first.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    end = (start + timedelta(days=32)).replace(day=1)
+    rows = condition & (model.created_at >= start) & (model.created_at < end)
+    target = archive_table(source, f"{start:%Y%m}")
+    target.create(bind=db.get_bind(), checkfirst=True)
+    columns = [c.name for c in source.columns]
+    result = db.execute(insert(target).from_select(columns, select(*source.columns).where(rows)))
+    db.execute(delete(source).where(rows))
+    db.commit()
+    return {target.name: result.rowcount}
+
+
+def archive_old_rows(db: Session, trades_before: datetime, events_before: datetime) -> dict[str, int]:
+    """Moves the oldest month of closed trades created before ``trades_before`` and of
+    system events created before ``events_before`` into ``<table>_<YYYYMM>`` archive
+    tables, one transaction each. Empty when nothing is left to archive."""
+    moved = _move_oldest_month(db, TradeLog, TradeLog.status.notin_(ACTIVE_STATUSES), trades_before)
+    moved |= _move_oldest_month(db, SystemEvent, true(), events_before)
+    return moved
+
+
+class RetentionJob:
+    """Every ``interval`` seconds, archives closed trades older than
+    ``trade_retention_days`` and events older than ``event_retention_days`` through the
+    DB writer, so the hot tables only hold recent history."""
+
+    def __init__(self, writer: DBWriter, clock: Clock = system_clock, interval: float | None = None):
+        self.writer = writer
+        self.clock = clock
+        self.interval = interval or settings.retention_interval_seconds
+        self.moved: dict[str, int] = {}
+        self.last_run: datetime | None = None
+        self._task = None
+
+    async def run_once(self) -> dict[str, int]:
+        """Archives a month at a time, so other writes interleave with a large backlog."""
+        now = self.clock.utcnow()
+        trades_before = now - timedelta(days=settings.trade_retention_days)
+        events_before = now - timedelta(days=settings.event_retention_days)
+        total: dict[str, int] = {}
+        while moved := await self.writer.run(archive_old_rows, trades_before, events_before):
+            for table, count in moved.items():
+                total[table] = total.get(table, 0) + count
+                self.moved[table] = self.moved.get(table, 0) + count
+        self.last_run = now
+        if total:
+            print("Archived rows", total)
+        return total
+
+    async def start(self):
+        while True:
+            try:
+                await self.run_once()
+            except Exception as exc:
+                print("Retention job failed", exc)
+            await asyncio.sleep(self.interval)
+
+    def run(self):
+        if not self._task:
+            self._task = asyncio.create_task(self.start())
+
+    def stats(self) -> dict:
+        return {
+            "trade_retention_days": settings.trade_retention_days,
+            "event_retention_days": settings.event_retention_days,
+            "last_run": self.last_run,
+            "moved": self.moved,
+        }
@@ -1,20 +1,82 @@
 from app.brokers.factory import get_broker
+from app.core.clock import system_clock
 from app.core.config import settings
+from app.core.events import EventBus
+from app.data.archive import ArchiveRecorder
+from app.db.database import WriterSession
+from app.db.writer import DBWriter
 from app.data.market_data import MarketDataManager
 from app.engine.algo_manager import AlgoManager
+from app.engine.batch import BatchEvaluator
+from app.engine.cluster import ProcessCluster
+from app.engine.dispatcher import EvaluationDispatcher
 from app.engine.execution import ExecutionEngine
-from app.engine.risk import RiskEngine
+from app.engine.order_pipeline import OrderPipeline
+from app.engine.positions import PositionManager
+from app.engine.risk import RiskState
+from app.services.dashboard_stream import DashboardStream
+from app.services.ledger import CapitalTracker
+from app.services.retention import RetentionJob
+from app.state.snapshot import StateSnapshots
 
 
 class AppState:
     def __init__(self):
+        self.clock = system_clock
+        self.events = EventBus()
         self.broker = get_broker(settings.broker_name)
-        self.market_data = MarketDataManager(self.broker)
+        self.db_writer = DBWriter(WriterSession)
+        self.market_data = MarketDataManager(self.broker, self.events)
         self.algo_manager = AlgoManager()
-        self.risk_engine = RiskEngine()
-        self.execution_engine = ExecutionEngine(self.broker)
-        self.global_max_open_positions = 2
-        self.global_max_daily_loss = 3000
+        self.risk = RiskState(global_max_open_positions=2, global_max_daily_loss=3000)
+        self.risk_engine = self.risk
+        self.execution_engine = ExecutionEngine(self.broker, self.db_writer, self.clock)
+        self.events.subscribe("position", self.execution_engine.orders.on_position)
+        self.order_pipeline = OrderPipeline(self.execution_engine, settings.order_concurrency)
+        self.capital = CapitalTracker(self.broker, self.db_writer, self.clock)
+        self.retention = RetentionJob(self.db_writer, self.clock)
+        self.positions = PositionManager(
+            self.broker,
+            self.db_writer,
+            self.risk,
+            self.capital,
+            self.events,
+            self.clock,
+            settings.position_flush_interval,
+        )
+        self.events.subscribe("tick", self.positions.on_tick)
+        self.events.subscribe("tick_batch", self.positions.on_tick_batch)
+        self.batch_evaluator = BatchEvaluator(self.market_data.candle_builder)
+        self.dispatcher = EvaluationDispatcher(on_pressure=self._on_backpressure)
+        self.cluster = None
+        if settings.strategy_workers:
+            self.cluster = ProcessCluster(self.market_data, self.algo_manager, self.events, settings.strategy_workers)
+        else:
+            self.events.subscribe("tick", self.dispatcher.on_tick)
+            self.events.subscribe("tick_batch", self.dispatcher.on_tick_batch)
+        self.dashboard = DashboardStream(
+            self.events,
+            self.market_data,
+            self.algo_manager,
+            self.capital,
+            self.db_writer,
+            settings.dashboard_push_interval,
+            self.positions,
+        )
+        self.recorder = None
+        if settings.archive_dir and not self.cluster:
+            self.recorder = ArchiveRecorder(settings.archive_dir, settings.archive_flush_interval)
+            self.events.subscribe("tick", self.recorder.record_tick)
+            self.events.subscribe("tick_batch", self.recorder.record_batch)
+            self.events.subscribe("candle_closed", self.recorder.record_candle)
+
+        self.snapshots = StateSnapshots(self)
+
+    def _on_backpressure(self, pressured: bool):
+        if pressured:
+            self.risk.halt("backpressure", "Evaluation lagging ticks by dispatch_high_lag_seconds")
+        else:
+            self.risk.resume("backpressure")
 
 
 state = AppState()
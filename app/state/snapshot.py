@@ -0,0 +1,163 @@
+import asyncio
+import json
+import os
+import time
+from datetime import datetime, time as day_start
+
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import histogram
+from app.db.models import TradeLog
+from app.models import AlgoConfig
+
+SNAPSHOT_VERSION = 1
+TRANSIENT_HALTS = ("backpressure", "square_off")
+
+snapshot_write_seconds = histogram("snapshot_write_seconds", "Serialize and atomically replace the state snapshot")
+
+
+def _today_by_algo(db: Session, since: datetime) -> list[tuple[str, int, float]]:
+    realized = case((TradeLog.status != "OPEN", TradeLog.pnl), else_=0.0)
+    return (
+        db.query(TradeLog.algo_name, func.count(TradeLog.id), func.coalesce(func.sum(realized), 0.0))
+        .filter(TradeLog.created_at >= since)
+        .group_by(TradeLog.algo_name)
+        .all()
+    )
+
+
+class StateSnapshots:
+    """Keeps a compact JSON snapshot of the state that only lives in memory (stock
+    subscriptions, algos and pauses, risk halts and per-algo day counters, order dedupe
+    keys) at ``path``. It is rewritten every ``interval`` seconds when it changed, or
+    right away after ``request()``. The write is atomic: a temp file is renamed over
+    the old snapshot. At startup ``restore_config`` and ``restore_risk`` rebuild that
+    state, with ``TradeLog`` as the source of truth for trades."""
+
+    def __init__(self, state, path: str | None = None, interval: float | None = None):
+        self.state = state
+        self.path = path or settings.snapshot_path
+        self.interval = interval or settings.snapshot_interval_seconds
+        self.writes = 0
+        self.saved_at: datetime | None = None
+        self.restored: dict = {}
+        self._last: bytes | None = None
+        self._changed = asyncio.Event()
+        self._task = None
+
+    def capture(self) -> dict:
+        state = self.state
+        orders = state.execution_engine.orders
+        return {
+            "version": SNAPSHOT_VERSION,
+            "trading_date": state.clock.now().date().isoformat(),
+            "subscriptions": dict(state.market_data.subscriptions),
+            "algos": [config.model_dump(mode="json") for config in state.algo_manager.algos.values()],
+            "paused": sorted(state.algo_manager.paused),
+            "halts": {k: v for k, v in state.risk.halts.items() if k not in TRANSIENT_HALTS},
+            "trades_by_algo": dict(state.risk.trades_by_algo),
+            "order_keys": {key: expires.isoformat() for key, expires in orders.keys.items()},
+        }
+
+    def _write(self, payload: bytes):
+        started = time.perf_counter()
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "wb") as handle:
+            handle.write(payload)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temporary, self.path)
+        snapshot_write_seconds.observe(time.perf_counter() - started)
+
+    async def save(self, force: bool = False) -> bool:
+        snapshot = self.capture()
+        payload = json.dumps(snapshot, separators=(",", ":"), sort_keys=True).encode()
+        if payload == self._last and not force:
+            return False
+        await asyncio.to_thread(self._write, payload)
+        self._last = payload
+        self.writes += 1
+        self.saved_at = self.state.clock.utcnow()
+        return True
+
+    def request(self):
+        """Snapshot soon, after a user-visible change (stock, algo, pause)."""
+        self._changed.set()
+
+    async def start(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._changed.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._changed.clear()
+            try:
+                await self.save()
+            except Exception as exc:
+                print("State snapshot failed", exc)
+
+    def run(self):
+        if self.path and not self._task:
+            self._task = asyncio.create_task(self.start())
+
+    def load(self) -> dict | None:
+        if not self.path or not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, "rb") as handle:
+                snapshot = json.loads(handle.read())
+        except (OSError, ValueError) as exc:
+            print("Ignoring unreadable state snapshot", self.path, exc)
+            return None
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            print("Ignoring state snapshot of version", snapshot.get("version"))
+            return None
+        return snapshot
+
+    def restore_config(self, snapshot: dict) -> dict:
+        """Algos, pauses and subscriptions; run before the feed and cluster start."""
+        state = self.state
+        for data in snapshot["algos"]:
+            state.algo_manager.add(AlgoConfig(**data))
+        for name in snapshot["paused"]:
+            state.algo_manager.toggle(name, True)
+        for symbol, token in snapshot["subscriptions"].items():
+            if state.cluster:
+                state.cluster.add_stock(symbol, token)
+            else:
+                state.market_data.subscriptions[symbol] = token
+        return {"algos": len(snapshot["algos"]), "paused": len(snapshot["paused"]), "stocks": len(snapshot["subscriptions"])}
+
+    async def restore_risk(self, snapshot: dict | None) -> dict:
+        """Halts, order keys and today's per-algo counters. Runs after open positions are
+        reloaded. Trade counts and realized PnL are recomputed from today's ``TradeLog``
+        rows, keeping the larger trade count in case the snapshot saw reservations the
+        DB has not."""
+        state, risk = self.state, self.state.risk
+        now = state.clock.now()
+        today = now.date().isoformat()
+        if snapshot:
+            risk.halts.update(snapshot["halts"])
+            keys = {key: datetime.fromisoformat(expires) for key, expires in snapshot["order_keys"].items()}
+            state.execution_engine.orders.merge_keys(keys, state.clock.utcnow())
+        same_day = bool(snapshot) and snapshot["trading_date"] == today
+        counts = snapshot["trades_by_algo"] if same_day else {}
+        risk.trades_by_algo.update(counts)
+        since = datetime.combine(now.date(), day_start.min) + (state.clock.utcnow() - now)
+        for algo_name, count, realized in await state.db_writer.run(_today_by_algo, since):
+            risk.trades_by_algo[algo_name] = max(count, counts.get(algo_name, 0))
+            risk.realized_by_algo[algo_name] = float(realized)
+        return {"same_day": same_day, "halts": len(risk.halts), "trades_by_algo": dict(risk.trades_by_algo)}
+
+    def stats(self) -> dict:
+        return {
+            "path": self.path,
+            "interval_seconds": self.interval,
+            "writes": self.writes,
+            "saved_at": self.saved_at,
+            "restored": self.restored,
+        }
@@ -1,15 +1,33 @@
-async function refresh() {
-  const [capital, stocks, algos, positions] = await Promise.all([
-    fetch('/api/dashboard/capital').then(r => r.json()),
-    fetch('/api/stocks').then(r => r.json()),
-    fetch('/api/algos').then(r => r.json()),
-    fetch('/api/dashboard/positions').then(r => r.json())
-  ]);
+const view = { capital: {}, stocks: {}, algos: [], positions: [], ticks: {} };
 
-  document.getElementById('capital').textContent = JSON.stringify(capital, null, 2);
-  document.getElementById('stocks').textContent = JSON.stringify(stocks, null, 2);
-  document.getElementById('algos').textContent = JSON.stringify(algos, null, 2);
-  document.getElementById('positions').textContent = JSON.stringify(positions, null, 2);
+function render(sections) {
+  for (const key of sections) {
+    document.getElementById(key).textContent = JSON.stringify(view[key], null, 2);
+  }
+}
+
+function connect() {
+  const source = new EventSource('/api/dashboard/stream');
+  source.onmessage = (event) => {
+    const diff = JSON.parse(event.data);
+    if (diff.ticks) {
+      Object.assign(view.ticks, diff.ticks);
+    }
+    for (const key of ['capital', 'stocks', 'algos', 'positions']) {
+      if (key in diff) {
+        view[key] = diff[key];
+      }
+    }
+    if (diff.marks) {
+      for (const row of view.positions) {
+        if (row.id in diff.marks) {
+          row.pnl = diff.marks[row.id].pnl;
+        }
+      }
+      diff.positions = view.positions;
+    }
+    render(Object.keys(diff).filter(key => key in view));
+  };
 }
 
 async function addStock() {
@@ -19,7 +37,6 @@ async function addStock() {
     method: 'POST', headers: { 'Content-Type': 'application/json' },
     body: JSON.stringify({ symbol, token })
   });
-  await refresh();
 }
 
 async function saveAlgo() {
@@ -28,8 +45,6 @@ async function saveAlgo() {
     method: 'POST', headers: { 'Content-Type': 'application/json' },
     body: JSON.stringify(payload)
   });
-  await refresh();
 }
 
-setInterval(refresh, 2000);
-refresh();
+connect();
@@ -0,0 +1,68 @@
+"""Per-cycle cost of per-symbol evaluate() vs BatchEvaluator at 20/200/2000 symbols.
+
+Run from the repo root: ``python -m benchmarks.bench_batch_eval [bars]``
+"""
+
+import random
+import sys
+import time
+
+from app.data.candle_builder import CandleBuilder
+from app.engine.batch import BatchEvaluator
+from app.engine.indicators import IndicatorEngine
+from app.engine.strategy import evaluate
+from app.models import AlgoConfig, StrategyTemplate
+
+
+def build(symbols: list[str], bars: int) -> tuple[CandleBuilder, IndicatorEngine, dict[str, float]]:
+    builder = CandleBuilder()
+    ltps = {}
+    for symbol in symbols:
+        series = builder.history.create(symbol)
+        price = random.uniform(100, 1000)
+        for minute in range(bars):
+            price *= 1 + random.gauss(0, 0.002)
+            series.append(minute * 60.0, price, price * 1.001, price * 0.999, price, random.randint(1, 500))
+        ltps[symbol] = price * 0.995
+    return builder, IndicatorEngine(builder), ltps
+
+
+def algos_for(symbols: list[str]) -> list[AlgoConfig]:
+    return [
+        AlgoConfig(
+            name=template.value, template=template, stoploss_pct=0.5, target_pct=1, risk_per_trade=500,
+            max_trades_per_day=3, max_daily_loss=1500, max_open_trades=1, capital_per_trade=20000, watchlist=symbols,
+        )
+        for template in StrategyTemplate
+    ]
+
+
+def timed(fn, cycles: int) -> float:
+    fn()
+    began = time.perf_counter()
+    for _ in range(cycles):
+        fn()
+    return (time.perf_counter() - began) / cycles
+
+
+def main():
+    bars = int(sys.argv[1]) if len(sys.argv) > 1 else 120
+    print(f"{'symbols':>8} {'per-symbol ms':>14} {'batch ms':>10} {'decisions':>10}")
+    for count in (20, 200, 2000):
+        symbols = [f"SYM{i}" for i in range(count)]
+        builder, indicators, ltps = build(symbols, bars)
+        algos = algos_for(symbols)
+        batch = BatchEvaluator(builder)
+
+        def per_symbol():
+            return [d for algo in algos for s in algo.watchlist if (d := evaluate(algo, s, indicators, ltps[s]))]
+
+        cycles = max(2000 // count, 3)
+        print(
+            f"{count:>8} {timed(per_symbol, cycles) * 1e3:>14.2f} "
+            f"{timed(lambda: batch.evaluate(algos, ltps), cycles) * 1e3:>10.2f} {len(per_symbol()):>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Ingest/read cost of the ring-buffer candle store vs the old list-of-dicts history.
+
+Run from the repo root: ``python -m benchmarks.bench_candle_store [symbols] [minutes]``
+"""
+
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from app.data.candle_builder import CandleBuilder
+
+
+class ListCandleBuilder:
+    def __init__(self):
+        self.current = {}
+        self.history = defaultdict(list)
+
+    def process_tick(self, symbol: str, ltp: float, ts: datetime):
+        key = (symbol, ts.replace(second=0, microsecond=0))
+        if symbol not in self.current or self.current[symbol]["bucket"] != key[1]:
+            if symbol in self.current:
+                closed = self.current[symbol]
+                self.history[symbol].append({k: v for k, v in closed.items() if k != "bucket"})
+            self.current[symbol] = {
+                "bucket": key[1], "ts": key[1], "open": ltp, "high": ltp, "low": ltp, "close": ltp, "volume": 1,
+            }
+            return
+        candle = self.current[symbol]
+        candle["high"] = max(candle["high"], ltp)
+        candle["low"] = min(candle["low"], ltp)
+        candle["close"] = ltp
+        candle["volume"] += 1
+
+    def get_recent(self, symbol: str, limit: int = 50):
+        return self.history[symbol][-limit:]
+
+
+def run(builder, symbols: list[str], minutes: int, ticks_per_minute: int, read_closes) -> dict:
+    start = datetime(2026, 1, 5, 9, 15)
+    tracemalloc.start()
+    began = time.perf_counter()
+    for minute in range(minutes):
+        for second in range(ticks_per_minute):
+            ts = start + timedelta(minutes=minute, seconds=second * 60 // ticks_per_minute)
+            for i, symbol in enumerate(symbols):
+                builder.process_tick(symbol, 100.0 + i + second * 0.01, ts)
+    ingest = time.perf_counter() - began
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    reads = 20
+    began = time.perf_counter()
+    for _ in range(reads):
+        for symbol in symbols:
+            read_closes(builder.get_recent(symbol))
+    read = time.perf_counter() - began
+    ticks = minutes * ticks_per_minute * len(symbols)
+    return {
+        "ingest_us_per_tick": ingest / ticks * 1e6,
+        "read_us_per_call": read / (reads * len(symbols)) * 1e6,
+        "peak_mb": peak / 1e6,
+    }
+
+
+def main():
+    symbols_count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    minutes = int(sys.argv[2]) if len(sys.argv) > 2 else 120
+    symbols = [f"SYM{i}" for i in range(symbols_count)]
+    results = {
+        "list_of_dicts": run(ListCandleBuilder(), symbols, minutes, 4, lambda c: [x["close"] for x in c]),
+        "ring_buffer": run(CandleBuilder(), symbols, minutes, 4, lambda c: c.close),
+    }
+    print(f"{symbols_count} symbols x {minutes} minutes")
+    for name, result in results.items():
+        print(
+            f"{name:>14}: ingest {result['ingest_us_per_tick']:.2f} us/tick, "
+            f"read {result['read_us_per_call']:.2f} us/call, peak {result['peak_mb']:.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""End-to-end load test of the full app against SimulatedBroker.
+
+Run from the repo root: ``python -m benchmarks.bench_e2e [--symbols N] [--rate M] [--seconds S] ...``
+
+Boots the real app (feed -> CandleBuilder -> strategy evaluation -> RiskState ->
+ExecutionEngine -> DB writer) on a temporary SQLite file. It subscribes ``--symbols``
+symbols at ``--rate`` ticks/s each (``--burst`` x for the first ``--burst-seconds``),
+runs one algo per template over them, and reports throughput, p50/p99 of the hot-path
+histograms and RSS growth. ``--save`` writes the result as the baseline;
+otherwise a matching baseline is compared and the exit code is 1 on regression.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from app.core.clock import Clock
+from app.core.config import settings
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "e2e.json")
+LATENCIES = (
+    "tick_candle_seconds",
+    "risk_screen_seconds",
+    "trading_loop_cycle_seconds",
+    "tick_to_order_seconds",
+    "db_commit_seconds",
+    "event_loop_lag_seconds",
+    'feed_tick_lag_seconds{connection="0"}',
+)
+
+
+class MarketHoursClock(Clock):
+    """Wall clock shifted to 10:00 today, so a run never hits the square-off window."""
+
+    def __init__(self):
+        self.offset = datetime.now().replace(hour=10, minute=0, second=0, microsecond=0) - datetime.now()
+
+    def now(self) -> datetime:
+        return datetime.now() + self.offset
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as handle:
+            for line in handle:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def configure(args, directory: str):
+    settings.database_url = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+    settings.archive_dir = os.path.join(directory, "archive") if args.archive else None
+    settings.snapshot_path = os.path.join(directory, "state.json")
+    settings.broker_name = "simulated"
+    settings.sim_ticks_per_symbol = args.rate
+    settings.sim_burst_multiplier = args.burst
+    settings.sim_burst_seconds = args.burst_seconds
+    settings.sim_order_latency = args.order_latency
+    settings.sim_failure_rate = args.failure_rate
+    settings.sim_seed = 7
+    settings.telegram_token = None
+
+
+async def run(args) -> dict:
+    from app import main
+    from app.core.metrics import histogram, histograms_snapshot, reset_counters, reset_histograms
+    from app.models import AlgoConfig, StrategyTemplate
+
+    state = main.state
+    state.clock = MarketHoursClock()
+    state.risk.global_max_open_positions = 10_000
+    state.risk.global_max_daily_loss = 1e12
+    await main.on_startup()
+    symbols = [f"SIM{i}" for i in range(args.symbols)]
+    for i, symbol in enumerate(symbols):
+        state.market_data.add_stock(symbol, str(10_000 + i))
+    for template in StrategyTemplate:
+        state.algo_manager.add(AlgoConfig(
+            name=f"bench-{template.value}",
+            template=template,
+            watchlist=symbols,
+            stoploss_pct=0.5,
+            target_pct=0.5,
+            risk_per_trade=200,
+            max_trades_per_day=20,
+            max_daily_loss=1e9,
+            max_open_trades=10,
+            capital_per_trade=1e7,
+        ))
+    while state.market_data.warming:
+        await asyncio.sleep(0.05)
+
+    state.broker.open_session()
+    reset_histograms()
+    reset_counters()
+    accepted, rejected = state.risk.accepted, sum(state.risk.rejections.values())
+    rss = [rss_mb()]
+    began = time.perf_counter()
+    while time.perf_counter() - began < args.seconds:
+        await asyncio.sleep(1)
+        rss.append(rss_mb())
+    elapsed = time.perf_counter() - began
+
+    offered = args.symbols * args.rate * (elapsed + min(args.burst_seconds, elapsed) * (args.burst - 1))
+    ticks = histogram("tick_candle_seconds").count
+    latencies = histograms_snapshot()
+    decisions = state.risk.accepted - accepted + sum(state.risk.rejections.values()) - rejected
+    result = {
+        "config": {k: getattr(args, k) for k in ("symbols", "rate", "burst", "burst_seconds", "seconds", "order_latency", "failure_rate", "archive")},
+        "ticks_offered": round(offered),
+        "ticks": ticks,
+        "ticks_per_second": round(ticks / elapsed, 1),
+        "decisions_per_second": round(decisions / elapsed, 1),
+        "orders": histogram("order_entry_ack_seconds").count,
+        "trades": histogram("tick_to_order_seconds").count,
+        "broker_failures": state.broker.failures,
+        "latency": {name: {"p50": latencies[name]["p50"], "p99": latencies[name]["p99"]} for name in LATENCIES if name in latencies},
+        "missing_series": [name for name in LATENCIES if name not in latencies],
+        "rss_start_mb": round(rss[0], 1),
+        "rss_end_mb": round(rss[-1], 1),
+        "rss_growth_mb_per_min": round((rss[-1] - rss[0]) / elapsed * 60, 2),
+    }
+    await main.on_shutdown()
+    return result
+
+
+def compare(result: dict, baseline: dict, tolerance: float) -> list[str]:
+    if baseline.get("config") != result["config"]:
+        print("Baseline was recorded with a different config; not comparing")
+        return []
+    regressions = []
+    for key in ("ticks_per_second", "decisions_per_second"):
+        if result[key] < baseline[key] * (1 - tolerance):
+            regressions.append(f"{key}: {result[key]} < baseline {baseline[key]}")
+    for name in result["missing_series"]:
+        if name in baseline["latency"]:
+            regressions.append(f"{name}: series missing, baseline p99 {baseline['latency'][name]['p99']}")
+    for name, values in result["latency"].items():
+        before = baseline["latency"].get(name, {}).get("p99")
+        if before and values["p99"] > before * (1 + tolerance) and values["p99"] > 0.001:
+            regressions.append(f"{name} p99: {values['p99']} > baseline {before}")
+    if result["rss_growth_mb_per_min"] > max(baseline["rss_growth_mb_per_min"] * (1 + tolerance), 1.0):
+        regressions.append(f"rss growth: {result['rss_growth_mb_per_min']} MB/min > baseline {baseline['rss_growth_mb_per_min']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=200)
+    parser.add_argument("--rate", type=float, default=5.0, help="ticks per second per symbol")
+    parser.add_argument("--burst", type=float, default=10.0, help="rate multiplier during the opening burst")
+    parser.add_argument("--burst-seconds", type=float, default=5.0)
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--order-latency", type=float, default=0.02)
+    parser.add_argument("--failure-rate", type=float, default=0.01)
+    parser.add_argument("--archive", action="store_true", help="also record the tick archive")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--verbose", action="store_true", help="show the app's own log lines")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        configure(args, directory)
+        if not args.verbose:
+            logging.disable(logging.WARNING)
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(sys.stdout if args.verbose else devnull):
+            result = asyncio.run(run(args))
+    print(json.dumps(result, indent=2))
+
+    if args.save:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as handle:
+            json.dump(result, handle, indent=2)
+        print("Saved baseline to", args.baseline)
+        return
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as handle:
+            regressions = compare(result, json.load(handle), args.tolerance)
+        for line in regressions:
+            print("REGRESSION", line)
+        if regressions:
+            sys.exit(1)
+        print("No regressions against", args.baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Sustained ingestion rate of MarketDataManager: per-tick dicts vs compact batches.
+
+Run from the repo root: ``python -m benchmarks.bench_ingest [symbols] [ticks] [batch_size] [minutes]``
+
+Each mode replays the same stream (ticks spread evenly over ``minutes``, so candles
+close) through a fresh manager with the dispatcher and indicator subscribers attached.
+"""
+
+import random
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+from app.data.market_data import MarketDataManager
+from app.data.ticks import TickBatch
+from app.engine.dispatcher import EvaluationDispatcher
+
+
+def stream(symbols: int, ticks: int, minutes: int) -> list[tuple[str, float, float, float]]:
+    start = datetime(2026, 1, 5, 9, 15).timestamp()
+    step = minutes * 60 / ticks
+    names = [f"SYM{i}" for i in range(symbols)]
+    return [
+        (names[random.randrange(symbols)], start + i * step, round(random.uniform(100, 1000), 2), float(random.randint(1, 50)))
+        for i in range(ticks)
+    ]
+
+
+def manager() -> MarketDataManager:
+    market_data = MarketDataManager(None)
+    dispatcher = EvaluationDispatcher()
+    market_data.events.subscribe("tick", dispatcher.on_tick)
+    market_data.events.subscribe("tick_batch", dispatcher.on_tick_batch)
+    return market_data
+
+
+def per_tick(records, batch_size: int) -> float:
+    market_data = manager()
+    ticks = [
+        {"symbol": s, "token": "0", "ltp": p, "timestamp": datetime.fromtimestamp(ts).isoformat(), "volume": v}
+        for s, ts, p, v in records
+    ]
+    began = time.perf_counter()
+    for tick in ticks:
+        market_data.handle_tick(tick)
+    return time.perf_counter() - began
+
+
+def records_batched(records, batch_size: int) -> float:
+    market_data = manager()
+    began = time.perf_counter()
+    for i in range(0, len(records), batch_size):
+        market_data.handle_records(records[i:i + batch_size])
+    return time.perf_counter() - began
+
+
+def arrays_batched(records, batch_size: int) -> float:
+    market_data = manager()
+    intern = market_data.symbols.intern
+    ids = np.array([intern(s) for s, _, _, _ in records])
+    ts, ltp, volume = (np.array(column) for column in list(zip(*records))[1:])
+    began = time.perf_counter()
+    for i in range(0, len(records), batch_size):
+        window = slice(i, i + batch_size)
+        market_data.handle_batch(TickBatch(market_data.symbols, ids[window], ts[window], ltp[window], volume[window]))
+    return time.perf_counter() - began
+
+
+def main():
+    symbols = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    ticks = int(sys.argv[2]) if len(sys.argv) > 2 else 400_000
+    batch_size = int(sys.argv[3]) if len(sys.argv) > 3 else 5000
+    minutes = int(sys.argv[4]) if len(sys.argv) > 4 else 5
+    random.seed(7)
+    records = stream(symbols, ticks, minutes)
+    print(f"{symbols} symbols, {ticks} ticks over {minutes} min, batch {batch_size}")
+    for name, fn in (("per-tick dict", per_tick), ("batched records", records_batched), ("batched arrays", arrays_batched)):
+        elapsed = fn(records, batch_size)
+        print(f"{name:>16}: {ticks / elapsed:12,.0f} ticks/s  ({elapsed / ticks * 1e6:.2f} us/tick)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Restart-to-trading-ready time, restoring from the state snapshot.
+
+Run from the repo root: ``python -m benchmarks.bench_restart [--symbols N] [--algos M] [--trades T]``
+
+The first process boots the app on SimulatedBroker with a temporary SQLite file.
+It adds ``--symbols`` stocks and ``--algos`` algos (every third one paused) and
+records ``--trades`` trades today (half of them still open), then shuts down, which
+writes the final snapshot. A second, fresh process boots from the same DB and
+snapshot. It reports how long ``on_startup`` took until the trading loop was
+running (``ready_seconds``), how long until every symbol finished warming, and what
+was restored.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from app.core.config import settings
+
+
+def configure(directory: str):
+    settings.database_url = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+    settings.snapshot_path = os.path.join(directory, "state.json")
+    settings.archive_dir = None
+    settings.broker_name = "simulated"
+    settings.sim_seed = 7
+    settings.telegram_token = None
+
+
+async def seed(args) -> dict:
+    from app import main
+    from app.db.models import TradeLog
+    from app.models import AlgoConfig, StrategyTemplate
+
+    state = main.state
+    await main.on_startup()
+    symbols = [f"SIM{i}" for i in range(args.symbols)]
+    for i, symbol in enumerate(symbols):
+        state.market_data.add_stock(symbol, str(10_000 + i))
+    templates = list(StrategyTemplate)
+    for i in range(args.algos):
+        state.algo_manager.add(AlgoConfig(
+            name=f"algo-{i}",
+            template=templates[i % len(templates)],
+            watchlist=symbols[i::args.algos] or symbols[:1],
+            stoploss_pct=0.5,
+            target_pct=0.5,
+            risk_per_trade=200,
+            max_trades_per_day=20,
+            max_daily_loss=1e9,
+            max_open_trades=10,
+            capital_per_trade=1e7,
+        ))
+        if i % 3 == 2:
+            state.algo_manager.toggle(f"algo-{i}", True)
+
+    def insert(db):
+        now = datetime.utcnow()
+        for i in range(args.trades):
+            db.add(TradeLog(
+                algo_name=f"algo-{i % args.algos}", symbol=symbols[i % len(symbols)], side="BUY", quantity=1,
+                entry_price=100, stoploss_price=99, target_price=101, status="OPEN" if i % 2 else "TARGET_HIT",
+                pnl=1.0, created_at=now, updated_at=now,
+            ))
+        db.commit()
+
+    await state.db_writer.run(insert)
+    await main.on_shutdown()
+    return {"symbols": args.symbols, "algos": args.algos, "trades": args.trades}
+
+
+async def restore() -> dict:
+    began = time.perf_counter()
+    from app import main
+
+    state = main.state
+    imported = time.perf_counter() - began
+    await main.on_startup()
+    ready = time.perf_counter() - began
+    while state.market_data.warming:
+        await asyncio.sleep(0.01)
+    warmed = time.perf_counter() - began
+    result = {
+        "import_seconds": round(imported, 3),
+        "ready_seconds": state.snapshots.restored["ready_seconds"],
+        "process_ready_seconds": round(ready, 3),
+        "warmed_seconds": round(warmed, 3),
+        "restored": {
+            "stocks": len(state.market_data.subscriptions),
+            "algos": len(state.algo_manager.algos),
+            "paused": len(state.algo_manager.paused),
+            "open_positions": state.risk.open_positions,
+            "trades_today": sum(state.risk.trades_by_algo.values()),
+        },
+    }
+    await main.on_shutdown()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--algos", type=int, default=50)
+    parser.add_argument("--trades", type=int, default=200)
+    parser.add_argument("--restore-from", help=argparse.SUPPRESS)
+    parser.add_argument("--verbose", action="store_true", help="show the app's own log lines")
+    args = parser.parse_args()
+
+    if args.restore_from:
+        configure(args.restore_from)
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(sys.stdout if args.verbose else devnull):
+            result = asyncio.run(restore())
+        print(json.dumps(result))
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        configure(directory)
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(sys.stdout if args.verbose else devnull):
+            seeded = asyncio.run(seed(args))
+        snapshot_bytes = os.path.getsize(settings.snapshot_path)
+        command = [sys.executable, "-m", "benchmarks.bench_restart", "--restore-from", directory]
+        if args.verbose:
+            command.append("--verbose")
+        output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+    print(json.dumps({"seeded": seeded, "snapshot_bytes": snapshot_bytes, **result}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
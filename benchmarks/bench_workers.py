@@ -0,0 +1,108 @@
+"""Strategy evaluation throughput across worker processes reading a SharedMarket.
+
+Run from the repo root: ``python -m benchmarks.bench_workers [symbols] [seconds] [max_workers]``
+
+This process plays the feed: it seeds every symbol with a full bar window, then
+rewrites all prices in a tight loop while 1, 2, 4 ... workers evaluate their shards.
+Throughput is symbol evaluations per second summed over workers, so it only scales
+with the cores actually available (``os.cpu_count()`` is printed).
+"""
+
+import multiprocessing as mp
+import os
+import sys
+import time
+
+import numpy as np
+
+from app.data.candle_store import FIELDS
+from app.data.shared import SharedMarket
+from app.engine.cluster import run_strategy_worker
+from app.models import AlgoConfig, StrategyTemplate
+
+LOOKBACK = 64
+
+
+def algos(symbols: list[str]) -> list[AlgoConfig]:
+    return [
+        AlgoConfig(
+            name=f"bench-{template.value}",
+            template=template,
+            watchlist=symbols,
+            stoploss_pct=1,
+            target_pct=2,
+            risk_per_trade=500,
+            max_trades_per_day=20,
+            max_daily_loss=5000,
+            max_open_trades=5,
+            capital_per_trade=100000,
+        )
+        for template in StrategyTemplate
+    ]
+
+
+def run(symbols: int, seconds: float, workers: int) -> float:
+    rng = np.random.default_rng(7)
+    market = SharedMarket.create(symbols, LOOKBACK, workers)
+    for slot in range(symbols):
+        block = np.vstack([np.arange(LOOKBACK) * 60.0] + [rng.uniform(100, 110, LOOKBACK) for _ in FIELDS[1:]])
+        market.write_bars(slot, block, LOOKBACK)
+    context = mp.get_context("spawn")
+    controls = [context.Queue() for _ in range(workers)]
+    results = context.Queue()
+    processes = [
+        context.Process(target=run_strategy_worker, args=(index, market.spec, control, results, 0.0005), daemon=True)
+        for index, control in enumerate(controls)
+    ]
+    for process in processes:
+        process.start()
+    names = [f"SYM{i}" for i in range(symbols)]
+    for config in algos(names):
+        for control in controls:
+            control.put(("algo", config))
+    for slot, name in enumerate(names):
+        controls[slot % workers].put(("add", name, slot))
+
+    slots = np.arange(symbols)
+    stamps = np.zeros(symbols)
+    volume = np.ones(symbols)
+
+    def feed(duration: float):
+        ends = time.perf_counter() + duration
+        while time.perf_counter() < ends:
+            market.write_ticks(slots, stamps, rng.uniform(100, 110, symbols), volume)
+            while not results.empty():
+                results.get_nowait()
+            time.sleep(0.001)
+
+    feed(2.0)
+    before = market.worker_stats[:, 1].sum()
+    began = time.perf_counter()
+    feed(seconds)
+    evaluated = market.worker_stats[:, 1].sum() - before
+    rate = evaluated / (time.perf_counter() - began)
+
+    for control in controls:
+        control.put(("stop",))
+    for process in processes:
+        process.join(5)
+    market.close()
+    return rate
+
+
+def main():
+    symbols = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+    max_workers = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+    print(f"{symbols} symbols, 3 templates, {seconds:.0f}s per run, {os.cpu_count()} cpus")
+    baseline = None
+    workers = 1
+    while workers <= max_workers:
+        rate = run(symbols, seconds, workers)
+        baseline = baseline or rate
+        print(f"{workers:>2} workers: {rate:12,.0f} symbol evaluations/s  ({rate / baseline:.2f}x)")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
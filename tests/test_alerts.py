@@ -0,0 +1,111 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.services import alerts
+from app.services.alerts import AlertService
+
+
+class TelegramStandIn(ThreadingHTTPServer):
+    """Local HTTP server playing Telegram: answers each POST with the next scripted
+    ``(status, headers, body)`` (then 200 OK) and records the JSON it was sent."""
+
+    def __init__(self, responses: list[tuple[int, dict, bytes]]):
+        super().__init__(("127.0.0.1", 0), Handler)
+        self.responses = list(responses)
+        self.received: list[dict] = []
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.server.received.append(json.loads(self.rfile.read(int(self.headers["Content-Length"]))))
+        status, headers, body = self.server.responses.pop(0) if self.server.responses else (200, {}, b'{"ok": true}')
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def telegram():
+    servers = []
+
+    def serve(*responses):
+        server = TelegramStandIn(responses)
+        threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield serve
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _post(server: TelegramStandIn, text: str = "hello") -> bool:
+    async def run():
+        service = AlertService("token", "chat", base_url=server.url)
+        await service.start()
+        try:
+            return await service._post(text)
+        finally:
+            await service.stop()
+
+    return asyncio.run(run())
+
+
+def test_429_waits_for_telegram_retry_after_then_resends(telegram):
+    server = telegram((429, {}, b'{"ok": false, "parameters": {"retry_after": 0}}'))
+    assert _post(server)
+    assert [r["text"] for r in server.received] == ["hello", "hello"]
+
+
+def test_429_without_json_body_falls_back_to_retry_after_header(telegram):
+    server = telegram((429, {"Retry-After": "0", "Content-Type": "text/html"}, b"<html>Too Many Requests</html>"))
+    assert _post(server)
+    assert len(server.received) == 2
+
+
+def test_429_without_any_hint_waits_the_default(telegram, monkeypatch):
+    monkeypatch.setattr(alerts, "DEFAULT_RETRY_AFTER", 0.0)
+    server = telegram((429, {}, b""), (429, {}, b"[]"))
+    assert not _post(server)
+    assert len(server.received) == 2
+
+
+def test_server_error_fails_the_send(telegram):
+    server = telegram((500, {}, b"boom"))
+    assert not _post(server)
+    assert len(server.received) == 1
+
+
+def test_burst_is_coalesced_into_one_message(telegram):
+    server = telegram()
+
+    async def run():
+        service = AlertService("token", "chat", base_url=server.url, batch_window=0.05)
+        await service.start()
+        for i in range(3):
+            service.enqueue(f"alert {i}")
+        for _ in range(200):
+            if service.sent == 3:
+                break
+            await asyncio.sleep(0.01)
+        await service.stop()
+        return service.stats()
+
+    stats = asyncio.run(run())
+    assert (stats["sent"], stats["batches"], stats["failed"]) == (3, 1, 0)
+    assert server.received == [{"chat_id": "chat", "text": "alert 0\nalert 1\nalert 2"}]
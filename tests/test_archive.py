@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from app.backtest.data import load_archive
+from app.data.archive import ArchiveReader, ArchiveRecorder, _column_path
+from app.data.ticks import SymbolTable, TickBatch
+
+
+def _epoch(*args) -> float:
+    return datetime(*args).timestamp()
+
+
+def test_ticks_round_trip_across_flushes_and_midnight(tmp_path):
+    recorder = ArchiveRecorder(str(tmp_path))
+    recorder.record_tick({"symbol": "SBIN", "ltp": 100.0, "timestamp": datetime(2026, 1, 5, 23, 59, 58), "volume": 2})
+    assert recorder.flush() == 1
+    table = SymbolTable()
+    records = [
+        ("SBIN", _epoch(2026, 1, 5, 23, 59, 59), 101.0, 1.0),
+        ("INFY", _epoch(2026, 1, 5, 12, 0), 1500.0, 5.0),
+        ("SBIN", _epoch(2026, 1, 6, 0, 0, 1), 102.0, 3.0),
+    ]
+    recorder.record_batch(TickBatch.from_records(table, records))
+    assert recorder.flush() == 3
+    assert recorder.written == 4
+
+    reader = ArchiveReader(str(tmp_path))
+    assert reader.days() == ["2026-01-05", "2026-01-06"]
+    assert reader.symbols("2026-01-05") == ["INFY", "SBIN"]
+    day_one = reader.ticks("2026-01-05", "SBIN")
+    assert isinstance(day_one["ts"], np.memmap)
+    assert day_one["ltp"].tolist() == [100.0, 101.0]
+    assert day_one["volume"].tolist() == [2.0, 1.0]
+    assert reader.ticks("2026-01-06", "SBIN")["ltp"].tolist() == [102.0]
+
+
+def test_torn_write_is_read_up_to_the_shortest_column(tmp_path):
+    recorder = ArchiveRecorder(str(tmp_path))
+    for second in range(3):
+        recorder.record_tick({"symbol": "SBIN", "ltp": 100.0 + second, "timestamp": datetime(2026, 1, 5, 10, 0, second)})
+    recorder.flush()
+    with open(_column_path(str(tmp_path), "2026-01-05", "SBIN", "ticks", "ts"), "ab") as handle:
+        handle.write(np.float64(1.0).tobytes())
+    ticks = ArchiveReader(str(tmp_path)).ticks("2026-01-05", "SBIN")
+    assert [len(values) for values in ticks.values()] == [3, 3, 3]
+
+
+def test_recent_candles_span_days_oldest_first(tmp_path):
+    recorder = ArchiveRecorder(str(tmp_path))
+    start = datetime(2026, 1, 5, 15, 27)
+    for minute in range(6):
+        ts = start + timedelta(minutes=minute) if minute < 3 else datetime(2026, 1, 6, 9, 15 + minute)
+        candle = {"ts": ts, "open": minute, "high": minute + 1, "low": minute - 1, "close": minute + 0.5, "volume": 10}
+        recorder.record_candle({"symbol": "SBIN", "candle": candle})
+    recorder.flush()
+    reader = ArchiveReader(str(tmp_path))
+    candles = reader.recent_candles("SBIN", 4)
+    assert [c["close"] for c in candles] == [2.5, 3.5, 4.5, 5.5]
+    assert candles[0]["ts"] == datetime(2026, 1, 5, 15, 29)
+    assert len(reader.recent_candles("SBIN", 50)) == 6
+    assert reader.recent_candles("INFY", 5) == []
+
+
+def test_backtest_loads_the_archive_in_time_order(tmp_path):
+    recorder = ArchiveRecorder(str(tmp_path))
+    for second, symbol in enumerate(["SBIN", "INFY", "SBIN", "TCS"]):
+        recorder.record_tick({"symbol": symbol, "ltp": float(second), "timestamp": datetime(2026, 1, 5, 10, 0, second)})
+    recorder.flush()
+    arrays = load_archive(str(tmp_path))
+    assert [(symbol, ltp) for symbol, _, ltp, _ in arrays.iter_ticks()] == [
+        ("SBIN", 0.0), ("INFY", 1.0), ("SBIN", 2.0), ("TCS", 3.0)
+    ]
@@ -0,0 +1,103 @@
+import csv
+import json
+import random
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.backtest.__main__ import main
+from app.backtest.data import load_ohlcv, load_ticks
+from app.backtest.runner import Backtester
+from app.models import AlgoConfig, StrategyTemplate
+
+SYMBOLS = list("ABCDEF")
+
+
+def _ticks(days: int = 2, per_day: int = 6000, start: tuple = (9, 15)) -> list[tuple]:
+    rng = random.Random(7)
+    ticks = []
+    for day in range(days):
+        t = datetime(2026, 1, 5 + day, *start)
+        prices = dict.fromkeys(SYMBOLS, 100.0)
+        for i in range(per_day):
+            symbol = rng.choice(SYMBOLS)
+            prices[symbol] *= 1 + rng.gauss(0, 0.001)
+            ticks.append((symbol, t + timedelta(seconds=i), round(prices[symbol], 2), 1.0))
+    return ticks
+
+
+def _algos() -> list[AlgoConfig]:
+    return [
+        AlgoConfig(
+            name=template.value, template=template, stoploss_pct=0.5, target_pct=1, risk_per_trade=50,
+            max_trades_per_day=3, max_daily_loss=300, max_open_trades=1, capital_per_trade=20000, watchlist=SYMBOLS,
+        )
+        for template in StrategyTemplate
+    ]
+
+
+def _run(ticks, **kwargs):
+    return Backtester(_algos(), **kwargs).run(ticks)
+
+
+def test_replay_is_deterministic():
+    ticks = _ticks()
+    first, second = _run(ticks), _run(ticks)
+    assert first.trades == second.trades
+    assert first.pnl_by_algo == second.pnl_by_algo
+    assert first.trades
+
+
+def test_trades_respect_risk_limits_and_are_all_closed():
+    result = _run(_ticks(), global_max_open_positions=2)
+    per_day = Counter((t["algo_name"], t["created_at"].date()) for t in result.trades)
+    assert max(per_day.values()) <= 3
+    assert {t["status"] for t in result.trades} <= {"SL_HIT", "TARGET_HIT", "SQUARED_OFF"}
+    events = sorted([(t["created_at"], 1) for t in result.trades] + [(t["updated_at"], -1) for t in result.trades])
+    open_positions, peak = 0, 0
+    for _, change in events:
+        open_positions += change
+        peak = max(peak, open_positions)
+    assert peak <= 2
+    for algo, pnl in result.pnl_by_algo.items():
+        assert pnl == pytest.approx(sum(t["pnl"] for t in result.trades if t["algo_name"] == algo))
+
+
+def test_no_entries_in_the_square_off_window():
+    result = _run(_ticks(days=1, per_day=3000, start=(15, 0)))
+    assert result.trades
+    assert all(t["created_at"].time() < datetime(2026, 1, 5, 15, 15).time() for t in result.trades)
+    late = [t for t in result.trades if t["status"] == "SQUARED_OFF"]
+    assert all(t["exit_price"] is not None for t in late)
+
+
+def test_csv_loaders(tmp_path):
+    ticks = tmp_path / "ticks.csv"
+    ticks.write_text("symbol,timestamp,ltp,volume\nSBIN,2026-01-05T09:15:00,100.5,3\nSBIN,1767604560,101,\n")
+    assert list(load_ticks(str(ticks))) == [
+        ("SBIN", datetime(2026, 1, 5, 9, 15), 100.5, 3.0),
+        ("SBIN", datetime.fromtimestamp(1767604560), 101.0, 1.0),
+    ]
+    bars = tmp_path / "bars.csv"
+    bars.write_text("symbol,timestamp,open,high,low,close,volume\nSBIN,2026-01-05T09:15:00,100,102,99,101,40\n")
+    assert [(ts.second, price, volume) for _, ts, price, volume in load_ohlcv(str(bars))] == [
+        (0, 100.0, 10.0), (15, 99.0, 10.0), (30, 102.0, 10.0), (45, 101.0, 10.0),
+    ]
+
+
+def test_cli_writes_summary_and_trades(tmp_path, capsys):
+    data = tmp_path / "ticks.csv"
+    with open(data, "w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["symbol", "timestamp", "ltp"])
+        writer.writerows((s, ts.isoformat(), ltp) for s, ts, ltp, _ in _ticks(days=1, per_day=3000))
+    algos = tmp_path / "algos.json"
+    algos.write_text(json.dumps([a.model_dump(mode="json") for a in _algos()]))
+    trades = tmp_path / "trades.csv"
+    main([str(data), "--algos", str(algos), "--trades-out", str(trades)])
+    summary = json.loads(capsys.readouterr().out)
+    with open(trades, newline="") as handle:
+        rows = list(csv.DictReader(handle))
+    assert summary["ticks"] == 3000
+    assert summary["trades"] == len(rows) > 0
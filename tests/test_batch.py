@@ -0,0 +1,50 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.data.candle_builder import CandleBuilder
+from app.engine.batch import BatchEvaluator
+from app.engine.indicators import IndicatorEngine
+from app.engine.strategy import evaluate
+from app.models import AlgoConfig, StrategyTemplate
+
+SYMBOLS = [f"S{i}" for i in range(24)]
+
+
+def _algo(template: StrategyTemplate, timeframe: int = 1) -> AlgoConfig:
+    return AlgoConfig(
+        name=f"{template.value}-{timeframe}", template=template, stoploss_pct=1.5, target_pct=3, risk_per_trade=250,
+        max_trades_per_day=5, max_daily_loss=1000, max_open_trades=2, capital_per_trade=10000,
+        watchlist=SYMBOLS, timeframe=timeframe,
+    )
+
+
+@pytest.mark.parametrize("timeframe", [1, 3])
+def test_batch_decisions_match_per_symbol_evaluate(timeframe):
+    rng = random.Random(timeframe)
+    builder = CandleBuilder(history_size=100)
+    engine = IndicatorEngine(builder)
+    batch = BatchEvaluator(builder)
+    algos = [_algo(template, timeframe) for template in StrategyTemplate]
+    prices = {symbol: 100 + 10 * rng.random() for symbol in SYMBOLS}
+    start = datetime(2026, 1, 5, 9, 15)
+    compared = 0
+    for minute in range(90):
+        ltps = {}
+        # Symbols join over time, so rows with fewer bars than the windows are covered too.
+        for symbol in SYMBOLS[: 6 + minute // 4]:
+            for second in (5, 25, 45):
+                prices[symbol] = round(prices[symbol] * (1 + rng.gauss(0, 0.003)), 2)
+                ts = start + timedelta(minutes=minute, seconds=second)
+                closed = builder.process_tick(symbol, prices[symbol], ts, rng.randint(1, 500))
+                if closed:
+                    engine.on_candle_closed({"symbol": symbol, "candle": closed})
+            ltps[symbol] = prices[symbol]
+
+        expected = [evaluate(algo, symbol, engine, ltps[symbol]) for algo in algos for symbol in SYMBOLS if symbol in ltps]
+        expected = sorted((d.model_dump() for d in expected if d), key=lambda d: (d["algo_name"], d["symbol"]))
+        actual = sorted((d.model_dump() for d in batch.evaluate(algos, ltps)), key=lambda d: (d["algo_name"], d["symbol"]))
+        assert actual == expected
+        compared += len(expected)
+    assert compared
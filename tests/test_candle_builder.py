@@ -0,0 +1,83 @@
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.data.candle_builder import CandleBuilder
+from app.data.ticks import TickBatch
+
+SYMBOLS = ["SBIN", "INFY", "TCS", "RELIANCE", "HDFCBANK"]
+
+
+def _ticks(seed: int, minutes: int = 12) -> list[tuple]:
+    """Time-ordered ``(symbol, epoch, ltp, volume)`` ticks; some symbols skip minutes."""
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 5, 9, 15)
+    ticks = []
+    for second in range(0, minutes * 60, 7):
+        for symbol in rng.sample(SYMBOLS, rng.randint(0, len(SYMBOLS))):
+            ts = start + timedelta(seconds=second + rng.random() * 6)
+            ticks.append((symbol, ts.timestamp(), round(100 + rng.gauss(0, 2), 2), float(rng.randint(1, 50))))
+    return ticks
+
+
+def _chunks(ticks: list[tuple], seed: int) -> list[list[tuple]]:
+    rng = random.Random(seed)
+    chunks, index = [], 0
+    while index < len(ticks):
+        size = rng.choice((1, 3, 17, 64, 250))
+        chunks.append(ticks[index:index + size])
+        index += size
+    return chunks
+
+
+def _per_tick(builder: CandleBuilder, chunk: list[tuple]) -> list[tuple[str, dict]]:
+    closed = []
+    for symbol, epoch, ltp, volume in chunk:
+        candle = builder.process_tick(symbol, ltp, datetime.fromtimestamp(epoch), volume)
+        if candle:
+            closed.append((symbol, candle))
+    return closed
+
+
+def _batched(builder: CandleBuilder, chunk: list[tuple]) -> list[tuple[str, dict]]:
+    return builder.process_batch(TickBatch.from_records(builder.symbols, chunk))
+
+
+def _by_symbol(closed: list[tuple[str, dict]]) -> dict[str, list[dict]]:
+    grouped = {}
+    for symbol, candle in closed:
+        grouped.setdefault(symbol, []).append(candle)
+    return grouped
+
+
+def _flush(builder: CandleBuilder, closed: list[tuple[str, dict]]):
+    # One tick per symbol in a later minute closes every open candle through process_tick.
+    later = datetime(2026, 1, 6, 9, 15)
+    for symbol in SYMBOLS:
+        candle = builder.process_tick(symbol, 1.0, later)
+        if candle:
+            closed.append((symbol, candle))
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+@pytest.mark.parametrize("mode", ["batch", "mixed"])
+def test_process_batch_builds_the_same_candles_as_process_tick(seed, mode):
+    ticks = _ticks(seed)
+    reference, candidate = CandleBuilder(history_size=50), CandleBuilder(history_size=50)
+    expected, actual = [], []
+    for index, chunk in enumerate(_chunks(ticks, seed)):
+        expected += _per_tick(reference, chunk)
+        # "mixed" alternates paths so open candles are handed between tick and batch state.
+        feed = _per_tick if mode == "mixed" and index % 3 == 0 else _batched
+        actual += feed(candidate, chunk)
+    _flush(reference, expected)
+    _flush(candidate, actual)
+
+    assert _by_symbol(actual) == _by_symbol(expected)
+    for symbol in SYMBOLS:
+        assert candidate.history.count(symbol) == reference.history.count(symbol)
+        np.testing.assert_array_equal(
+            candidate.history.series[symbol].block(50), reference.history.series[symbol].block(50)
+        )
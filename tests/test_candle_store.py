@@ -0,0 +1,40 @@
+import numpy as np
+
+from app.data.candle_store import CandleSeries, CandleStore
+
+
+def _fill(series: CandleSeries, start: int, count: int):
+    for i in range(start, start + count):
+        series.append(60.0 * i, i, i, i, float(i), 1.0)
+
+
+def test_reading_an_unknown_symbol_allocates_nothing():
+    store = CandleStore(100)
+    assert store.get("SBIN") is None
+    assert len(store.window("SBIN", 50)) == 0
+    assert store.count("SBIN") == 0
+    assert store.series == {} and store.nbytes() == 0
+    store.create("SBIN").append(0.0, 1, 1, 1, 1, 1)
+    assert store.get("SBIN") is store.create("SBIN")
+    assert store.window("SBIN", 50).close.tolist() == [1.0]
+
+
+def test_window_views_stay_valid_for_capacity_minus_length_appends():
+    series = CandleSeries(8)
+    _fill(series, 0, 11)
+    view = series.window(3)
+    expected = view.close.copy()
+    _fill(series, 11, 5)
+    np.testing.assert_array_equal(view.close, expected)
+    _fill(series, 16, 1)
+    assert view.close.tolist() != expected.tolist()
+
+
+def test_full_capacity_view_is_overwritten_by_the_next_append():
+    series = CandleSeries(8)
+    _fill(series, 0, 8)
+    view = series.window(8)
+    assert view.close.tolist() == [float(i) for i in range(8)]
+    _fill(series, 8, 1)
+    assert view.close.tolist() != [float(i) for i in range(8)]
+    assert series.window(8).close.tolist() == [float(i) for i in range(1, 9)]
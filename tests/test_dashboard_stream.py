@@ -0,0 +1,71 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from app.core.events import EventBus
+from app.engine.positions import Position
+from app.models import CapitalSnapshot
+from app.services.dashboard_stream import DashboardStream
+
+
+class Capital:
+    async def snapshot(self) -> CapitalSnapshot:
+        return CapitalSnapshot(available_balance=1e5, used_margin=0, free_margin=1e5, today_pnl=0, trading_enabled=True)
+
+
+class Writer:
+    def __init__(self, rows: list[dict]):
+        self.rows = rows
+        self.loads = 0
+
+    async def run(self, fn, *args):
+        self.loads += 1
+        return [dict(row) for row in self.rows]
+
+
+def _stream():
+    events = EventBus()
+    market_data = SimpleNamespace(subscriptions={}, latest_ticks={})
+    algo_manager = SimpleNamespace(list=lambda: [])
+    writer = Writer([{"id": 1, "symbol": "SBIN", "status": "OPEN", "pnl": 0.0}])
+    positions = SimpleNamespace(by_id={1: Position(1, "algo", "SBIN", 10, 100.0, 99.0, 102.0, 100.0)})
+    stream = DashboardStream(events, market_data, algo_manager, Capital(), writer, 0.01, positions)
+    return events, writer, positions, stream
+
+
+def _message(client) -> dict:
+    return json.loads(client.take().decode()[len("data: "):])
+
+
+def test_marks_come_from_the_book_without_reloading_trades():
+    async def run():
+        events, writer, positions, stream = _stream()
+        client = await stream.connect()
+        client.take()
+        for ltp in (100.5, 101.0, 101.5):
+            position = positions.by_id[1]
+            position.ltp, position.unrealized = ltp, (ltp - 100.0) * 10
+            events.publish("position", {"marked": [1]})
+            await stream.publish_once()
+        return writer, stream, _message(client)
+
+    writer, stream, message = asyncio.run(run())
+    assert writer.loads == 1
+    assert message == {"marks": {"1": {"ltp": 101.5, "pnl": 15.0}}}
+    assert stream.current["positions"][0]["pnl"] == 15.0
+
+
+def test_open_and_close_reload_the_trade_list():
+    async def run():
+        events, writer, positions, stream = _stream()
+        client = await stream.connect()
+        client.take()
+        writer.rows = [{"id": 1, "symbol": "SBIN", "status": "TARGET_HIT", "pnl": 20.0}]
+        del positions.by_id[1]
+        events.publish("position", {"trade_id": 1, "status": "TARGET_HIT", "pnl": 20.0})
+        await stream.publish_once()
+        return writer, _message(client)
+
+    writer, message = asyncio.run(run())
+    assert writer.loads == 2
+    assert message["positions"][0]["status"] == "TARGET_HIT"
@@ -0,0 +1,58 @@
+import asyncio
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.database import Base
+from app.db.models import SystemEvent
+from app.db.writer import DBWriter, InlineDBWriter
+
+
+def _sessions() -> sessionmaker:
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine, expire_on_commit=False)
+
+
+def _count(db) -> int:
+    return db.query(SystemEvent).count()
+
+
+def _boom(db):
+    raise ValueError("bad call")
+
+
+def test_bad_row_only_drops_itself(caplog):
+    writer = DBWriter(_sessions())
+    for i in range(10):
+        level = None if i == 4 else "INFO"
+        writer.add(SystemEvent(level=level, event_type="TEST", message=str(i)))
+    writer.submit(_boom)
+    writer.start()
+
+    async def count():
+        return await writer.run(_count)
+
+    assert asyncio.run(count()) == 9
+    writer.stop()
+    assert writer.failures == {"row": 1, "call": 1}
+    assert "bad call" in caplog.text
+    assert "retrying row by row" in caplog.text
+
+
+def test_inline_writer_counts_failed_submit():
+    writer = InlineDBWriter(_sessions())
+    writer.submit(_boom)
+    writer.add(SystemEvent(level="INFO", event_type="TEST", message="ok"))
+    assert writer.failures == {"row": 0, "call": 1}
+    assert _count(writer.session) == 1
+
+
+def test_failures_are_exported_as_counters():
+    from app.core.metrics import counters_snapshot, render_prometheus
+
+    before = counters_snapshot()['db_write_failures_total{kind="call"}']
+    InlineDBWriter(_sessions()).submit(_boom)
+    assert counters_snapshot()['db_write_failures_total{kind="call"}'] == before + 1
+    assert "# TYPE db_write_failures_total counter" in render_prometheus()
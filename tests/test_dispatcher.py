@@ -0,0 +1,84 @@
+import asyncio
+
+from app.engine.dispatcher import EvaluationDispatcher
+from app.engine.risk import RiskState
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def wired(clock: FakeClock) -> tuple[EvaluationDispatcher, RiskState]:
+    risk = RiskState()
+
+    def on_pressure(pressured: bool):
+        if pressured:
+            risk.halt("backpressure", "lagging")
+        else:
+            risk.resume("backpressure")
+
+    dispatcher = EvaluationDispatcher(capacity=1000, high_lag=1.0, low_lag=0.25, on_pressure=on_pressure, clock=clock)
+    return dispatcher, risk
+
+
+def burst(dispatcher: EvaluationDispatcher, clock: FakeClock, symbols: list[str]):
+    for symbol in symbols:
+        dispatcher.on_tick({"symbol": symbol})
+        clock.now += 0.0001
+
+
+def test_full_universe_burst_keeps_trading():
+    clock = FakeClock()
+    dispatcher, risk = wired(clock)
+    symbols = [f"SYM{i}" for i in range(450)]
+    evaluated = 0
+    for _ in range(5):
+        burst(dispatcher, clock, symbols)
+        pending = asyncio.run(dispatcher.wait(timeout=0))
+        if pending and not risk.halts:
+            evaluated += 1
+        clock.now += 1.0
+    assert evaluated == 5
+    assert not dispatcher.pressured
+    assert dispatcher.max_depth == 450
+
+
+def test_stalled_consumer_halts_then_resumes():
+    clock = FakeClock()
+    dispatcher, risk = wired(clock)
+    symbols = [f"SYM{i}" for i in range(450)]
+    burst(dispatcher, clock, symbols)
+    clock.now += 1.5
+    burst(dispatcher, clock, symbols)
+    assert "backpressure" in risk.halts
+
+    asyncio.run(dispatcher.wait(timeout=0))
+    assert "backpressure" in risk.halts
+    burst(dispatcher, clock, symbols)
+    asyncio.run(dispatcher.wait(timeout=0))
+    assert "backpressure" not in risk.halts
+    assert dispatcher.stats()["max_lag_seconds"] >= 1.5
+
+
+def test_explicit_zero_lag_thresholds_are_kept():
+    clock = FakeClock()
+    dispatcher = EvaluationDispatcher(capacity=10, high_lag=0, low_lag=0, clock=clock)
+    assert (dispatcher.high_lag, dispatcher.low_lag) == (0, 0)
+    dispatcher.on_tick({"symbol": "SBIN"})
+    assert dispatcher.pressured
+
+
+def test_backpressure_halt_is_the_risk_engine_halted_reason():
+    from app.engine.risk import RiskEngine
+
+    clock = FakeClock()
+    dispatcher, risk = wired(clock)
+    assert isinstance(risk, RiskEngine)
+    burst(dispatcher, clock, ["SBIN"])
+    clock.now += 1.5
+    burst(dispatcher, clock, ["INFY"])
+    assert risk.halted_reason == "lagging"
@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.database import Base
+from app.db.writer import InlineDBWriter
+from app.engine.execution import EntryLeftOpen, ExecutionEngine
+from app.engine.orders import OrderStage
+from app.models import TradeDecision
+
+
+async def _no_alert(message: str):
+    return None
+
+
+class Broker:
+    def __init__(self, sl_ok: bool = True, exit_ok: bool = True):
+        self.sl_ok = sl_ok
+        self.exit_ok = exit_ok
+        self.exits = 0
+
+    async def place_limit_order(self, payload: dict) -> dict:
+        return {"status": "success", "order_id": "E1"}
+
+    async def place_stoploss_order(self, payload: dict) -> dict:
+        return {"status": "success" if self.sl_ok else "rejected", "order_id": "S1"}
+
+    async def exit_position(self, payload: dict) -> dict:
+        self.exits += 1
+        return {"status": "success" if self.exit_ok else "rejected"}
+
+
+def _engine(broker: Broker) -> ExecutionEngine:
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    writer = InlineDBWriter(sessionmaker(bind=engine, expire_on_commit=False))
+    return ExecutionEngine(broker, writer, notify=_no_alert)
+
+
+def _decision() -> TradeDecision:
+    return TradeDecision(
+        algo_name="algo", symbol="SBIN", side="BUY", quantity=1, ltp=100.0,
+        stoploss_price=99.0, target_price=102.0, reason="test",
+    )
+
+
+def test_failed_stoploss_flattens_the_entry():
+    broker = Broker(sl_ok=False)
+    engine = _engine(broker)
+    with pytest.raises(RuntimeError) as raised:
+        asyncio.run(engine.execute_trade(_decision()))
+    assert not isinstance(raised.value, EntryLeftOpen)
+    assert broker.exits == 1
+    assert engine.orders.stats()["unprotected"] == []
+
+
+def test_failed_flatten_leaves_entry_open():
+    engine = _engine(Broker(sl_ok=False, exit_ok=False))
+    with pytest.raises(EntryLeftOpen) as raised:
+        asyncio.run(engine.execute_trade(_decision()))
+    assert raised.value.order.order_id == "E1"
+    assert raised.value.order.stage is OrderStage.FAILED
+    assert engine.orders.stats()["unprotected"][0]["order_id"] == "E1"
+
+
+def test_unrecorded_entry_leaves_entry_open():
+    engine = _engine(Broker())
+
+    async def broken(fn, *args):
+        raise OSError("disk full")
+
+    engine.writer.run = broken
+    with pytest.raises(EntryLeftOpen) as raised:
+        asyncio.run(engine.execute_trade(_decision()))
+    assert raised.value.order.stage is OrderStage.SL_ACKED
+
+
+@pytest.mark.parametrize(
+    "error, released, outcome", [(RuntimeError("rejected"), True, "failed"), (EntryLeftOpen("open", None), False, "left_open")]
+)
+def test_order_done_releases_only_entries_that_are_not_live(error, released, outcome):
+    from app.main import _on_order_done, entry_orders, state
+
+    async def failing():
+        raise error
+
+    async def run():
+        task = asyncio.create_task(failing())
+        await asyncio.gather(task, return_exceptions=True)
+        return task
+
+    task = asyncio.run(run())
+    decision = _decision()
+    state.risk.reserve(decision.algo_name)
+    before, counted = state.risk.open_positions, entry_orders[outcome].value
+    _on_order_done(decision, task)
+    assert state.risk.open_positions == (before - 1 if released else before)
+    assert entry_orders[outcome].value == counted + 1
+    if not released:
+        state.risk.release(decision.algo_name)
@@ -0,0 +1,58 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from app.backtest.runner import Backtester
+from app.db.models import TradeLog
+from app.engine.positions import PositionManager
+from app.engine.risk import RiskState
+
+
+async def _no_alert(message: str):
+    return None
+
+
+def _trade(bt: Backtester) -> TradeLog:
+    now = datetime(2026, 1, 5, 10, 0)
+    trade = TradeLog(
+        algo_name="algo", symbol="SBIN", side="BUY", quantity=10, entry_price=100.0, stoploss_price=99.0,
+        target_price=102.0, status="OPEN", pnl=0.0, created_at=now, updated_at=now,
+    )
+    bt.db.add(trade)
+    bt.db.commit()
+    return trade
+
+
+async def _backtest_exit(ltp: float) -> tuple:
+    bt = Backtester([])
+    trade = _trade(bt)
+    await bt.broker.place_limit_order({"symbol": trade.symbol, "qty": trade.quantity, "price": trade.entry_price})
+    bt.open_trades[trade.symbol].append(trade)
+    await bt._check_exits(trade.symbol, ltp)
+    return trade.exit_price, trade.status, trade.pnl
+
+
+async def _live_exit(ltp: float) -> tuple:
+    bt = Backtester([])
+    trade = _trade(bt)
+    await bt.broker.place_limit_order({"symbol": trade.symbol, "qty": trade.quantity, "price": trade.entry_price})
+    positions = PositionManager(bt.broker, bt.db_writer, RiskState(), notify=_no_alert)
+    positions.open(trade)
+    positions.on_tick({"symbol": trade.symbol, "ltp": ltp})
+    await asyncio.gather(*positions._exits)
+    bt.db.refresh(trade)
+    return trade.exit_price, trade.status, trade.pnl
+
+
+@pytest.mark.parametrize("ltp", [99.0, 97.5, 102.0, 104.0, 100.5])
+def test_backtest_exits_match_live_positions(ltp):
+    assert asyncio.run(_backtest_exit(ltp)) == asyncio.run(_live_exit(ltp))
+
+
+def test_stoploss_touch_fills_at_stop_price():
+    assert asyncio.run(_backtest_exit(99.0)) == (99.0, "SL_HIT", -10.0)
+
+
+def test_stoploss_gap_fills_at_tick_price():
+    assert asyncio.run(_backtest_exit(97.5)) == (97.5, "SL_HIT", -25.0)
@@ -0,0 +1,122 @@
+import asyncio
+import time
+from datetime import datetime
+
+from app.brokers.base import FeedConnection
+from app.data.feed import FeedManager
+
+
+class Connection(FeedConnection):
+    def __init__(self, log: list):
+        self.log = log
+
+    async def subscribe(self, items: list[dict]) -> None:
+        self.log.append(("subscribe", [(i["symbol"], i["token"]) for i in items]))
+
+    async def unsubscribe(self, symbols: list[str]) -> None:
+        self.log.append(("unsubscribe", symbols))
+
+    async def run(self) -> None:
+        await asyncio.Event().wait()
+
+    async def close(self) -> None:
+        return None
+
+
+class Broker:
+    max_instruments_per_connection = 2
+
+    def __init__(self):
+        self.log: list = []
+
+    def open_feed(self, on_tick) -> Connection:
+        return Connection(self.log)
+
+
+async def _manager() -> FeedManager:
+    manager = FeedManager(Broker(), on_tick=lambda tick: None)
+    await manager.add("SBIN", "3045")
+    await asyncio.sleep(0)
+    return manager
+
+
+def test_adding_a_symbol_twice_keeps_one_subscription():
+    async def run():
+        manager = await _manager()
+        await manager.add("SBIN", "3045")
+        await manager.sync({"SBIN": "3045"})
+        await manager.close()
+        return manager
+
+    manager = asyncio.run(run())
+    assert list(manager.assigned) == ["SBIN"]
+    assert [len(shard.tokens) for shard in manager.shards] == [1]
+    subscribed = [item for kind, items in manager.broker.log if kind == "subscribe" for item in items]
+    assert subscribed == [("SBIN", "3045")]
+
+
+def test_adding_a_symbol_with_a_new_token_moves_it():
+    async def run():
+        manager = await _manager()
+        await manager.add("SBIN", "9999")
+        await manager.close()
+        return manager
+
+    manager = asyncio.run(run())
+    assert manager.assigned["SBIN"].tokens == {"SBIN": "9999"}
+    assert sum(len(shard.tokens) for shard in manager.shards) == 1
+    assert manager.broker.log[-2:] == [("unsubscribe", ["SBIN"]), ("subscribe", [("SBIN", "9999")])]
+
+
+class ClosingConnection(Connection):
+    async def close(self) -> None:
+        self.log.append(("close", None))
+
+
+class ClosingBroker(Broker):
+    def open_feed(self, on_tick) -> ClosingConnection:
+        return ClosingConnection(self.log)
+
+
+def test_emptied_connection_is_closed_and_its_index_reused():
+    async def run():
+        manager = FeedManager(ClosingBroker(), on_tick=lambda tick: None)
+        await manager.sync({"SBIN": "1", "INFY": "2", "TCS": "3"})
+        await asyncio.sleep(0)
+        assert [shard.index for shard in manager.shards] == [0, 1]
+        await manager.sync({"TCS": "3"})
+        assert [shard.index for shard in manager.shards] == [1]
+        assert ("close", None) in manager.broker.log
+        await manager.sync({"TCS": "3", "WIPRO": "4", "ITC": "5"})
+        indexes = [shard.index for shard in manager.shards]
+        await manager.close()
+        return indexes
+
+    assert asyncio.run(run()) == [0, 1]
+
+
+def test_naive_utc_timestamps_are_read_as_utc(monkeypatch):
+    class UtcConnection(Connection):
+        utc_timestamps = True
+
+    class UtcBroker(Broker):
+        def open_feed(self, on_tick) -> UtcConnection:
+            return UtcConnection(self.log)
+
+    async def run():
+        manager = FeedManager(UtcBroker(), on_tick=lambda tick: None)
+        await manager.add("SBIN", "3045")
+        shard = manager.shards[0]
+        before = shard.lag.sum
+        manager._receive(shard, {"symbol": "SBIN", "ltp": 1.0, "timestamp": datetime.utcnow().isoformat()})
+        await manager.close()
+        return shard.lag.sum - before
+
+    # Off UTC, reading the timestamp as local time would add hours of lag.
+    monkeypatch.setenv("TZ", "Asia/Kolkata")
+    time.tzset()
+    try:
+        assert asyncio.run(run()) < 1.0
+    finally:
+        monkeypatch.undo()
+        time.tzset()
@@ -0,0 +1,72 @@
+import random
+from statistics import mean
+
+import pytest
+
+from app.data.candle_builder import CandleBuilder
+from app.engine.indicators import IndicatorEngine
+from app.engine.strategy import EMA_FAST, EMA_SLOW, evaluate
+from app.models import AlgoConfig, StrategyTemplate
+
+
+def ema(values: list[float], period: int) -> float:
+    """The list-based EMA the strategy used before the incremental engine."""
+    if not values:
+        return 0
+    k = 2 / (period + 1)
+    result = values[0]
+    for value in values[1:]:
+        result = value * k + result * (1 - k)
+    return result
+
+
+def _bars(count: int, seed: int = 3) -> list[tuple]:
+    rng = random.Random(seed)
+    price, bars = 100.0, []
+    for i in range(count):
+        close = round(price * (1 + rng.gauss(0, 0.004)), 2)
+        high, low = max(price, close) + rng.random() / 10, min(price, close) - rng.random() / 10
+        bars.append((60.0 * i, price, high, low, close, float(rng.randint(1, 1000))))
+        price = close
+    return bars
+
+
+def _close(builder: CandleBuilder, engine: IndicatorEngine, bar: tuple):
+    builder.history.create("SBIN").append(*bar)
+    candle = dict(zip(("ts", "open", "high", "low", "close", "volume"), bar))
+    engine.on_candle_closed({"symbol": "SBIN", "candle": candle})
+
+
+@pytest.mark.parametrize("seeded", [0, 3, 30])
+def test_incremental_indicators_match_list_functions(seeded):
+    builder = CandleBuilder(history_size=100)
+    engine = IndicatorEngine(builder)
+    bars = _bars(150)
+    for bar in bars[:seeded]:
+        builder.history.create("SBIN").append(*bar)
+    for index in range(seeded, len(bars)):
+        _close(builder, engine, bars[index])
+        seen = bars[max(0, index + 1 - builder.history.capacity):index + 1]
+        closes = [bar[4] for bar in seen]
+        assert engine.get("SBIN", "ema", *EMA_FAST).value == ema(closes[-EMA_FAST[1]:], EMA_FAST[0])
+        assert engine.get("SBIN", "ema", *EMA_SLOW).value == ema(closes[-EMA_SLOW[1]:], EMA_SLOW[0])
+        assert engine.get("SBIN", "max", 5).value == max(closes[-5:])
+        assert engine.get("SBIN", "sma", 10).value == pytest.approx(mean(closes[-10:]))
+        window = seen[-10:]
+        vwap = sum((b[2] + b[3] + b[4]) / 3 * b[5] for b in window) / sum(b[5] for b in window)
+        assert engine.get("SBIN", "vwap", 10).value == pytest.approx(vwap)
+
+
+def test_ema_crossover_takes_the_same_trades_as_the_list_rule():
+    algo = AlgoConfig(
+        name="ema", template=StrategyTemplate.ema_crossover, stoploss_pct=1, target_pct=2, risk_per_trade=100,
+        max_trades_per_day=5, max_daily_loss=1000, max_open_trades=2, capital_per_trade=10000,
+    )
+    builder = CandleBuilder(history_size=100)
+    engine = IndicatorEngine(builder)
+    closes = []
+    for bar in _bars(200, seed=11):
+        _close(builder, engine, bar)
+        closes.append(bar[4])
+        expected = len(closes) >= 5 and ema(closes[-9:], 5) > ema(closes[-21:], 10)
+        assert bool(evaluate(algo, "SBIN", engine, bar[4])) == expected
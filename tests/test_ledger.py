@@ -0,0 +1,102 @@
+import asyncio
+from datetime import date, datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.clock import SimulatedClock
+from app.db.database import Base
+from app.db.models import DailyLedger, TradeLog
+from app.db.writer import InlineDBWriter
+from app.services.ledger import CapitalTracker, _load_today
+
+
+def test_load_today_ignores_unrealized_marks_of_open_trades():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    now = datetime(2026, 1, 5, 10, 0)
+    for status, pnl in (("OPEN", -50.0), ("SL_HIT", -30.0), ("TARGET_HIT", 80.0)):
+        db.add(TradeLog(
+            algo_name="algo", symbol="SBIN", side="BUY", quantity=1, entry_price=100, stoploss_price=99,
+            target_price=101, status=status, pnl=pnl, created_at=now, updated_at=now,
+        ))
+    db.commit()
+    pnl, enabled = _load_today(db, date(2026, 1, 5), datetime(2026, 1, 5), 100_000)
+    assert pnl == 50.0
+    assert enabled
+
+
+class Broker:
+    def __init__(self):
+        self.fetches = 0
+
+    async def fetch_balance(self) -> dict:
+        self.fetches += 1
+        return {"available_balance": 100_000.0, "used_margin": 1000.0 * self.fetches, "free_margin": 99_000.0}
+
+
+class CountingWriter(InlineDBWriter):
+    def __init__(self, session_factory):
+        super().__init__(session_factory)
+        self.calls: list[str] = []
+
+    def submit(self, fn, *args):
+        self.calls.append(fn.__name__)
+        super().submit(fn, *args)
+
+    async def run(self, fn, *args):
+        self.calls.append(fn.__name__)
+        return await super().run(fn, *args)
+
+
+def _tracker(ttl: float = 60.0) -> tuple[CapitalTracker, Broker, CountingWriter, SimulatedClock]:
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    writer = CountingWriter(sessionmaker(bind=engine, expire_on_commit=False))
+    clock = SimulatedClock(datetime(2026, 1, 5, 10, 0))
+    broker = Broker()
+    return CapitalTracker(broker, writer, clock, balance_ttl=ttl), broker, writer, clock
+
+
+def test_snapshots_reuse_cached_state_and_persist_only_changes():
+    tracker, broker, writer, _ = _tracker()
+
+    async def run():
+        await tracker.load()
+        first = await tracker.snapshot()
+        second = await tracker.snapshot()
+        tracker.on_trade_closed(-120.0)
+        closed = await tracker.snapshot()
+        tracker.on_trade_opened()
+        opened = await tracker.snapshot()
+        return first, second, closed, opened
+
+    first, second, closed, opened = asyncio.run(run())
+    assert first == second and first.today_pnl == 0.0
+    assert (closed.today_pnl, closed.used_margin) == (-120.0, 2000.0)
+    assert opened.used_margin == 3000.0
+    assert broker.fetches == 3
+    assert writer.calls == ["_load_today", "_persist", "_persist", "_persist"]
+    ledger = writer.session.query(DailyLedger).one()
+    assert (ledger.pnl, ledger.used_margin) == (-120.0, 3000.0)
+
+
+def test_new_day_reloads_pnl_from_the_trade_log():
+    tracker, _, writer, clock = _tracker()
+
+    async def run():
+        await tracker.load()
+        tracker.on_trade_closed(75.0)
+        before = await tracker.snapshot()
+        clock.set(datetime(2026, 1, 6, 9, 15))
+        after = await tracker.snapshot()
+        return before, after
+
+    before, after = asyncio.run(run())
+    assert before.today_pnl == 75.0
+    assert after.today_pnl == 0.0
+    assert tracker.today == date(2026, 1, 6)
+    assert writer.calls.count("_load_today") == 2
+    assert writer.session.query(DailyLedger).count() == 2
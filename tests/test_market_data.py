@@ -0,0 +1,135 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from app.core.events import EventBus
+from app.data.archive import ArchiveReader, ArchiveRecorder
+from app.data.market_data import MarketDataManager
+from app.engine.algo_manager import AlgoManager
+from app.engine.dispatcher import EvaluationDispatcher
+from app.models import AlgoConfig, StrategyTemplate
+
+
+def _algo(name: str, watchlist: list[str]) -> AlgoConfig:
+    return AlgoConfig(
+        name=name, template=StrategyTemplate.breakout, stoploss_pct=1, target_pct=2, risk_per_trade=100,
+        max_trades_per_day=3, max_daily_loss=500, max_open_trades=2, capital_per_trade=10000, watchlist=watchlist,
+    )
+
+
+def test_active_for_follows_watchlist_edits_and_pauses():
+    manager = AlgoManager()
+    manager.add(_algo("a", ["SBIN", "INFY"]))
+    manager.add(_algo("b", ["SBIN"]))
+    assert sorted(a.name for a in manager.active_for("SBIN")) == ["a", "b"]
+    manager.add(_algo("a", ["TCS"]))
+    assert [a.name for a in manager.active_for("SBIN")] == ["b"]
+    assert manager.active_for("INFY") == []
+    assert [a.name for a in manager.active_for("TCS")] == ["a"]
+    manager.toggle("b", True)
+    assert manager.active_for("SBIN") == []
+
+
+def test_ticks_wake_the_dispatcher_with_only_the_ticked_symbols():
+    events = EventBus()
+    market_data = MarketDataManager(object(), events)
+    dispatcher = EvaluationDispatcher(capacity=100, high_lag=60, low_lag=30)
+    events.subscribe("tick", dispatcher.on_tick)
+    closed = []
+    events.subscribe("candle_closed", closed.append)
+
+    async def run():
+        waiting = asyncio.create_task(dispatcher.wait(timeout=5))
+        await asyncio.sleep(0)
+        market_data.handle_tick({"symbol": "SBIN", "ltp": 100.0, "timestamp": datetime(2026, 1, 5, 10, 0, 5)})
+        market_data.handle_tick({"symbol": "SBIN", "ltp": 101.0, "timestamp": datetime(2026, 1, 5, 10, 0, 30)})
+        first = await asyncio.wait_for(waiting, 1)
+        market_data.handle_tick({"symbol": "INFY", "ltp": 1500.0, "timestamp": datetime(2026, 1, 5, 10, 0, 40)})
+        market_data.handle_tick({"symbol": "SBIN", "ltp": 99.0, "timestamp": datetime(2026, 1, 5, 10, 1, 2)})
+        second = await asyncio.wait_for(dispatcher.wait(timeout=5), 1)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert list(first) == ["SBIN"]
+    assert sorted(second) == ["INFY", "SBIN"]
+    assert dispatcher.conflated == 1
+    assert [(e["symbol"], e["candle"]["open"], e["candle"]["close"]) for e in closed] == [("SBIN", 100.0, 101.0)]
+    assert market_data.latest_ticks["SBIN"]["ltp"] == 99.0
+
+
+class HistoryBroker:
+    def __init__(self, candles: dict[str, list[dict]], failing: bool = False):
+        self.candles = candles
+        self.failing = failing
+        self.calls: list[tuple[str, int]] = []
+
+    async def fetch_historical_candles(self, symbol: str, token: str, limit: int) -> list[dict]:
+        self.calls.append((symbol, limit))
+        if self.failing:
+            raise ConnectionError("history unavailable")
+        return self.candles.get(symbol, [])[-limit:]
+
+
+def _bars(start: datetime, count: int, first_close: float = 100.0) -> list[dict]:
+    return [
+        {"ts": start + timedelta(minutes=i), "open": first_close + i, "high": first_close + i + 1,
+         "low": first_close + i - 1, "close": first_close + i + 0.5, "volume": 10.0}
+        for i in range(count)
+    ]
+
+
+def test_backfill_seeds_history_ahead_of_live_bars():
+    start = datetime(2026, 1, 5, 9, 15)
+    broker = HistoryBroker({"SBIN": _bars(start, 30)})
+    events = EventBus()
+    market_data = MarketDataManager(broker, events)
+    market_data.subscriptions["SBIN"] = "3045"
+    seeded = []
+    events.subscribe("history_seeded", seeded.append)
+    # Live bars from 09:40 overlap the last five historical minutes; those must not be duplicated.
+    for minute in range(25, 28):
+        market_data.handle_tick({"symbol": "SBIN", "ltp": 500.0 + minute, "timestamp": start + timedelta(minutes=minute)})
+    before = market_data.indicators.get("SBIN", "max", 5)
+
+    counts = asyncio.run(market_data.backfill(limit=20))
+    closes = market_data.candle_builder.get_recent("SBIN", 100).close.tolist()
+    assert counts == {"SBIN": 15}
+    assert broker.calls == [("SBIN", 20)]
+    assert closes == [100.0 + i + 0.5 for i in range(10, 25)] + [525.0, 526.0]
+    assert seeded == [{"symbol": "SBIN"}]
+    assert market_data.indicators.get("SBIN", "max", 5) is not before
+    assert not market_data.warming
+
+
+def test_backfill_falls_back_to_the_archive(tmp_path):
+    recorder = ArchiveRecorder(str(tmp_path))
+    for candle in _bars(datetime(2026, 1, 5, 9, 15), 8):
+        recorder.record_candle({"symbol": "SBIN", "candle": candle})
+    recorder.flush()
+    market_data = MarketDataManager(HistoryBroker({}, failing=True), EventBus())
+    market_data.archive = ArchiveReader(str(tmp_path))
+    assert asyncio.run(market_data.backfill(["SBIN"], limit=5)) == {"SBIN": 5}
+    assert market_data.candle_builder.get_recent("SBIN", 10).close.tolist() == [103.5, 104.5, 105.5, 106.5, 107.5]
+
+
+def test_full_history_is_not_seeded_again():
+    start = datetime(2026, 1, 5, 9, 15)
+    market_data = MarketDataManager(HistoryBroker({"SBIN": _bars(start, 10)}), EventBus())
+    market_data.candle_builder = builder = type(market_data.candle_builder)(history_size=5)
+    assert asyncio.run(market_data.backfill(["SBIN"], limit=5)) == {"SBIN": 5}
+    assert asyncio.run(market_data.backfill(["SBIN"], limit=10)) == {"SBIN": 0}
+    assert builder.get_recent("SBIN", 10).close.tolist() == [105.5, 106.5, 107.5, 108.5, 109.5]
+
+
+def test_added_stock_warms_up_before_it_is_evaluated():
+    broker = HistoryBroker({"SBIN": _bars(datetime(2026, 1, 5, 9, 15), 60)})
+    market_data = MarketDataManager(broker, EventBus())
+
+    async def run():
+        market_data.add_stock("SBIN", "3045")
+        warming = set(market_data.warming)
+        await asyncio.gather(*market_data._backfills)
+        return warming
+
+    assert asyncio.run(run()) == {"SBIN"}
+    assert not market_data.warming
+    assert market_data.candle_builder.history.count("SBIN") == 60
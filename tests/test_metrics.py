@@ -0,0 +1,62 @@
+import threading
+import time
+
+from app.core.metrics import counter, counters_snapshot, histogram, histograms_snapshot, render_prometheus
+from app.core.profiler import SamplingProfiler
+
+
+def test_histogram_quantiles_report_bucket_upper_bounds():
+    h = histogram("test_quantile_seconds", "test", buckets=(0.001, 0.01, 0.1))
+    for value in [0.0005] * 50 + [0.005] * 45 + [0.05] * 4 + [5.0]:
+        h.observe(value)
+    assert (h.quantile(0.5), h.quantile(0.95), h.quantile(0.99), h.quantile(1.0)) == (0.001, 0.01, 0.1, float("inf"))
+    snapshot = histograms_snapshot()["test_quantile_seconds"]
+    assert snapshot["buckets"] == {"0.001": 50, "0.01": 95, "0.1": 99, "+Inf": 100}
+    assert histogram("test_quantile_seconds") is h
+
+
+def test_prometheus_text_describes_each_family_once():
+    for connection in ("0", "1"):
+        histogram("test_lag_seconds", "lag", buckets=(0.1, 1.0), labels={"connection": connection}).observe(0.5)
+    counter("test_failures_total", "failures", {"kind": "row"}).inc()
+    counter("test_failures_total", "failures", {"kind": "call"}).inc(2)
+    text = render_prometheus()
+    assert text.count("# TYPE test_lag_seconds histogram") == 1
+    assert 'test_lag_seconds_bucket{connection="1",le="0.1"} 0' in text
+    assert 'test_lag_seconds_bucket{connection="1",le="1.0"} 1' in text
+    assert 'test_lag_seconds_bucket{connection="1",le="+Inf"} 1' in text
+    assert 'test_lag_seconds_count{connection="0"} 1' in text
+    assert text.count("# TYPE test_failures_total counter") == 1
+    assert 'test_failures_total{kind="call"} 2.0' in text
+    assert counters_snapshot()['test_failures_total{kind="row"}'] == 1.0
+
+
+def test_metrics_endpoint_serves_the_exposition_format():
+    from app.main import metrics
+
+    histogram("test_endpoint_seconds", "endpoint").observe(0.002)
+    response = metrics()
+    assert response.media_type.startswith("text/plain; version=0.0.4")
+    assert "test_endpoint_seconds_count 1" in response.body.decode()
+
+
+def test_profiler_folds_other_threads_stacks(tmp_path):
+    stop = threading.Event()
+
+    def spin_for_profiler():
+        while not stop.is_set():
+            sum(range(1000))
+
+    worker = threading.Thread(target=spin_for_profiler, name="busy")
+    worker.start()
+    try:
+        profiler = SamplingProfiler(interval=0.001)
+        stacks = profiler.run(0.1)
+    finally:
+        stop.set()
+        worker.join()
+    assert profiler.samples > 5
+    busy = [stack for stack in stacks if stack.startswith("busy;")]
+    assert busy and all("spin_for_profiler (test_metrics.py:" in stack for stack in busy)
+    with open(profiler.dump(str(tmp_path))) as handle:
+        assert sum(int(line.rsplit(" ", 1)[1]) for line in handle) == sum(stacks.values())
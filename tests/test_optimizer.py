@@ -0,0 +1,83 @@
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from app.backtest.data import load_arrays, save_arrays, to_arrays
+from app.backtest.optimizer import Optimizer, grid, random_search, walk_forward_splits
+from app.backtest.runner import Backtester
+from app.models import AlgoConfig
+
+SYMBOLS = list("ABCD")
+BASE = {
+    "name": "sweep", "template": "breakout", "stoploss_pct": 0.5, "target_pct": 1, "risk_per_trade": 50,
+    "max_trades_per_day": 3, "max_daily_loss": 300, "max_open_trades": 1, "capital_per_trade": 20000, "watchlist": SYMBOLS,
+}
+
+
+def _ticks(days: int = 4, per_day: int = 1500) -> list[tuple]:
+    rng = random.Random(5)
+    ticks = []
+    for day in range(days):
+        start = datetime(2026, 1, 5 + day, 10, 0)
+        prices = dict.fromkeys(SYMBOLS, 100.0)
+        for i in range(per_day):
+            symbol = rng.choice(SYMBOLS)
+            prices[symbol] *= 1 + rng.gauss(0, 0.001)
+            ticks.append((symbol, start + timedelta(seconds=2 * i), round(prices[symbol], 2), 1.0))
+    return ticks
+
+
+def test_grid_and_random_search():
+    assert grid({"a": [1, 2], "b": ["x", "y", "z"]}) == [
+        {"a": a, "b": b} for a in (1, 2) for b in ("x", "y", "z")
+    ]
+    space = {"stoploss_pct": {"low": 0.5, "high": 2.0}, "target_pct": [1, 2]}
+    samples = random_search(space, 20, seed=3)
+    assert samples == random_search(space, 20, seed=3)
+    assert all(0.5 <= s["stoploss_pct"] <= 2.0 and s["target_pct"] in (1, 2) for s in samples)
+
+
+def test_saved_arrays_replay_the_same_ticks(tmp_path):
+    ticks = _ticks(days=1, per_day=50)
+    save_arrays(to_arrays(ticks), str(tmp_path))
+    arrays = load_arrays(str(tmp_path))
+    assert isinstance(arrays.ts, np.memmap)
+    assert list(arrays.iter_ticks()) == ticks
+
+
+def test_walk_forward_splits_roll_by_test_window(tmp_path):
+    save_arrays(to_arrays(_ticks()), str(tmp_path))
+    arrays = load_arrays(str(tmp_path))
+    days = arrays.day_bounds()
+    assert [day for day, _, _ in days] == [datetime(2026, 1, 5 + d).date() for d in range(4)]
+    splits = walk_forward_splits(arrays, train_days=2, test_days=1)
+    assert splits == [
+        ((days[0][1], days[1][2]), (days[2][1], days[2][2])),
+        ((days[1][1], days[2][2]), (days[3][1], days[3][2])),
+    ]
+
+
+def test_pooled_sweep_matches_in_process_backtests(tmp_path):
+    ticks = _ticks()
+    save_arrays(to_arrays(ticks), str(tmp_path))
+    candidates = grid({"stoploss_pct": [0.3, 1.0], "target_pct": [0.5, 2.0]})
+    ranked = Optimizer(str(tmp_path), BASE, workers=2).evaluate(candidates)
+
+    expected = []
+    for params in candidates:
+        result = Backtester([AlgoConfig(**(BASE | params))]).run(ticks)
+        expected.append({"params": params, "pnl": round(result.pnl_by_algo.get("sweep", 0.0), 2), "trades": len(result.trades)})
+    assert sorted(ranked, key=lambda r: str(r["params"])) == sorted(expected, key=lambda r: str(r["params"]))
+    assert [r["pnl"] for r in ranked] == sorted((r["pnl"] for r in ranked), reverse=True)
+    assert any(r["trades"] for r in ranked)
+
+
+def test_walk_forward_tests_each_folds_best_candidate_out_of_sample(tmp_path):
+    save_arrays(to_arrays(_ticks()), str(tmp_path))
+    candidates = grid({"target_pct": [0.5, 2.0]})
+    folds = Optimizer(str(tmp_path), BASE, workers=2).walk_forward(candidates, train_days=2, test_days=1)
+    assert len(folds) == 2
+    for fold in folds:
+        assert len(fold.ranked) == 2
+        assert fold.test_result["params"] == fold.ranked[0]["params"]
@@ -0,0 +1,70 @@
+import asyncio
+
+from app.engine.order_pipeline import OrderPipeline
+from app.models import TradeDecision
+
+
+class Engine:
+    """Records when each broker round-trip and each persist step starts and ends."""
+
+    def __init__(self, place_seconds: float = 0.02, record_seconds: float = 0.0):
+        self.place_seconds = place_seconds
+        self.record_seconds = record_seconds
+        self.log: list[tuple[str, str, str]] = []
+        self.placing = 0
+        self.max_placing = 0
+
+    async def place(self, decision: TradeDecision) -> dict:
+        self.placing += 1
+        self.max_placing = max(self.max_placing, self.placing)
+        self.log.append(("place", decision.symbol, decision.reason))
+        await asyncio.sleep(self.place_seconds)
+        self.log.append(("placed", decision.symbol, decision.reason))
+        self.placing -= 1
+        return {"reason": decision.reason}
+
+    async def record(self, decision: TradeDecision, ack: dict) -> str:
+        self.log.append(("record", decision.symbol, decision.reason))
+        await asyncio.sleep(self.record_seconds)
+        self.log.append(("recorded", decision.symbol, decision.reason))
+        return ack["reason"]
+
+
+def _decision(symbol: str, reason: str) -> TradeDecision:
+    return TradeDecision(
+        algo_name="algo", symbol=symbol, side="BUY", quantity=1, ltp=100.0,
+        stoploss_price=99.0, target_price=102.0, reason=reason,
+    )
+
+
+def _run(engine: Engine, decisions: list[TradeDecision], concurrency: int) -> tuple[list, OrderPipeline]:
+    async def run():
+        pipeline = OrderPipeline(engine, concurrency)
+        results = await asyncio.gather(*(pipeline.submit(d) for d in decisions))
+        return results, pipeline
+
+    return asyncio.run(run())
+
+
+def test_orders_run_concurrently_up_to_the_limit():
+    engine = Engine()
+    decisions = [_decision(f"S{i}", str(i)) for i in range(10)]
+    results, pipeline = _run(engine, decisions, concurrency=4)
+    assert results == [str(i) for i in range(10)]
+    assert engine.max_placing == 4
+    assert pipeline.in_flight == 0
+
+
+def test_same_symbol_orders_are_placed_one_at_a_time_in_submission_order():
+    engine = Engine()
+    decisions = [_decision("SBIN", str(i)) for i in range(4)] + [_decision("INFY", "x")]
+    _run(engine, decisions, concurrency=8)
+    sbin = [(step, reason) for step, symbol, reason in engine.log if symbol == "SBIN" and step.startswith("place")]
+    assert sbin == [(step, str(i)) for i in range(4) for step in ("place", "placed")]
+    assert engine.log.index(("placed", "INFY", "x")) < engine.log.index(("placed", "SBIN", "1"))
+
+
+def test_persistence_runs_after_the_symbol_lane_is_released():
+    engine = Engine(place_seconds=0.01, record_seconds=0.05)
+    _run(engine, [_decision("SBIN", "first"), _decision("SBIN", "second")], concurrency=1)
+    assert engine.log.index(("place", "SBIN", "second")) < engine.log.index(("recorded", "SBIN", "first"))
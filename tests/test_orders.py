@@ -0,0 +1,116 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.database import Base
+from app.db.models import SystemEvent, TradeLog
+from app.db.writer import InlineDBWriter
+from app.engine.orders import INTENT_EVENT, OrderStage, OrderTracker, order_key
+
+T0 = datetime(2024, 1, 1, 9, 30)
+
+
+def _writer() -> InlineDBWriter:
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    return InlineDBWriter(sessionmaker(bind=engine, expire_on_commit=False))
+
+
+def _trade(symbol: str, at: datetime, status: str = "OPEN", **fields) -> TradeLog:
+    return TradeLog(
+        algo_name="algo", symbol=symbol, side="BUY", quantity=1, entry_price=100.0,
+        stoploss_price=99.0, target_price=102.0, status=status, created_at=at, **fields,
+    )
+
+
+def test_same_minute_order_is_rejected_until_the_window_passes():
+    tracker = OrderTracker(window=120)
+    tracker.reserve("algo", "SBIN", T0)
+    with pytest.raises(ValueError, match="Duplicate"):
+        tracker.reserve("algo", "SBIN", T0 + timedelta(seconds=30))
+    tracker.reserve("algo", "INFY", T0)
+    tracker.reserve("other", "SBIN", T0)
+    tracker.reserve("algo", "SBIN", T0 + timedelta(minutes=1))
+
+
+def test_keys_are_evicted_oldest_first_so_the_index_stays_bounded():
+    tracker = OrderTracker(window=120)
+    for minute in range(10):
+        order = tracker.reserve("algo", "SBIN", T0 + timedelta(minutes=minute))
+        tracker.entry_acked(order, f"E{minute}")
+        tracker.recorded(order.key, minute)
+        tracker.exited(minute, "TARGET_HIT")
+    assert len(tracker.keys) == 2
+    assert tracker.evicted == 8
+    assert len(tracker.by_key) == 2
+    assert tracker.by_order_id == {} and tracker.by_trade == {}
+
+
+def test_open_orders_stay_tracked_after_their_key_expires():
+    tracker = OrderTracker(window=60)
+    order = tracker.reserve("algo", "SBIN", T0)
+    tracker.entry_acked(order, "E1")
+    tracker.sl_acked(order, "S1")
+    tracker.recorded(order.key, 7)
+    tracker.reserve("algo", "INFY", T0 + timedelta(minutes=5))
+    assert order.key not in tracker.keys
+    assert tracker.get("S1") is order
+    assert tracker.for_symbol("SBIN") == [order]
+    tracker.on_position({"trade_id": 7, "status": "STOPLOSS_HIT"})
+    assert order.stage is OrderStage.EXITED and order.exit_status == "STOPLOSS_HIT"
+    assert tracker.get("E1") is None and order.key not in tracker.by_key
+
+
+def test_lifecycle_stages_and_unprotected_entries():
+    tracker = OrderTracker()
+    never_filled = tracker.reserve("algo", "SBIN", T0)
+    tracker.failed(never_filled)
+    assert tracker.for_symbol("SBIN") == []
+    with pytest.raises(ValueError):
+        tracker.reserve("algo", "SBIN", T0)
+
+    unprotected = tracker.reserve("algo", "INFY", T0)
+    tracker.entry_acked(unprotected, "E2")
+    tracker.sl_pending(unprotected)
+    assert unprotected.stage is OrderStage.SL_PENDING
+    tracker.failed(unprotected)
+    stats = tracker.stats()
+    assert stats["unprotected"] == [{"key": unprotected.key, "symbol": "INFY", "order_id": "E2"}]
+    assert stats["stages"] == {"FAILED": 2}
+
+    tracker.flattened(unprotected)
+    assert unprotected.exit_status == "FLATTENED"
+    assert tracker.stats()["unprotected"] == []
+
+
+def test_merge_keys_keeps_expiry_order_and_drops_expired():
+    tracker = OrderTracker(window=120)
+    tracker.reserve("algo", "SBIN", T0)
+    tracker.merge_keys({"a": T0 + timedelta(seconds=30), "b": T0 - timedelta(seconds=1)}, T0)
+    assert list(tracker.keys) == ["a", order_key("algo", "SBIN", T0)]
+
+
+def test_load_rebuilds_keys_and_open_trades_from_the_db():
+    writer = _writer()
+    writer.add(_trade("SBIN", T0 - timedelta(hours=2), broker_order_id="E1", sl_order_id="S1"))
+    writer.add(_trade("INFY", T0 - timedelta(seconds=30), status="TARGET_HIT"))
+    writer.add(_trade("TCS", T0 - timedelta(hours=1), status="TARGET_HIT"))
+    intent = order_key("algo", "HDFC", T0 - timedelta(seconds=10))
+    writer.add(SystemEvent(level="INFO", event_type=INTENT_EVENT, message=intent, created_at=T0 - timedelta(seconds=10)))
+
+    tracker = OrderTracker(window=120)
+    tracker.reserve("stale", "X", T0)
+    assert asyncio.run(tracker.load(writer, T0)) == 2
+    assert set(tracker.keys) == {intent, order_key("algo", "INFY", T0 - timedelta(seconds=30))}
+
+    open_order = tracker.get("S1")
+    assert open_order.symbol == "SBIN" and open_order.stage is OrderStage.SL_ACKED
+    assert tracker.get("E1") is open_order
+    assert tracker.by_trade[open_order.trade_id] is open_order
+    assert [o.symbol for o in tracker.by_key.values()] == ["SBIN"]
+    with pytest.raises(ValueError):
+        tracker.reserve("algo", "HDFC", T0 - timedelta(seconds=5))
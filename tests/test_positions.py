@@ -0,0 +1,123 @@
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.database import Base
+from app.db.models import TradeLog
+from app.db.writer import InlineDBWriter
+from app.engine.positions import PositionManager
+from app.engine.risk import RiskState
+
+
+class Broker:
+    def __init__(self, cancel_ok: bool = True, exit_ok: bool = True):
+        self.cancel_ok = cancel_ok
+        self.exit_ok = exit_ok
+        self.calls: list[tuple] = []
+
+    async def cancel_order(self, order_id: str) -> dict:
+        self.calls.append(("cancel", order_id))
+        return {"status": "success" if self.cancel_ok else "rejected"}
+
+    async def exit_position(self, payload: dict) -> dict:
+        self.calls.append(("exit", payload["price"]))
+        return {"status": "success" if self.exit_ok else "rejected"}
+
+
+def _book(broker: Broker) -> tuple[PositionManager, TradeLog]:
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    writer = InlineDBWriter(sessionmaker(bind=engine, expire_on_commit=False))
+    now = datetime(2026, 1, 5, 10, 0)
+    trade = TradeLog(
+        algo_name="algo", symbol="SBIN", side="BUY", quantity=10, entry_price=100.0, stoploss_price=99.0,
+        target_price=102.0, status="OPEN", pnl=0.0, sl_order_id="SL-1", created_at=now, updated_at=now,
+    )
+    writer.session.add(trade)
+    writer.session.commit()
+    risk = RiskState()
+    risk.reserve("algo")
+    alerts = []
+
+    async def notify(message: str):
+        alerts.append(message)
+
+    positions = PositionManager(broker, writer, risk, notify=notify, exit_retry=5.0)
+    positions.alerts = alerts
+    positions.open(trade)
+    return positions, trade
+
+
+async def _tick(positions: PositionManager, ltp: float):
+    positions.on_tick({"symbol": "SBIN", "ltp": ltp})
+    await asyncio.gather(*positions._exits)
+
+
+def _run(ltp: float, broker: Broker):
+    async def run():
+        positions, trade = _book(broker)
+        await _tick(positions, ltp)
+        positions.writer.session.refresh(trade)
+        return positions, trade
+
+    return asyncio.run(run())
+
+
+def test_target_cancels_stoploss_before_exit():
+    broker = Broker()
+    positions, trade = _run(102.5, broker)
+    assert broker.calls == [("cancel", "SL-1"), ("exit", 102.5)]
+    assert (trade.status, trade.exit_price) == ("TARGET_HIT", 102.5)
+
+
+def test_touched_stoploss_fills_without_orders():
+    broker = Broker()
+    positions, trade = _run(99.0, broker)
+    assert broker.calls == []
+    assert (trade.status, trade.exit_price, trade.pnl) == ("SL_HIT", 99.0, -10.0)
+
+
+def test_gapped_stoploss_is_cancelled_and_exited_at_tick_price():
+    broker = Broker()
+    positions, trade = _run(97.0, broker)
+    assert broker.calls == [("cancel", "SL-1"), ("exit", 97.0)]
+    assert (trade.status, trade.exit_price, trade.pnl) == ("SL_HIT", 97.0, -30.0)
+
+
+def test_failed_cancel_keeps_position_open():
+    broker = Broker(cancel_ok=False)
+    positions, trade = _run(102.5, broker)
+    assert broker.calls == [("cancel", "SL-1")]
+    assert trade.status == "OPEN"
+    assert trade.id in positions.by_id
+
+
+def test_failed_exit_is_alerted_and_retried_after_backoff():
+    from app.core.metrics import counters_snapshot
+
+    broker = Broker(exit_ok=False)
+    failures = counters_snapshot().get("position_exit_failures_total", 0)
+
+    async def run():
+        positions, trade = _book(broker)
+        for ltp in (102.5, 102.6, 102.7):
+            await _tick(positions, ltp)
+        attempts = len(broker.calls)
+        position = positions.by_id[trade.id]
+        position.retry_at = 0.0
+        broker.exit_ok = True
+        await _tick(positions, 102.8)
+        await asyncio.sleep(0)
+        return positions, trade, attempts, position
+
+    positions, trade, attempts, position = asyncio.run(run())
+    assert attempts == 2
+    assert broker.calls[:2] == [("cancel", "SL-1"), ("exit", 102.5)]
+    assert broker.calls[2:] == [("exit", 102.8)]
+    assert position.exit_failures == 1
+    assert trade.id not in positions.by_id
+    assert len(positions.alerts) == 1 and "EXIT FAILED" in positions.alerts[0]
+    assert counters_snapshot()["position_exit_failures_total"] == failures + 1
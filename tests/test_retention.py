@@ -0,0 +1,122 @@
+import asyncio
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.db.database as database
+import app.main  # noqa: F401  - the routes import the app's state
+from app.api.routes.dashboard import positions
+from app.core.clock import SimulatedClock
+from app.core.config import settings
+from app.db.database import Base
+from app.db.models import DailyLedger, SystemEvent, TradeLog
+from app.db.writer import InlineDBWriter
+from app.services.reset_service import reset_for_new_day
+from app.services.retention import RetentionJob
+
+NOW = datetime(2026, 6, 15, 12, 0)
+
+
+def _engine():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def _trade(at: datetime, status: str = "TARGET_HIT", algo: str = "algo") -> TradeLog:
+    return TradeLog(
+        algo_name=algo, symbol="SBIN", side="BUY", quantity=1, entry_price=100.0,
+        stoploss_price=99.0, target_price=102.0, status=status, created_at=at,
+    )
+
+
+def _count(engine, table: str) -> int:
+    with engine.connect() as connection:
+        return connection.execute(text(f'SELECT COUNT(*) FROM "{table}"')).scalar()
+
+
+def test_old_closed_trades_and_events_move_to_monthly_tables():
+    engine = _engine()
+    writer = InlineDBWriter(sessionmaker(bind=engine, expire_on_commit=False))
+    old = NOW - timedelta(days=settings.trade_retention_days + 40)
+    for at in (old, old + timedelta(days=1), old - timedelta(days=31), NOW):
+        writer.add(_trade(at))
+    writer.add(_trade(old - timedelta(days=60), status="OPEN"))
+    writer.add(SystemEvent(level="INFO", event_type="X", message="old", created_at=NOW - timedelta(days=400)))
+    writer.add(SystemEvent(level="INFO", event_type="X", message="new", created_at=NOW))
+
+    job = RetentionJob(writer, SimulatedClock(NOW))
+    moved = asyncio.run(job.run_once())
+    first, second = f"{old - timedelta(days=31):%Y%m}", f"{old:%Y%m}"
+    assert moved[f"trade_logs_{first}"] + moved[f"trade_logs_{second}"] == 3
+    assert moved[f"system_events_{NOW - timedelta(days=400):%Y%m}"] == 1
+    assert _count(engine, "trade_logs") == 2
+    assert _count(engine, "system_events") == 1
+    assert _count(engine, f"trade_logs_{second}") >= 1
+
+    assert asyncio.run(job.run_once()) == {}
+    assert job.moved == moved
+    assert job.stats()["last_run"] == NOW
+
+
+def test_trade_history_pages_newest_first_with_a_stable_cursor():
+    engine = _engine()
+    db = sessionmaker(bind=engine)()
+    for minute in range(5):
+        db.add(_trade(NOW + timedelta(minutes=minute)))
+    db.add(_trade(NOW + timedelta(minutes=2)))
+    db.add(_trade(NOW, algo="other", status="OPEN"))
+    db.commit()
+
+    def page(cursor=None, **filters):
+        options = dict(status=None, algo=None, since=None, until=None) | filters
+        return positions(**options, cursor=cursor, limit=2, db=db)
+
+    seen, cursor = [], None
+    while True:
+        result = page(cursor)
+        if cursor is None:
+            db.add(_trade(NOW + timedelta(minutes=10)))
+            db.commit()
+        seen += [row.id for row in result["items"]]
+        cursor = result["next_cursor"]
+        if cursor is None:
+            break
+    rows = db.query(TradeLog).filter(TradeLog.id.in_(seen)).all()
+    ordered = sorted(rows, key=lambda row: (row.created_at, row.id), reverse=True)
+    assert seen == [row.id for row in ordered]
+    assert len(seen) == 7
+
+    assert [row.algo_name for row in page(algo="other")["items"]] == ["other"]
+    assert len(page(status="OPEN")["items"]) == 1
+    window = page(since=NOW + timedelta(minutes=1), until=NOW + timedelta(minutes=3))
+    assert [row.created_at.minute for row in window["items"]] == [2, 2]
+    with pytest.raises(HTTPException):
+        page("not-a-cursor")
+
+
+def test_reset_marks_open_trades_and_disables_past_ledgers():
+    engine = _engine()
+    db = sessionmaker(bind=engine)()
+    db.add_all([_trade(NOW, status="OPEN"), _trade(NOW)])
+    db.add(DailyLedger(trading_date=date.today() - timedelta(days=1), opening_balance=1000))
+    db.commit()
+    reset_for_new_day(db)
+    db.expire_all()
+    assert sorted(row.status for row in db.query(TradeLog)) == ["FORCE_EXIT_PENDING", "TARGET_HIT"]
+    assert db.query(DailyLedger).one().trading_enabled is False
+
+
+def test_ensure_indexes_adds_indexes_to_existing_tables(monkeypatch):
+    engine = _engine()
+    with engine.begin() as connection:
+        for index in inspect(engine).get_indexes("trade_logs"):
+            connection.execute(text(f'DROP INDEX "{index["name"]}"'))
+    monkeypatch.setattr(database, "engine", engine)
+    database.ensure_indexes()
+    names = {index["name"] for index in inspect(engine).get_indexes("trade_logs")}
+    assert {"ix_trade_logs_status_created_at", "ix_trade_logs_algo_name_created_at", "ix_trade_logs_created_at"} <= names
@@ -0,0 +1,106 @@
+from app.engine.risk import RiskState
+from app.models import AlgoConfig, CapitalSnapshot, StrategyTemplate, TradeDecision
+
+
+def _algo(name: str = "a", **overrides) -> AlgoConfig:
+    fields = dict(
+        name=name, template=StrategyTemplate.breakout, stoploss_pct=1, target_pct=2, risk_per_trade=100,
+        max_trades_per_day=3, max_daily_loss=500, max_open_trades=2, capital_per_trade=10000,
+    )
+    return AlgoConfig(**{**fields, **overrides})
+
+
+def _decision(algo: str = "a", symbol: str = "SBIN", ltp: float = 100.0, quantity: int = 10) -> TradeDecision:
+    return TradeDecision(
+        algo_name=algo, symbol=symbol, side="BUY", ltp=ltp, stoploss_price=ltp * 0.99,
+        target_price=ltp * 1.02, quantity=quantity, reason="test",
+    )
+
+
+def _capital(today_pnl: float = 0.0, free_margin: float = 100000.0) -> CapitalSnapshot:
+    return CapitalSnapshot(
+        available_balance=100000.0, used_margin=0.0, free_margin=free_margin, today_pnl=today_pnl, trading_enabled=True
+    )
+
+
+def test_screen_reserves_so_later_decisions_see_earlier_ones():
+    risk = RiskState(global_max_open_positions=10)
+    algos = {"a": _algo(max_open_trades=5)}
+    decisions = [_decision(symbol=s) for s in ("SBIN", "INFY", "TCS", "ITC")]
+    accepted = risk.screen(decisions, algos, _capital())
+    assert [d.symbol for d in accepted] == ["SBIN", "INFY", "TCS"]
+    assert risk.trades_by_algo["a"] == 3 and risk.open_positions == 3
+    assert risk.rejections == {"Algo max trades/day reached": 1}
+
+
+def test_screen_caps_open_trades_per_algo_and_globally():
+    risk = RiskState(global_max_open_positions=3)
+    algos = {"a": _algo(), "b": _algo("b")}
+    decisions = [_decision("a", "SBIN"), _decision("a", "INFY"), _decision("a", "TCS"), _decision("b", "ITC"), _decision("b", "WIPRO")]
+    accepted = risk.screen(decisions, algos, _capital())
+    assert [(d.algo_name, d.symbol) for d in accepted] == [("a", "SBIN"), ("a", "INFY"), ("b", "ITC")]
+    assert risk.rejections == {"Algo max concurrent trades reached": 1, "Global max open positions reached": 1}
+
+
+def test_screen_spends_free_margin_within_a_batch():
+    risk = RiskState(global_max_open_positions=10)
+    accepted = risk.screen([_decision(symbol="SBIN"), _decision(symbol="INFY")], {"a": _algo()}, _capital(free_margin=1500))
+    assert [d.symbol for d in accepted] == ["SBIN"]
+    assert risk.rejections == {"Insufficient free margin": 1}
+
+
+def test_release_returns_the_reservation_of_a_failed_order():
+    risk = RiskState()
+    algos = {"a": _algo(max_trades_per_day=1)}
+    assert risk.screen([_decision()], algos, _capital())
+    assert not risk.screen([_decision(symbol="INFY")], algos, _capital())
+    risk.release("a")
+    assert (risk.open_positions, risk.open_positions_by_algo["a"], risk.trades_by_algo["a"]) == (0, 0, 0)
+    assert risk.screen([_decision(symbol="INFY")], algos, _capital())
+
+
+def test_marks_count_towards_the_algo_daily_loss_until_exit_realizes_them():
+    risk = RiskState()
+    algos = {"a": _algo(max_trades_per_day=5)}
+    risk.screen([_decision()], algos, _capital())
+    risk.on_mark("a", -300.0)
+    risk.on_mark("a", -250.0)
+    assert risk.unrealized_pnl == -550.0
+    assert not risk.screen([_decision(symbol="INFY")], algos, _capital())
+    assert risk.rejections["Algo max daily loss reached"] == 1
+
+    risk.on_exit("a", -550.0, unrealized=-550.0)
+    assert (risk.open_positions, risk.unrealized_pnl, risk.realized_by_algo["a"]) == (0, 0.0, -550.0)
+    assert risk.algo_pnl("a") == -550.0
+    assert not risk.screen([_decision(symbol="INFY")], algos, _capital())
+
+
+def test_global_daily_loss_halts_every_algo():
+    risk = RiskState(global_max_daily_loss=1000)
+    algos = {"a": _algo(), "b": _algo("b")}
+    risk.screen([_decision("a")], algos, _capital())
+    risk.on_mark("a", -400.0)
+    decisions = [_decision("b", "INFY")]
+    assert risk.screen(decisions, algos, _capital(today_pnl=-500.0)) == decisions
+    risk.on_mark("a", -150.0)
+    assert not risk.screen([_decision("b", "TCS")], algos, _capital(today_pnl=-500.0))
+    assert risk.rejections == {"Global max daily loss reached": 1}
+
+
+def test_reset_day_clears_trade_caps_but_not_open_positions():
+    risk = RiskState(global_max_open_positions=10)
+    algos = {"a": _algo(max_trades_per_day=1, max_open_trades=5)}
+    risk.screen([_decision()], algos, _capital())
+    risk.reset_day()
+    assert risk.screen([_decision(symbol="INFY")], algos, _capital())
+    assert risk.open_positions == 2
+
+
+def test_halt_blocks_until_resumed():
+    risk = RiskState()
+    algos = {"a": _algo()}
+    risk.halt("square_off", "Square-off window")
+    assert not risk.screen([_decision()], algos, _capital())
+    assert risk.rejections == {"Square-off window": 1}
+    risk.resume("square_off")
+    assert risk.screen([_decision()], algos, _capital())
@@ -0,0 +1,122 @@
+import queue
+import random
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from app.data.market_data import MarketDataManager
+from app.data.shared import SharedCandles, SharedMarket, SharedMarketPublisher
+from app.engine.batch import BatchEvaluator
+from app.engine.cluster import run_strategy_worker
+from app.models import AlgoConfig, StrategyTemplate
+
+SYMBOLS = [f"S{i}" for i in range(12)]
+START = datetime(2026, 1, 5, 9, 15).timestamp()
+
+
+@pytest.fixture
+def market():
+    market = SharedMarket.create(32, 64, 1)
+    yield market
+    market.close()
+
+
+def _algos(timeframe: int = 1) -> list[AlgoConfig]:
+    return [
+        AlgoConfig(
+            name=f"{template.value}-{timeframe}", template=template, stoploss_pct=1, target_pct=2, risk_per_trade=500,
+            max_trades_per_day=20, max_daily_loss=1000, max_open_trades=5, capital_per_trade=50000,
+            watchlist=SYMBOLS, timeframe=timeframe,
+        )
+        for template in StrategyTemplate
+    ]
+
+
+def _publish(market: SharedMarket) -> tuple[MarketDataManager, SharedMarketPublisher, dict[str, int]]:
+    market_data = MarketDataManager(None)
+    publisher = SharedMarketPublisher(market, market_data)
+    slots = {}
+    for slot, symbol in enumerate(SYMBOLS):
+        slots[symbol] = slot
+        publisher.add(symbol, slot)
+    market_data.connected = True
+    publisher.sync_status()
+    rng = random.Random(9)
+    market_data.handle_records(
+        [(rng.choice(SYMBOLS), START + i * 0.5, round(rng.uniform(100, 110), 2), 1.0) for i in range(3000)]
+    )
+    return market_data, publisher, slots
+
+
+def test_attached_view_sees_ticks_and_reports_changed_slots(market):
+    reader = SharedMarket.attach(market.spec)
+    try:
+        seen = np.zeros(market.capacity, dtype=np.int64)
+        slots = np.arange(4, dtype=np.int64)
+        market.write_ticks(np.array([1, 3]), np.array([1.0, 2.0]), np.array([101.0, 303.0]), np.array([5.0, 6.0]))
+        assert reader.changed(slots, seen).tolist() == [1, 3]
+        assert reader.changed(slots, seen).tolist() == []
+        assert reader.ltp[[1, 3]].tolist() == [101.0, 303.0]
+    finally:
+        reader.close()
+
+
+def test_bar_reads_wait_out_a_write_in_progress(market):
+    market.write_bars(0, np.ones((6, 3)), 3)
+    market.bar_seq[0] += 1
+
+    def finish():
+        time.sleep(0.02)
+        market.bars[:, 0, -3:] = 2.0
+        market.bar_seq[0] += 1
+
+    writer = threading.Thread(target=finish)
+    writer.start()
+    block, count = market.read_bars(0, 10)
+    writer.join()
+    assert count == 3 and block.tolist() == [[2.0] * 3] * 6
+
+
+@pytest.mark.parametrize("timeframe", [1, 3])
+def test_shared_bars_give_the_same_decisions_as_local_history(market, timeframe):
+    market_data, _, slots = _publish(market)
+    for symbol, slot in slots.items():
+        series = market_data.candle_builder.history.series[symbol]
+        block, count = market.read_bars(slot, 64)
+        assert count == series.count
+        np.testing.assert_array_equal(block, series.block(64))
+
+    ltps = {symbol: 105.0 + i * 0.3 for i, symbol in enumerate(SYMBOLS)}
+    local = BatchEvaluator(market_data.candle_builder).evaluate(_algos(timeframe), ltps)
+    shared = BatchEvaluator(SharedCandles(market, slots), market.lookback).evaluate(_algos(timeframe), ltps)
+    assert local
+    assert sorted(d.model_dump_json() for d in shared) == sorted(d.model_dump_json() for d in local)
+
+
+def test_worker_evaluates_only_moved_symbols_that_are_not_warming(market):
+    market_data, publisher, slots = _publish(market)
+    market_data.warming.add("S0")
+    publisher.sync_status()
+    control, results = queue.Queue(), queue.Queue()
+    for algo in _algos():
+        control.put(("algo", algo))
+    for symbol, slot in slots.items():
+        control.put(("add", symbol, slot))
+    worker = threading.Thread(target=run_strategy_worker, args=(0, market.spec, control, results, 0.001))
+    worker.start()
+    try:
+        time.sleep(0.1)
+        while not results.empty():
+            results.get()
+        final = {symbol: 120.0 for symbol in ("S0", "S1", "S2")}
+        market_data.handle_records([(s, START + 1600 + i, ltp) for i, (s, ltp) in enumerate(final.items())])
+        received = results.get(timeout=5)
+    finally:
+        control.put(("stop",))
+        worker.join(5)
+    assert {decision.symbol for decision, _ in received} <= {"S1", "S2"}
+    assert all(decision.ltp == 120.0 and at > 0 for decision, at in received)
+    assert market.worker_stats[0][0] >= 1
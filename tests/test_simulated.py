@@ -0,0 +1,80 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.brokers.simulated import SimulatedBroker
+from benchmarks.bench_e2e import compare
+
+
+def test_rate_bursts_at_the_open_and_every_interval():
+    broker = SimulatedBroker(ticks_per_symbol=2, burst_multiplier=10, burst_seconds=5, burst_interval=60)
+    assert [broker.rate(t) for t in (100.0, 104.9, 105.0, 159.0, 161.0)] == [20, 20, 2, 2, 20]
+    broker.open_session()
+    assert broker.rate(170.0) == 20
+
+
+def test_seeded_prices_and_history_are_reproducible():
+    first, second = SimulatedBroker(seed=4), SimulatedBroker(seed=4)
+    stamp = datetime(2026, 1, 5, 10, 0)
+    assert [first.next_tick("SBIN", "1", stamp)["ltp"] for _ in range(5)] == [
+        second.next_tick("SBIN", "1", stamp)["ltp"] for _ in range(5)
+    ]
+    minute = lambda: datetime.now().replace(second=0, microsecond=0)
+    before = minute()
+    candles = asyncio.run(first.fetch_historical_candles("SBIN", "1", 30))
+    assert len(candles) == 30
+    assert [c["ts"] for c in candles] == sorted(c["ts"] for c in candles)
+    assert candles[-1]["ts"] + timedelta(minutes=1) in (before, minute())
+    assert candles[-1]["close"] == first.price("SBIN")
+    assert all(c["low"] <= min(c["open"], c["close"]) and c["high"] >= max(c["open"], c["close"]) for c in candles)
+
+
+def test_orders_fail_and_reject_at_the_configured_rates():
+    failing = SimulatedBroker(failure_rate=1.0, seed=1)
+    with pytest.raises(ConnectionError):
+        asyncio.run(failing.place_limit_order({}))
+    rejecting = SimulatedBroker(reject_rate=1.0, seed=1)
+    assert asyncio.run(rejecting.exit_position({}))["status"] == "rejected"
+    ok = SimulatedBroker(seed=1)
+    acks = [asyncio.run(ok.place_limit_order({})), asyncio.run(ok.cancel_order("x"))]
+    assert [a["order_id"] for a in acks] == ["SIM-LMT-1", "SIM-CXL-2"]
+    assert (failing.failures, rejecting.rejections, ok.orders) == (1, 1, 2)
+
+
+def test_replay_emits_only_subscribed_symbols_in_order():
+    start = datetime(2026, 1, 5, 10, 0)
+    ticks = [(s, start + timedelta(seconds=i), 100.0 + i, 1.0) for i, s in enumerate(["SBIN", "INFY", "SBIN", "TCS"])]
+    broker = SimulatedBroker(replay=ticks, replay_speed=0)
+    received = []
+
+    async def run():
+        connection = broker.open_feed(received.append)
+        await connection.subscribe([{"symbol": "SBIN", "token": "1"}, {"symbol": "TCS", "token": "2"}])
+        task = asyncio.create_task(connection.run())
+        await asyncio.sleep(0.01)
+        await connection.close()
+        await asyncio.wait_for(task, 2)
+
+    asyncio.run(run())
+    assert [(t["symbol"], t["ltp"]) for t in received] == [("SBIN", 100.0), ("SBIN", 102.0), ("TCS", 103.0)]
+
+
+def _result(**overrides) -> dict:
+    result = {
+        "config": {"symbols": 50}, "ticks_per_second": 1000.0, "decisions_per_second": 500.0,
+        "latency": {"tick_candle_seconds": {"p50": 0.0001, "p99": 0.01}}, "missing_series": [],
+        "rss_growth_mb_per_min": 0.5,
+    }
+    return result | overrides
+
+
+def test_compare_flags_regressions_against_the_baseline():
+    baseline = _result()
+    assert compare(_result(ticks_per_second=800.0), baseline, 0.25) == []
+    assert compare(_result(ticks_per_second=700.0), baseline, 0.25) == ["ticks_per_second: 700.0 < baseline 1000.0"]
+    slower = _result(latency={"tick_candle_seconds": {"p50": 0.0001, "p99": 0.05}})
+    assert compare(slower, baseline, 0.25) == ["tick_candle_seconds p99: 0.05 > baseline 0.01"]
+    missing = _result(latency={}, missing_series=["tick_candle_seconds"])
+    assert compare(missing, baseline, 0.25) == ["tick_candle_seconds: series missing, baseline p99 0.01"]
+    assert compare(_result(config={"symbols": 10}, ticks_per_second=1.0), baseline, 0.25) == []
@@ -0,0 +1,135 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.clock import SimulatedClock
+from app.db.database import Base
+from app.db.models import TradeLog
+from app.db.writer import InlineDBWriter
+from app.engine.algo_manager import AlgoManager
+from app.engine.orders import OrderTracker
+from app.engine.risk import RiskState
+from app.models import AlgoConfig, StrategyTemplate
+from app.state.snapshot import SNAPSHOT_VERSION, StateSnapshots
+
+NOW = datetime(2026, 3, 10, 10, 0)
+
+
+class State:
+    """The parts of ``AppState`` a snapshot reads and restores."""
+
+    def __init__(self, writer: InlineDBWriter, now: datetime = NOW):
+        self.clock = SimulatedClock(now)
+        self.db_writer = writer
+        self.algo_manager = AlgoManager()
+        self.risk = RiskState()
+        self.execution_engine = SimpleNamespace(orders=OrderTracker())
+        self.market_data = SimpleNamespace(subscriptions={})
+        self.cluster = None
+
+
+def _writer() -> InlineDBWriter:
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    return InlineDBWriter(sessionmaker(bind=engine, expire_on_commit=False))
+
+
+def _algo(name: str) -> AlgoConfig:
+    return AlgoConfig(
+        name=name, template=next(iter(StrategyTemplate)), stoploss_pct=1, target_pct=2,
+        risk_per_trade=100, max_trades_per_day=5, max_daily_loss=1000,
+        max_open_trades=2, capital_per_trade=10000, watchlist=["SBIN"],
+    )
+
+
+def _trade(algo: str, at: datetime, status: str, pnl: float = 0.0) -> TradeLog:
+    return TradeLog(
+        algo_name=algo, symbol="SBIN", side="BUY", quantity=1, entry_price=100.0,
+        stoploss_price=99.0, target_price=102.0, status=status, pnl=pnl, created_at=at,
+    )
+
+
+def _populated(writer: InlineDBWriter) -> State:
+    state = State(writer)
+    state.algo_manager.add(_algo("a"))
+    state.algo_manager.add(_algo("b"))
+    state.algo_manager.toggle("b", True)
+    state.market_data.subscriptions["SBIN"] = "3045"
+    state.risk.halt("manual", "Stopped by operator")
+    state.risk.halt("backpressure", "lagging")
+    state.risk.trades_by_algo["a"] = 3
+    state.execution_engine.orders.reserve("a", "SBIN", NOW)
+    return state
+
+
+def test_snapshot_round_trip_restores_config_risk_and_order_keys(tmp_path):
+    path = str(tmp_path / "state.json")
+    writer = _writer()
+    writer.add(_trade("a", NOW - timedelta(hours=1), "TARGET_HIT", pnl=50.0))
+    writer.add(_trade("b", NOW - timedelta(hours=1), "OPEN"))
+    writer.add(_trade("a", NOW - timedelta(days=1), "TARGET_HIT", pnl=999.0))
+    assert asyncio.run(StateSnapshots(_populated(writer), path).save())
+
+    restored = State(writer, NOW + timedelta(seconds=30))
+    snapshots = StateSnapshots(restored, path)
+    snapshot = snapshots.load()
+    assert snapshots.restore_config(snapshot) == {"algos": 2, "paused": 1, "stocks": 1}
+    summary = asyncio.run(snapshots.restore_risk(snapshot))
+
+    assert set(restored.algo_manager.algos) == {"a", "b"}
+    assert restored.algo_manager.paused == {"b"}
+    assert restored.market_data.subscriptions == {"SBIN": "3045"}
+    assert restored.risk.halts == {"manual": "Stopped by operator"}
+    assert summary["same_day"] is True
+    assert dict(restored.risk.trades_by_algo) == {"a": 3, "b": 1}
+    assert dict(restored.risk.realized_by_algo) == {"a": 50.0, "b": 0.0}
+    orders = restored.execution_engine.orders
+    assert list(orders.keys) == ["a:SBIN:202603101000"]
+    with pytest.raises(ValueError, match="Duplicate"):
+        orders.reserve("a", "SBIN", NOW + timedelta(seconds=30))
+
+
+def test_next_day_snapshot_keeps_halts_but_counts_come_from_the_db(tmp_path):
+    path = str(tmp_path / "state.json")
+    writer = _writer()
+    asyncio.run(StateSnapshots(_populated(writer), path).save())
+    tomorrow = NOW + timedelta(days=1)
+    writer.add(_trade("b", tomorrow - timedelta(minutes=5), "STOPLOSS_HIT", pnl=-20.0))
+
+    restored = State(writer, tomorrow)
+    snapshots = StateSnapshots(restored, path)
+    summary = asyncio.run(snapshots.restore_risk(snapshots.load()))
+    assert summary["same_day"] is False
+    assert dict(restored.risk.trades_by_algo) == {"b": 1}
+    assert restored.risk.realized_by_algo["b"] == -20.0
+    assert "manual" in restored.risk.halts
+    assert list(restored.execution_engine.orders.keys) == []
+
+
+def test_unchanged_state_is_not_rewritten_and_writes_are_atomic(tmp_path):
+    path = tmp_path / "nested" / "state.json"
+    snapshots = StateSnapshots(_populated(_writer()), str(path))
+    assert asyncio.run(snapshots.save())
+    assert not asyncio.run(snapshots.save())
+    assert asyncio.run(snapshots.save(force=True))
+    assert snapshots.writes == 2
+    assert [p.name for p in path.parent.iterdir()] == ["state.json"]
+    assert json.loads(path.read_text())["version"] == SNAPSHOT_VERSION
+
+
+def test_missing_unreadable_or_foreign_snapshots_are_ignored(tmp_path):
+    path = tmp_path / "state.json"
+    snapshots = StateSnapshots(State(_writer()), str(path))
+    assert snapshots.load() is None
+    path.write_text("{not json")
+    assert snapshots.load() is None
+    path.write_text(json.dumps({"version": SNAPSHOT_VERSION + 1}))
+    assert snapshots.load() is None
+    summary = asyncio.run(snapshots.restore_risk(None))
+    assert summary == {"same_day": False, "halts": 0, "trades_by_algo": {}}
@@ -0,0 +1,115 @@
+import pytest
+from pydantic import ValidationError
+
+from app.data.candle_store import CandleStore
+from app.data.timeframes import TimeframeStore
+from app.engine.indicators import RollingMean, TimeframeIndicators
+from app.models import AlgoConfig, StrategyTemplate
+
+
+def _append(store: CandleStore, symbol: str, minute: int, close: float, volume: float = 10.0):
+    store.create(symbol).append(minute * 60.0, close - 0.5, close + 1.0, close - 1.0, close, volume)
+
+
+def _bars(store: TimeframeStore, symbol: str) -> list[tuple]:
+    window = store.window(symbol, store.capacity)
+    return list(zip(*(column.tolist() for column in (
+        window.ts, window.open, window.high, window.low, window.close, window.volume
+    ))))
+
+
+def test_bars_roll_up_ohlcv_and_close_with_their_last_minute():
+    source = CandleStore(50)
+    store = TimeframeStore(source, 3, 10)
+    for minute, close in enumerate([100, 104, 98, 101, 103]):
+        _append(source, "SBIN", minute, close, volume=minute + 1)
+    assert _bars(store, "SBIN") == [(0.0, 99.5, 105.0, 97.0, 98.0, 6.0)]
+    _append(source, "SBIN", 5, 99)
+    assert _bars(store, "SBIN")[-1] == (180.0, 100.5, 104.0, 98.0, 99.0, 19.0)
+    assert store.count("SBIN") == 2
+
+
+def test_a_gap_closes_the_open_bar_when_a_later_bucket_starts():
+    source = CandleStore(50)
+    store = TimeframeStore(source, 5, 10)
+    for minute in (0, 1, 7, 9):
+        _append(source, "SBIN", minute, 100 + minute)
+    assert [bar[0] for bar in _bars(store, "SBIN")] == [0.0, 300.0]
+    assert _bars(store, "SBIN")[0][4] == 101.0
+
+
+def test_incremental_reads_match_one_rollup_of_the_whole_history():
+    source = CandleStore(500)
+    incremental = TimeframeStore(source, 15, 50)
+    for minute in range(200):
+        if minute % 7 != 3:
+            _append(source, "SBIN", minute, 100 + (minute * 37 % 11))
+        if minute % 4 == 0:
+            incremental.count("SBIN")
+    assert _bars(incremental, "SBIN") == _bars(TimeframeStore(source, 15, 50), "SBIN")
+
+
+def test_reseeded_history_is_rebuilt_from_the_source_window():
+    source = CandleStore(50)
+    store = TimeframeStore(source, 3, 10)
+    for minute in range(6):
+        _append(source, "SBIN", minute, 100)
+    assert store.count("SBIN") == 2
+    source.drop("SBIN")
+    for minute in range(30, 33):
+        _append(source, "SBIN", minute, 200)
+    assert _bars(store, "SBIN") == [(1800.0, 199.5, 201.0, 199.0, 200.0, 30.0)]
+
+
+def test_unknown_symbols_read_empty_without_allocating():
+    store = TimeframeStore(CandleStore(50), 3, 10)
+    assert store.count("NONE") == 0
+    assert len(store.window("NONE", 5)) == 0
+    assert store.bars == {}
+
+
+def test_timeframe_indicators_catch_up_on_closed_bars_only():
+    source = CandleStore(200)
+    store = TimeframeStore(source, 3, 50)
+    engine = TimeframeIndicators(store)
+    for minute in range(9):
+        _append(source, "SBIN", minute, 100 + minute)
+    sma = engine.get("SBIN", "sma", 2)
+    assert sma.value == pytest.approx((105 + 108) / 2)
+    _append(source, "SBIN", 9, 150)
+    _append(source, "SBIN", 10, 150)
+    assert engine.get("SBIN", "sma", 2) is sma and sma.count == 3
+    _append(source, "SBIN", 11, 111)
+    assert engine.get("SBIN", "sma", 2).value == pytest.approx((108 + 111) / 2)
+
+    reference = RollingMean(2)
+    for close in store.window("SBIN", 50).close.tolist():
+        reference.update(0, 0, close, 0)
+    assert sma.value == reference.value
+
+
+def test_timeframe_indicators_reseed_after_the_rollup_is_rebuilt():
+    source = CandleStore(200)
+    store = TimeframeStore(source, 3, 50)
+    engine = TimeframeIndicators(store)
+    for minute in range(6):
+        _append(source, "SBIN", minute, 100)
+    stale = engine.get("SBIN", "sma", 2)
+    source.drop("SBIN")
+    for minute in range(60, 63):
+        _append(source, "SBIN", minute, 300)
+    fresh = engine.get("SBIN", "sma", 2)
+    assert fresh is not stale
+    assert fresh.value == 300 and fresh.count == 1
+
+
+def test_algo_timeframe_must_be_configured():
+    fields = dict(
+        name="a", template=next(iter(StrategyTemplate)), stoploss_pct=1, target_pct=2,
+        risk_per_trade=100, max_trades_per_day=5, max_daily_loss=1000,
+        max_open_trades=2, capital_per_trade=10000,
+    )
+    assert AlgoConfig(**fields).timeframe == 1
+    assert AlgoConfig(**fields, timeframe=5).timeframe == 5
+    with pytest.raises(ValidationError, match="timeframe"):
+        AlgoConfig(**fields, timeframe=7)